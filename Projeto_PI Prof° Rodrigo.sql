@@ -45,3 +45,7 @@ create table pagamentos (
     foreign key(id_audiencia) references audiencias(id_audiencia)
     );
 
+
+-- Índices das colunas usadas em buscas (as chaves estrangeiras já ganham
+-- índice automaticamente no InnoDB; o CPF do cliente não tinha nenhum).
+create unique index ux_cliente_cpf on cliente(cpf);
@@ -0,0 +1,156 @@
+# agenda_audiencias.py
+# =====================================================================
+# AGENDA DE AUDIÊNCIAS (ÍNDICE POR HORÁRIO, LOCAL E CLIENTE)
+# Mantém as audiências em listas ordenadas por data/hora: uma geral, uma
+# por local e uma por cliente. Assim, "o que há nesta semana no Fórum
+# Central" e "este horário bate com outra audiência?" são respondidos com
+# busca binária (bisect), sem percorrer todas as audiências.
+#
+# Cada audiência ocupa o intervalo [data_hora, data_hora + duração). Como a
+# duração é a mesma para todas (DURACAO_PADRAO), duas audiências se
+# sobrepõem exatamente quando os inícios distam menos que a duração, e os
+# conflitos de um horário são a faixa contínua (início - duração, início + duração)
+# de cada lista.
+#
+# Conflito = mesmo local (comparado sem acentos/maiúsculas) ou mesmo cliente
+# em horários que se sobrepõem.
+#
+# A agenda só conhece as audiências de quando foi montada mais as que este
+# processo adicionou. No MySQL (vários usuários) a conferência definitiva é
+# feita no banco, na transação do INSERT (banco_dados.add_audiencia), com
+# uma agenda montada só com as audiências da faixa de horário.
+# =====================================================================
+
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+from operator import attrgetter
+
+from indice_nomes import normalizar
+from modelo_abstrato import ConflitoAgenda
+
+DURACAO_PADRAO = timedelta(hours=1)
+
+_data_hora = attrgetter("data_hora")
+
+
+def erro_de_conflito(conflitos):
+    """Monta o ConflitoAgenda para a lista [(motivo, audiência)] de AgendaAudiencias.conflitos."""
+    motivo, outra = conflitos[0]
+    ocupado = f"o local '{outra.local}'" if motivo == "local" else f"o cliente {outra.cliente_cpf}"
+    return ConflitoAgenda(f"{ocupado} já tem audiência (processo {outra.processo_numero}) "
+                          f"em {outra.data_hora:%d/%m/%Y %H:%M}.", conflitos)
+
+
+class _ListaOrdenada:
+    """Audiências de uma chave em ordem de data/hora (inícios em lista paralela para o bisect)."""
+    __slots__ = ("inicios", "itens")
+
+    def __init__(self, itens=()):
+        self.itens = sorted(itens, key=_data_hora)
+        self.inicios = [audiencia.data_hora for audiencia in self.itens]
+
+    def inserir(self, audiencia):
+        posicao = bisect_right(self.inicios, audiencia.data_hora)
+        self.inicios.insert(posicao, audiencia.data_hora)
+        self.itens.insert(posicao, audiencia)
+
+    def remover(self, audiencia):
+        posicao = bisect_left(self.inicios, audiencia.data_hora)
+        while posicao < len(self.itens) and self.inicios[posicao] == audiencia.data_hora:
+            if self.itens[posicao] is audiencia:
+                del self.inicios[posicao], self.itens[posicao]
+                return True
+            posicao += 1
+        return False
+
+    def faixa(self, inicio, fim, incluir_inicio=True):
+        """Audiências com início em [inicio, fim) (ou (inicio, fim) com incluir_inicio=False)."""
+        primeiro = (bisect_left if incluir_inicio else bisect_right)(self.inicios, inicio)
+        return self.itens[primeiro:bisect_left(self.inicios, fim, primeiro)]
+
+
+def chave_local(local):
+    """Chave de comparação do local: 'Fórum  Central' e 'forum central' são o mesmo local."""
+    return normalizar(local) if local else None
+
+
+class AgendaAudiencias:
+    """Índice em memória das audiências para consultas por período e detecção de conflitos."""
+
+    def __init__(self, duracao=DURACAO_PADRAO):
+        self.duracao = duracao
+        self._todas = _ListaOrdenada()
+        self._por_local = {}    # chave do local -> _ListaOrdenada
+        self._por_cliente = {}  # CPF -> _ListaOrdenada
+
+    def __len__(self):
+        return len(self._todas.itens)
+
+    def _listas_de(self, audiencia, criar=False):
+        listas = [self._todas]
+        for indice, chave in ((self._por_local, chave_local(audiencia.local)), (self._por_cliente, audiencia.cliente_cpf)):
+            if chave is None: continue
+            lista = indice.get(chave)
+            if lista is None and criar:
+                lista = indice[chave] = _ListaOrdenada()
+            if lista is not None: listas.append(lista)
+        return listas
+
+    # --- Montagem e atualização ---
+
+    def construir(self, audiencias):
+        """Monta a agenda de uma vez (uma ordenação por lista) a partir das audiências existentes."""
+        audiencias = list(audiencias)
+        grupos_local, grupos_cliente = {}, {}
+        for audiencia in audiencias:
+            local = chave_local(audiencia.local)
+            if local is not None: grupos_local.setdefault(local, []).append(audiencia)
+            if audiencia.cliente_cpf is not None: grupos_cliente.setdefault(audiencia.cliente_cpf, []).append(audiencia)
+        self._todas = _ListaOrdenada(audiencias)
+        self._por_local = {chave: _ListaOrdenada(grupo) for chave, grupo in grupos_local.items()}
+        self._por_cliente = {chave: _ListaOrdenada(grupo) for chave, grupo in grupos_cliente.items()}
+        return self
+
+    def adicionar(self, audiencia):
+        for lista in self._listas_de(audiencia, criar=True):
+            lista.inserir(audiencia)
+
+    def remover(self, audiencia):
+        """Retira a audiência (o mesmo objeto adicionado) da agenda; retorna False se não estava nela."""
+        removida = False
+        for lista in self._listas_de(audiencia):
+            removida = lista.remover(audiencia) or removida
+        return removida
+
+    # --- Consultas ---
+
+    def entre(self, inicio, fim, local=None, cliente_cpf=None):
+        """Audiências com início em [inicio, fim), em ordem de data/hora, opcionalmente de um local e/ou cliente."""
+        listas = [self._todas]
+        if local:
+            listas.append(self._por_local.get(chave_local(local), _ListaOrdenada()))
+        if cliente_cpf:
+            listas.append(self._por_cliente.get(cliente_cpf, _ListaOrdenada()))
+        # Percorre a lista mais curta e filtra pelas outras condições
+        resultado = min(listas, key=lambda lista: len(lista.itens)).faixa(inicio, fim)
+        if local:
+            chave = chave_local(local)
+            resultado = [a for a in resultado if chave_local(a.local) == chave]
+        if cliente_cpf:
+            resultado = [a for a in resultado if a.cliente_cpf == cliente_cpf]
+        return resultado
+
+    def conflitos(self, audiencia):
+        """Retorna [(motivo, audiência)] das que se sobrepõem a 'audiencia' no mesmo local ou com o mesmo cliente.
+
+        O motivo é "local" ou "cliente". A própria audiência (mesmo objeto) é ignorada.
+        """
+        inicio, encontrados = audiencia.data_hora, []
+        for motivo, indice, chave in (("local", self._por_local, chave_local(audiencia.local)),
+                                      ("cliente", self._por_cliente, audiencia.cliente_cpf)):
+            lista = indice.get(chave) if chave is not None else None
+            if lista is None: continue
+            for outra in lista.faixa(inicio - self.duracao, inicio + self.duracao, incluir_inicio=False):
+                if outra is not audiencia:
+                    encontrados.append((motivo, outra))
+        return encontrados
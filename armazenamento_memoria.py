@@ -0,0 +1,183 @@
+# armazenamento_memoria.py
+# =====================================================================
+# ARMAZENAMENTO EM MEMÓRIA COM ÍNDICES SECUNDÁRIOS
+# Substitui os dicionários/listas soltos de 'data_stores' da interface
+# sem banco: cada tabela guarda os objetos pela chave primária e mantém
+# índices por campo (ex.: pagamentos por CPF), atualizados a cada
+# inserção, alteração e remoção. Assim as buscas agrupadas não precisam
+# percorrer a lista inteira.
+# =====================================================================
+
+from itertools import dropwhile, islice
+
+
+class TabelaIndexada:
+    """Tabela em memória com chave primária e índices secundários por atributo.
+
+    A chave primária é o atributo 'campo_chave' do objeto (ex.: "cpf"). Se o
+    atributo estiver vazio (None), ou se não houver 'campo_chave', a tabela gera
+    uma chave inteira sequencial (e grava no atributo, quando existir).
+    Cada índice secundário mapeia valor do campo -> {chave: objeto}, de modo
+    que inserir, remover e buscar um grupo custam O(1) (mais o tamanho do grupo).
+    Dentro de cada grupo as chaves ficam em ordem crescente (ver _indexar).
+    """
+
+    def __init__(self, campo_chave=None, campos_indexados=()):
+        self.campo_chave = campo_chave
+        self.registros = {}
+        self._indices = {campo: {} for campo in campos_indexados}
+        self._proxima_chave = 1
+
+    # --- Leitura ---
+
+    def __len__(self):
+        return len(self.registros)
+
+    def __contains__(self, chave):
+        return chave in self.registros
+
+    def __iter__(self):
+        return iter(self.registros.values())
+
+    @property
+    def campos_indexados(self):
+        return tuple(self._indices)
+
+    def obter(self, chave, padrao=None):
+        """Retorna o objeto com a chave primária informada (ou 'padrao')."""
+        return self.registros.get(chave, padrao)
+
+    def buscar(self, campo, valor):
+        """Retorna a lista de objetos cujo atributo 'campo' é igual a 'valor', usando o índice."""
+        return list(self._indices[campo].get(valor, {}).values())
+
+    def itens_por(self, campo, valor):
+        """Retorna os pares (chave, objeto) do grupo 'campo' == 'valor', em ordem crescente de chave."""
+        return list(self._indices[campo].get(valor, {}).items())
+
+    def pagina_por(self, campo, valor, apos_chave=None, limite=None):
+        """Retorna uma página do grupo 'campo' == 'valor': até 'limite' objetos com chave > 'apos_chave'.
+
+        Depende de o grupo estar em ordem crescente de chave (mantida por _indexar).
+        """
+        grupo = self._indices[campo].get(valor, {})
+        chaves = iter(grupo) if apos_chave is None else dropwhile(lambda chave: chave <= apos_chave, grupo)
+        return [grupo[chave] for chave in islice(chaves, limite)]
+
+    # --- Alteração ---
+
+    def inserir(self, objeto):
+        """Insere o objeto e retorna a sua chave primária. Lança KeyError se a chave já existir."""
+        chave = getattr(objeto, self.campo_chave) if self.campo_chave else None
+        if chave is None:
+            chave = self._proxima_chave
+            self._proxima_chave += 1
+            if self.campo_chave: setattr(objeto, self.campo_chave, chave)
+        elif chave in self.registros:
+            raise KeyError(chave)
+        elif isinstance(chave, int) and chave >= self._proxima_chave:
+            self._proxima_chave = chave + 1
+        self.registros[chave] = objeto
+        for campo in self._indices:
+            self._indexar(campo, getattr(objeto, campo), chave, objeto)
+        return chave
+
+    def reservar_chave(self):
+        """Retorna a próxima chave sequencial, que nenhum inserir() posterior vai gerar de novo.
+
+        Para registros que precisam da chave antes de entrar na tabela (ex.:
+        os que o repositório em memória grava no diário antes de inserir).
+        """
+        chave = self._proxima_chave
+        self._proxima_chave += 1
+        return chave
+
+    def atualizar(self, chave, **campos):
+        """Altera atributos do objeto e reposiciona-o nos índices afetados."""
+        objeto = self.registros[chave]
+        if self.campo_chave in campos and campos[self.campo_chave] != chave:
+            raise ValueError("A chave primária não pode ser alterada; remova e insira de novo.")
+        for campo, valor in campos.items():
+            if campo in self._indices and getattr(objeto, campo) != valor:
+                self._desindexar(campo, getattr(objeto, campo), chave)
+                self._indexar(campo, valor, chave, objeto)
+            setattr(objeto, campo, valor)
+        return objeto
+
+    def remover(self, chave):
+        """Remove e retorna o objeto com a chave informada (KeyError se não existir)."""
+        objeto = self.registros.pop(chave)
+        for campo in self._indices:
+            self._desindexar(campo, getattr(objeto, campo), chave)
+        return objeto
+
+    def _indexar(self, campo, valor, chave, objeto):
+        # No caso comum (chave sequencial nova) a chave é a maior do grupo e vai
+        # para o fim; senão o grupo é refeito em ordem, para que pagina_por não
+        # repita nem pule registros
+        grupo = self._indices[campo].setdefault(valor, {})
+        ultima = next(reversed(grupo), None)
+        grupo[chave] = objeto
+        if ultima is not None and chave < ultima:
+            self._indices[campo][valor] = dict(sorted(grupo.items()))
+
+    def _desindexar(self, campo, valor, chave):
+        grupo = self._indices[campo].get(valor)
+        if grupo is not None:
+            grupo.pop(chave, None)
+            if not grupo:
+                del self._indices[campo][valor]  # Não deixa grupos vazios acumulando
+
+    # --- Verificação ---
+
+    def verificar_consistencia(self):
+        """Reconstrói os índices a partir dos registros e compara; retorna a lista de divergências."""
+        problemas = []
+        for campo, indice in self._indices.items():
+            esperado = {}
+            for chave, objeto in self.registros.items():
+                esperado.setdefault(getattr(objeto, campo), {})[chave] = objeto
+            if {v: set(g) for v, g in esperado.items()} != {v: set(g) for v, g in indice.items()}:
+                problemas.append(f"Índice '{campo}' divergente dos registros.")
+            for valor, grupo in indice.items():
+                for chave, objeto in grupo.items():
+                    if self.registros.get(chave) is not objeto:
+                        problemas.append(f"Índice '{campo}'={valor!r} aponta para a chave {chave!r} inexistente.")
+        return problemas
+
+
+class ArmazenamentoIndexado:
+    """Conjunto das tabelas do sistema jurídico mantidas em memória.
+
+    - clientes: chave = CPF
+    - processos: chave = número, indexados por CPF do cliente
+    - pagamentos: chave sequencial (id_pagamento), indexados por CPF do cliente
+    - audiencias: chave sequencial (id_audiencia), indexadas por número do processo e por CPF
+    """
+
+    def __init__(self):
+        self.clientes = TabelaIndexada(campo_chave="cpf")
+        self.processos = TabelaIndexada(campo_chave="numero", campos_indexados=("cliente_cpf",))
+        self.pagamentos = TabelaIndexada(campo_chave="id_pagamento", campos_indexados=("cliente_cpf",))
+        self.audiencias = TabelaIndexada(campo_chave="id_audiencia", campos_indexados=("processo_numero", "cliente_cpf"))
+
+    def tabelas(self):
+        return {"clientes": self.clientes, "processos": self.processos,
+                "pagamentos": self.pagamentos, "audiencias": self.audiencias}
+
+    def pagamentos_por_cpf(self, cpf):
+        return self.pagamentos.buscar("cliente_cpf", cpf)
+
+    def processos_por_cpf(self, cpf):
+        return self.processos.buscar("cliente_cpf", cpf)
+
+    def audiencias_por_processo(self, numero_processo):
+        return self.audiencias.buscar("processo_numero", numero_processo)
+
+    def audiencias_por_cpf(self, cpf):
+        return self.audiencias.buscar("cliente_cpf", cpf)
+
+    def verificar_consistencia(self):
+        """Retorna as divergências encontradas em todos os índices (lista vazia = tudo certo)."""
+        return [f"{nome}: {problema}" for nome, tabela in self.tabelas().items()
+                for problema in tabela.verificar_consistencia()]
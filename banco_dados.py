@@ -0,0 +1,766 @@
+# banco_dados.py
+# =====================================================================
+# FUNÇÕES DE ACESSO AO BANCO DE DADOS DO SISTEMA JURÍDICO (MySQL)
+# Separadas da interface gráfica para que scripts sem Tkinter (como o
+# importador em lote 'importar_dados.py') possam usá-las.
+#
+# As funções add_* confiam nas restrições do banco (chave primária de
+# clientes.cpf e processos.numero_processo, chaves estrangeiras para
+# clientes/processos) em vez de consultar antes de inserir: um cadastro
+# custa uma única ida ao banco e continua correto com vários usuários.
+#
+# Cada função pública roda num span de 'instrumentacao.py' (tempo de espera
+# pelo pool, execução, leitura, materialização e quantidade de linhas).
+#
+# As buscas frequentes (find_*) usam comandos preparados: cada conexão do
+# pool prepara o SQL uma vez e depois só envia os parâmetros, sem o servidor
+# analisar o texto de novo a cada chamada (ver _executar_busca).
+#
+# Com réplicas de leitura configuradas (REPLICAS_CONFIG), as buscas e
+# relatórios saem delas e os cadastros vão ao primário (DB_CONFIG); logo
+# depois de um cadastro as leituras também vão ao primário, para que ele
+# apareça na busca seguinte (ver 'roteamento_conexoes.py').
+#
+# PRÉ-REQUISITO:
+# Este arquivo DEVE estar na mesma pasta que 'modelo_abstrato.py',
+# 'pool_conexoes.py', 'roteamento_conexoes.py', 'cache_lru.py' e
+# 'instrumentacao.py'.
+# =====================================================================
+
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from itertools import islice
+import mysql.connector
+from mysql.connector import errorcode
+
+from modelo_abstrato import ClienteConcreto, ProcessoConcreto, PagamentoConcreto, AudienciaConcreta
+from modelo_abstrato import ErroCadastro, DuplicateCliente, DuplicateProcesso, ClienteNotFound, ProcessoNotFound
+from pool_conexoes import PoolConexoes, PoolEsgotado
+from roteamento_conexoes import RoteadorConexoes, replicas_de_texto
+from cache_lru import CacheLRU
+from instrumentacao import instrumentado, fase, registrar_fase, registrar_linhas, registrar_erro, anotar
+from agenda_audiencias import AgendaAudiencias, DURACAO_PADRAO, erro_de_conflito
+import relatorios_financeiros
+import visao_cliente
+
+
+# --- CONFIGURAÇÃO DO BANCO DE DADOS ---
+# !!! IMPORTANTE: Altere estes valores para os da sua configuração do MySQL !!!
+DB_CONFIG = {
+    'user': 'root',
+    'password': 'root', # Coloque a senha do seu usuário root aqui
+    'host': '127.0.0.1',             # ou 'localhost'
+    'database': 'advocacia_db',      # O nome do banco de dados que criamos
+    'raise_on_warnings': True
+}
+
+# Quantidade de registros por INSERT multi-linha nas funções de inserção em lote.
+TAMANHO_LOTE_PADRAO = 1000
+
+# Configuração do pool de conexões compartilhado por todas as funções add_*/find_*.
+POOL_CONFIG = {
+    'tamanho_minimo': 1,     # Conexões mantidas abertas mesmo sem uso
+    'tamanho_maximo': 5,     # Limite de conexões simultâneas com o MySQL
+    'tempo_ocioso': 300.0,   # Segundos até fechar uma conexão parada (acima do mínimo)
+    'tempo_espera': 10.0,    # Segundos esperando uma conexão livre antes de desistir
+}
+
+# Réplicas de leitura (cada uma com um pool como o acima). Cada réplica é um
+# dict com o que muda em relação a DB_CONFIG, ex.: {'host': '10.0.0.12'} ou
+# {'port': 3307}; pela variável SISTEMA_JURIDICO_REPLICAS="host:porta,host:porta".
+# Lista vazia: tudo no primário. Para mudar depois da importação, use configurar_replicas().
+REPLICAS_CONFIG = {
+    'replicas': replicas_de_texto(os.environ.get("SISTEMA_JURIDICO_REPLICAS")),
+    'estrategia': 'rodizio',          # 'rodizio' ou 'menor_latencia'
+    'janela_leitura_propria': 5.0,    # Segundos lendo do primário depois de um cadastro
+    'quarentena': 30.0,               # Segundos sem usar uma réplica que não conectou
+}
+
+# Cache das buscas por chave (find_cliente_by_cpf / find_processo_by_numero).
+# Só resultados encontrados são guardados; add_cliente/add_processo já
+# colocam no cache o objeto que acabaram de gravar.
+CACHE_CONFIG = {
+    'tamanho_maximo': 10000, # Itens por cache (o menos usado sai quando enche)
+    'ttl': 300.0,            # Segundos até um item ser buscado de novo no banco
+}
+
+
+# Comandos preparados das buscas find_* (desligue para comparar no benchmark).
+PREPARADAS_CONFIG = {
+    'ativo': True,
+}
+
+# Chaves por consulta "WHERE ... IN (...)" nas buscas em lote (find_clientes_by_cpfs...).
+TAMANHO_BLOCO_CHAVES = 512
+
+
+# --- FUNÇÕES DE BANCO DE DADOS ---
+
+def _criar_conexao(config=None):
+    """Abre uma conexão nova com o banco de dados (usada pelos pools); padrão: DB_CONFIG."""
+    config = config or DB_CONFIG
+    try:
+        return mysql.connector.connect(**config)
+    except mysql.connector.Error as err:
+        if err.errno == errorcode.ER_ACCESS_DENIED_ERROR:
+            print("Erro de Conexão: Usuário ou senha do banco de dados incorretos.")
+        elif err.errno == errorcode.ER_BAD_DB_ERROR:
+            print(f"Erro de Conexão: O banco de dados '{config['database']}' não existe.")
+        else:
+            print(f"Erro ao conectar ao banco de dados: {err}")
+        raise
+
+def _redefinir_conexao(conn):
+    """Encerra a transação de leitura deixada aberta por um SELECT antes de devolver a conexão."""
+    if conn.in_transaction: conn.rollback()
+
+POOL = PoolConexoes(_criar_conexao, validar=lambda conn: conn.is_connected(),
+                    redefinir=_redefinir_conexao, **POOL_CONFIG)
+
+def _criar_pool_replica(replica):
+    # A configuração é montada a cada conexão: mudanças em DB_CONFIG (ex.: o
+    # banco do benchmark) valem também para as réplicas
+    return PoolConexoes(lambda: _criar_conexao(dict(DB_CONFIG, **replica)), validar=lambda conn: conn.is_connected(),
+                        redefinir=_redefinir_conexao, **POOL_CONFIG)
+
+ROTEADOR = None
+
+def configurar_replicas(replicas=None, **opcoes):
+    """(Re)cria o roteamento das leituras e retorna o RoteadorConexoes.
+
+    'replicas' (lista de dicts sobre DB_CONFIG) e 'opcoes' (estrategia,
+    janela_leitura_propria, quarentena) atualizam REPLICAS_CONFIG; sem
+    argumentos, usa REPLICAS_CONFIG como está. Os pools das réplicas
+    anteriores são fechados.
+    """
+    global ROTEADOR
+    if replicas is not None: REPLICAS_CONFIG['replicas'] = list(replicas)
+    REPLICAS_CONFIG.update(opcoes)
+    anterior = ROTEADOR
+    ROTEADOR = RoteadorConexoes(POOL, [_criar_pool_replica(replica) for replica in REPLICAS_CONFIG['replicas']],
+                                estrategia=REPLICAS_CONFIG['estrategia'],
+                                janela_leitura_propria=REPLICAS_CONFIG['janela_leitura_propria'],
+                                quarentena=REPLICAS_CONFIG['quarentena'])
+    if anterior is not None:
+        for pool in anterior.replicas: pool.fechar()
+    return ROTEADOR
+
+configurar_replicas()
+
+# Erros tratados pelas funções abaixo: falhas do MySQL e pool sem conexão livre.
+ERROS_BD = (mysql.connector.Error, PoolEsgotado)
+
+@contextmanager
+def get_db_connection():
+    """Empresta uma conexão do pool do primário para uso em um bloco 'with'; ela é devolvida ao final.
+
+    Use para gravar e para o que precisa ler o estado mais recente (migrações,
+    exportações); as buscas usam get_db_connection_leitura.
+    """
+    inicio = time.perf_counter()
+    with POOL.conexao() as conn:
+        registrar_fase("conexao", time.perf_counter() - inicio)
+        yield conn
+
+@contextmanager
+def get_db_connection_leitura():
+    """Empresta uma conexão só para consultas: de uma réplica, se houver, ou do primário."""
+    inicio = time.perf_counter()
+    with ROTEADOR.conexao_leitura() as (conn, destino):
+        registrar_fase("conexao", time.perf_counter() - inicio)
+        anotar(destino=destino)
+        yield conn
+
+def estatisticas_pool():
+    """Retorna os contadores do pool do primário (em uso, esperas, tempo de espera...)."""
+    return POOL.estatisticas()
+
+def estatisticas_replicas():
+    """Retorna as leituras por destino (primário, janela após cadastro, cada réplica) e a latência das réplicas."""
+    return ROTEADOR.estatisticas()
+
+CACHE_CLIENTES = CacheLRU(**CACHE_CONFIG)
+CACHE_PROCESSOS = CacheLRU(**CACHE_CONFIG)
+
+def estatisticas_cache():
+    """Retorna os contadores (acertos, falhas, remoções...) dos caches de clientes e processos."""
+    return {"clientes": CACHE_CLIENTES.estatisticas(), "processos": CACHE_PROCESSOS.estatisticas()}
+
+# --- COMANDOS PREPARADOS (por conexão do pool) ---
+# Cada conexão guarda um cursor preparado por texto de SQL. O comando fica
+# preparado no servidor enquanto a conexão existir; se ela reconectar (novo
+# connection_id) ou o servidor descartar o comando, ele é preparado de novo
+# sem que quem chamou perceba. Conexões descartadas pelo pool levam junto
+# os seus cursores (WeakKeyDictionary).
+
+_preparadas = weakref.WeakKeyDictionary()  # conexão -> {sql: (connection_id, cursor preparado)}
+_lock_preparadas = threading.Lock()
+_contadores_preparadas = {"preparos": 0, "reusos": 0, "repreparos": 0}
+
+# Erros do servidor que significam "prepare o comando de novo"
+ERROS_REPREPARAR = (errorcode.ER_UNKNOWN_STMT_HANDLER, errorcode.ER_NEED_REPREPARE)
+
+def _contar_preparada(evento):
+    with _lock_preparadas:
+        _contadores_preparadas[evento] += 1
+
+def estatisticas_preparadas():
+    """Retorna quantas buscas prepararam um comando, reaproveitaram um já preparado ou o prepararam de novo."""
+    with _lock_preparadas:
+        return dict(_contadores_preparadas)
+
+def _executar_busca(conn, sql, params):
+    """Executa uma busca frequente na conexão e retorna todas as linhas (comando preparado, se ativo)."""
+    if not PREPARADAS_CONFIG['ativo']:
+        cursor = conn.cursor()
+        try:
+            with fase("execucao"): cursor.execute(sql, params)
+            with fase("leitura"): return cursor.fetchall()
+        finally:
+            cursor.close()
+    with _lock_preparadas:
+        cursores = _preparadas.setdefault(conn, {})
+    # A conexão está emprestada só para esta thread: 'cursores' não é disputado
+    for tentativa in (1, 2):
+        entrada = cursores.pop(sql, None)
+        if entrada is not None and entrada[0] != conn.connection_id:
+            entrada = None  # Reconectou: os comandos preparados da sessão anterior não existem mais
+            _contar_preparada("repreparos")
+        if entrada is None:
+            cursor = conn.cursor(prepared=True)  # Preparado no servidor no primeiro execute
+            _contar_preparada("preparos"); anotar(preparada="nova")
+        else:
+            cursor = entrada[1]
+            _contar_preparada("reusos"); anotar(preparada="reuso")
+        try:
+            with fase("execucao"): cursor.execute(sql, params)
+            with fase("leitura"): linhas = cursor.fetchall()
+        except mysql.connector.Error as err:
+            try:
+                cursor.close()
+            except mysql.connector.Error:
+                pass
+            if tentativa == 2 or err.errno not in ERROS_REPREPARAR:
+                raise
+            _contar_preparada("repreparos")
+            continue  # O servidor descartou o comando: prepara de novo
+        cursores[sql] = (conn.connection_id, cursor)  # Só volta ao cache depois de um uso sem erro
+        return linhas
+
+# --- COMANDOS DE INSERÇÃO (compartilhados pelas funções unitárias e em lote) ---
+
+SQL_INSERT_CLIENTE = "INSERT INTO clientes (cpf, nome, idade, telefone, endereco, email) VALUES (%s, %s, %s, %s, %s, %s)"
+SQL_INSERT_PROCESSO = "INSERT INTO processos (numero_processo, cliente_cpf, descricao) VALUES (%s, %s, %s)"
+SQL_INSERT_PAGAMENTO = ("INSERT INTO pagamentos (cliente_cpf, valor, descricao, data_vencimento, data_pagamento) "
+                        "VALUES (%s, %s, %s, %s, %s)")
+
+# --- CONSULTAS DE BUSCA (também verificadas com EXPLAIN por 'migracoes.py') ---
+
+SQL_FIND_CLIENTE = "SELECT nome, cpf, idade, telefone, endereco, email FROM clientes WHERE cpf = %s"
+SQL_FIND_PROCESSO = "SELECT numero_processo, descricao, cliente_cpf FROM processos WHERE numero_processo = %s"
+SQL_FIND_PROCESSOS_CPF = ("SELECT numero_processo, descricao, cliente_cpf FROM processos "
+                          "WHERE cliente_cpf = %s ORDER BY numero_processo")
+# Buscas em lote: '{marcadores}' vira "%s, %s, ..." com o tamanho do bloco
+SQL_FIND_CLIENTES = "SELECT nome, cpf, idade, telefone, endereco, email FROM clientes WHERE cpf IN ({marcadores})"
+SQL_FIND_PROCESSOS = ("SELECT numero_processo, descricao, cliente_cpf FROM processos "
+                      "WHERE numero_processo IN ({marcadores})")
+SQL_FIND_PAGAMENTOS = ("SELECT cliente_cpf, valor, descricao, id, data_vencimento, data_pagamento "
+                       "FROM pagamentos WHERE cliente_cpf = %s")
+SQL_LISTAR_NOMES = "SELECT cpf, nome FROM clientes"
+SQL_CLIENTE_DO_PROCESSO = "SELECT cliente_cpf FROM processos WHERE numero_processo = %s"
+# Audiências com início na faixa (início - duração, início + duração) de uma nova audiência.
+# FOR UPDATE pelo índice de data_hora trava a faixa (e os intervalos entre as linhas, no
+# REPEATABLE READ padrão do InnoDB) até o commit: outro agendamento na mesma faixa espera.
+SQL_AUDIENCIAS_NA_FAIXA = """SELECT a.numero_processo, a.data_hora, a.local, a.tipo, p.cliente_cpf, a.id
+    FROM audiencias a JOIN processos p ON a.numero_processo = p.numero_processo
+    WHERE a.data_hora > %s AND a.data_hora < %s FOR UPDATE"""
+SQL_FIND_AUDIENCIAS = """SELECT a.numero_processo, a.data_hora, a.local, a.tipo, p.cliente_cpf, a.id
+             FROM audiencias a JOIN processos p ON a.numero_processo = p.numero_processo
+             WHERE a.numero_processo = %s"""
+SQL_LISTAR_AUDIENCIAS = """SELECT a.numero_processo, a.data_hora, a.local, a.tipo, p.cliente_cpf, a.id
+             FROM audiencias a JOIN processos p ON a.numero_processo = p.numero_processo"""
+
+# Exportação: todos os registros de cada tabela, em ordem de chave
+SQL_EXPORTAR = {
+    "clientes": "SELECT nome, cpf, idade, telefone, endereco, email FROM clientes ORDER BY cpf",
+    "processos": "SELECT numero_processo, descricao, cliente_cpf FROM processos ORDER BY numero_processo",
+    "pagamentos": "SELECT cliente_cpf, valor, descricao, id, data_vencimento, data_pagamento FROM pagamentos ORDER BY id",
+    "audiencias": SQL_LISTAR_AUDIENCIAS + " ORDER BY a.id",
+}
+CLASSES_EXPORTAR = {"clientes": ClienteConcreto, "processos": ProcessoConcreto,
+                    "pagamentos": PagamentoConcreto, "audiencias": AudienciaConcreta}
+
+def _valores_cliente(cliente):
+    return (cliente.cpf, cliente.nome, cliente.idade, cliente.telefone, cliente.endereco, cliente.email)
+
+def _valores_processo(processo):
+    return (processo.numero, processo.cliente_cpf, processo.descricao)
+
+def _valores_pagamento(pagamento):
+    return (pagamento.cliente_cpf, pagamento.valor, pagamento.descricao, pagamento.data_vencimento, pagamento.data_pagamento)
+
+def _inserir(sql, values, descricao, duplicado=None, sem_referencia=None, verificar=None):
+    """Executa um INSERT em uma única ida ao banco e retorna o id gerado (lastrowid) ou None.
+
+    As restrições do banco fazem a validação: chave única violada lança o erro
+    'duplicado' e chave estrangeira inexistente lança 'sem_referencia'
+    (subclasses de ErroCadastro). Outros erros são exibidos e retornam None.
+    Tabelas sem AUTO_INCREMENT (clientes, processos) retornam 0 ao gravar.
+
+    'verificar(cursor)', se informada, roda na mesma transação antes do INSERT
+    e pode recusar o registro lançando um ErroCadastro (a transação é desfeita).
+    Uma transação desfeita pelo servidor por deadlock é repetida uma vez.
+    """
+    anotar(sql=sql)
+    for tentativa in (1, 2):
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    if verificar is not None:
+                        with fase("verificacao"): verificar(cursor)
+                    with fase("execucao"): cursor.execute(sql, values)
+                    with fase("commit"): conn.commit()
+                    ROTEADOR.registrar_escrita()
+                    registrar_linhas(cursor.rowcount)
+                    return cursor.lastrowid
+                finally:
+                    cursor.close()
+        except mysql.connector.IntegrityError as err:
+            if err.errno == errorcode.ER_DUP_ENTRY and duplicado is not None:
+                raise duplicado from err
+            if err.errno in (errorcode.ER_NO_REFERENCED_ROW, errorcode.ER_NO_REFERENCED_ROW_2) and sem_referencia is not None:
+                raise sem_referencia from err
+            registrar_erro(err); print(f"Erro ao adicionar {descricao}: {err}"); return None
+        except ERROS_BD as err:
+            if tentativa == 1 and getattr(err, "errno", None) == errorcode.ER_LOCK_DEADLOCK:
+                continue
+            registrar_erro(err); print(f"Erro ao adicionar {descricao}: {err}"); return None
+
+@instrumentado
+def add_cliente(cliente: ClienteConcreto):
+    """Adiciona um novo cliente ao banco de dados (DuplicateCliente se o CPF já existir)."""
+    try:
+        inserido = _inserir(SQL_INSERT_CLIENTE, _valores_cliente(cliente), "cliente",
+                            duplicado=DuplicateCliente(cliente.cpf)) is not None
+    except ErroCadastro:
+        CACHE_CLIENTES.invalidar(cliente.cpf); raise  # A próxima busca lê o que está no banco
+    if inserido: CACHE_CLIENTES.guardar(cliente.cpf, cliente)
+    else: CACHE_CLIENTES.invalidar(cliente.cpf)
+    return inserido
+
+@instrumentado
+def add_processo(processo: ProcessoConcreto):
+    """Adiciona um novo processo ao banco de dados (DuplicateProcesso ou ClienteNotFound se recusado)."""
+    try:
+        inserido = _inserir(SQL_INSERT_PROCESSO, _valores_processo(processo), "processo",
+                            duplicado=DuplicateProcesso(processo.numero),
+                            sem_referencia=ClienteNotFound(processo.cliente_cpf)) is not None
+    except ErroCadastro:
+        CACHE_PROCESSOS.invalidar(processo.numero); raise
+    if inserido: CACHE_PROCESSOS.guardar(processo.numero, processo)
+    else: CACHE_PROCESSOS.invalidar(processo.numero)
+    return inserido
+
+@instrumentado
+def add_pagamento(pagamento: PagamentoConcreto):
+    """Adiciona um novo pagamento ao banco de dados (ClienteNotFound se o CPF não existir).
+
+    Ao gravar, preenche pagamento.id_pagamento com o id gerado pelo banco.
+    """
+    id_pagamento = _inserir(SQL_INSERT_PAGAMENTO, _valores_pagamento(pagamento), "pagamento",
+                            sem_referencia=ClienteNotFound(pagamento.cliente_cpf))
+    if id_pagamento is None: return False
+    pagamento.id_pagamento = id_pagamento
+    return True
+
+def _verificar_horario_no_banco(audiencia, duracao):
+    """Passo 'verificar' de add_audiencia: recusa (ConflitoAgenda) horário ocupado no mesmo local ou cliente.
+
+    Lê só as audiências da faixa de horário, travando-as até o commit, e usa
+    as mesmas regras da agenda em memória (AgendaAudiencias.conflitos).
+    """
+    def verificar(cursor):
+        cursor.execute(SQL_CLIENTE_DO_PROCESSO, (audiencia.processo_numero,))
+        linha = cursor.fetchone()
+        if linha is None: raise ProcessoNotFound(audiencia.processo_numero)
+        audiencia.cliente_cpf = linha[0]  # Como nos outros backends, o cliente é o do processo
+        cursor.execute(SQL_AUDIENCIAS_NA_FAIXA, (audiencia.data_hora - duracao, audiencia.data_hora + duracao))
+        ocupadas = [AudienciaConcreta.de_linha(linha) for linha in cursor.fetchall()]
+        conflitos = AgendaAudiencias(duracao).construir(ocupadas).conflitos(audiencia)
+        if conflitos: raise erro_de_conflito(conflitos)
+    return verificar
+
+@instrumentado
+def add_audiencia(audiencia: AudienciaConcreta, verificar_conflitos=True):
+    """Adiciona uma nova audiência ao banco de dados (ProcessoNotFound se o processo não existir).
+
+    Com 'verificar_conflitos', recusa (ConflitoAgenda) horário que se sobrepõe a
+    outra audiência no mesmo local ou do mesmo cliente, conferido no banco na
+    mesma transação do INSERT: vale também para agendamentos feitos por outros
+    usuários. Ao gravar, preenche audiencia.id_audiencia com o id gerado pelo banco.
+    """
+    sql = "INSERT INTO audiencias (numero_processo, data_hora, local, tipo) VALUES (%s, %s, %s, %s)"
+    values = (audiencia.processo_numero, audiencia.data_hora, audiencia.local, audiencia.tipo)  # datetime vai direto para DATETIME
+    verificar = _verificar_horario_no_banco(audiencia, DURACAO_PADRAO) if verificar_conflitos else None
+    id_audiencia = _inserir(sql, values, "audiência", sem_referencia=ProcessoNotFound(audiencia.processo_numero),
+                            verificar=verificar)
+    if id_audiencia is None: return False
+    audiencia.id_audiencia = id_audiencia
+    return True
+
+@instrumentado
+def find_cliente_by_cpf(cpf: str):
+    """Busca um cliente pelo CPF e retorna um objeto ClienteConcreto ou None (usa o cache de clientes)."""
+    cliente = CACHE_CLIENTES.obter(cpf)
+    anotar(cache="acerto" if cliente is not None else "falha")
+    if cliente is not None: return cliente
+    sql = SQL_FIND_CLIENTE
+    anotar(sql=sql)
+    try:
+        with get_db_connection_leitura() as conn:
+            result = next(iter(_executar_busca(conn, sql, (cpf,))), None)
+        registrar_linhas(1 if result else 0)
+        if result:
+            with fase("materializacao"): cliente = ClienteConcreto.de_linha(result)
+            CACHE_CLIENTES.guardar(cpf, cliente)
+    except ERROS_BD as err:
+        registrar_erro(err); print(f"Erro ao buscar cliente: {err}")
+    return cliente
+
+@instrumentado
+def find_processo_by_numero(numero: str):
+    """Busca um processo pelo número e retorna um objeto ProcessoConcreto ou None (usa o cache de processos)."""
+    processo = CACHE_PROCESSOS.obter(numero)
+    anotar(cache="acerto" if processo is not None else "falha")
+    if processo is not None: return processo
+    sql = SQL_FIND_PROCESSO
+    anotar(sql=sql)
+    try:
+        with get_db_connection_leitura() as conn:
+            result = next(iter(_executar_busca(conn, sql, (numero,))), None)
+        registrar_linhas(1 if result else 0)
+        if result:
+            with fase("materializacao"): processo = ProcessoConcreto.de_linha(result)
+            CACHE_PROCESSOS.guardar(numero, processo)
+    except ERROS_BD as err:
+        registrar_erro(err); print(f"Erro ao buscar processo: {err}")
+    return processo
+
+@instrumentado
+def find_processos_by_cpf(cpf: str):
+    """Busca os processos de um cliente e retorna uma lista de objetos ProcessoConcreto."""
+    sql = SQL_FIND_PROCESSOS_CPF
+    anotar(sql=sql)
+    processos = []
+    try:
+        with get_db_connection_leitura() as conn:
+            results = _executar_busca(conn, sql, (cpf,))
+        registrar_linhas(len(results))
+        with fase("materializacao"): processos = [ProcessoConcreto.de_linha(row) for row in results]
+    except ERROS_BD as err:
+        registrar_erro(err); print(f"Erro ao buscar processos: {err}")
+    return processos
+
+@instrumentado
+def visao_cliente_by_cpf(cpf: str):
+    """Busca cliente, processos, pagamentos e audiências numa só consulta e retorna uma VisaoCliente (ou None).
+
+    Uma ida ao banco (UNION ALL de 'visao_cliente.py') em vez de uma por
+    busca; o cliente encontrado também vai para o cache de clientes.
+    """
+    sql = visao_cliente.SQL_VISAO_CLIENTE
+    anotar(sql=sql)
+    visao = None
+    try:
+        with get_db_connection_leitura() as conn:
+            results = _executar_busca(conn, sql, visao_cliente.parametros_visao(cpf))
+        registrar_linhas(len(results))
+        with fase("materializacao"): visao = visao_cliente.montar_visao(results)
+        if visao is not None: CACHE_CLIENTES.guardar(cpf, visao.cliente)
+    except ERROS_BD as err:
+        registrar_erro(err); print(f"Erro ao buscar a visão do cliente: {err}")
+    return visao
+
+def _blocos_de_chaves(chaves, tamanho_bloco):
+    """Divide 'chaves' em blocos de até 'tamanho_bloco' para as consultas IN (...).
+
+    Cada bloco é completado (repetindo a última chave) até a próxima potência
+    de 2: assim cada conexão prepara só uns poucos tamanhos de consulta, em
+    vez de um comando preparado para cada quantidade de chaves.
+    """
+    for i in range(0, len(chaves), tamanho_bloco):
+        bloco = chaves[i:i + tamanho_bloco]
+        tamanho = min(1 << (len(bloco) - 1).bit_length(), tamanho_bloco)
+        yield bloco + [bloco[-1]] * (tamanho - len(bloco))
+
+def _buscar_por_chaves(sql, chaves, cache, classe, posicao_chave, tamanho_bloco, descricao):
+    # Cache primeiro; as chaves que faltam vão ao banco em blocos, todos na
+    # mesma conexão do pool. Chaves repetidas são buscadas uma vez.
+    resultado = dict.fromkeys(chaves)
+    faltam = []
+    for chave in resultado:
+        objeto = cache.obter(chave)
+        if objeto is None: faltam.append(chave)
+        else: resultado[chave] = objeto
+    anotar(chaves=len(resultado), cache_acertos=len(resultado) - len(faltam))
+    if not faltam: return resultado
+    anotar(sql=sql, tamanho_bloco=tamanho_bloco)
+    lidas = 0
+    try:
+        with get_db_connection_leitura() as conn:
+            for bloco in _blocos_de_chaves(faltam, tamanho_bloco):
+                linhas = _executar_busca(conn, sql.format(marcadores=", ".join(["%s"] * len(bloco))), bloco)
+                lidas += len(linhas)
+                with fase("materializacao"):
+                    for linha in linhas:
+                        objeto = classe.de_linha(linha)
+                        resultado[linha[posicao_chave]] = objeto
+                        cache.guardar(linha[posicao_chave], objeto)
+    except ERROS_BD as err:
+        registrar_erro(err); print(f"Erro ao buscar {descricao} em lote: {err}")
+    registrar_linhas(lidas)
+    return resultado
+
+@instrumentado
+def find_clientes_by_cpfs(cpfs, tamanho_bloco=TAMANHO_BLOCO_CHAVES):
+    """Busca vários clientes de uma vez e retorna {cpf: ClienteConcreto ou None} (usa o cache de clientes).
+
+    Os CPFs fora do cache são consultados com "WHERE cpf IN (...)" em blocos
+    de 'tamanho_bloco', em vez de uma consulta (e um empréstimo do pool) por CPF.
+    """
+    return _buscar_por_chaves(SQL_FIND_CLIENTES, cpfs, CACHE_CLIENTES, ClienteConcreto, 1, tamanho_bloco, "clientes")
+
+@instrumentado
+def find_processos_by_numeros(numeros, tamanho_bloco=TAMANHO_BLOCO_CHAVES):
+    """Busca vários processos de uma vez e retorna {número: ProcessoConcreto ou None} (usa o cache de processos)."""
+    return _buscar_por_chaves(SQL_FIND_PROCESSOS, numeros, CACHE_PROCESSOS, ProcessoConcreto, 0, tamanho_bloco,
+                              "processos")
+
+def _clausula_pagina(campo_id, apos_id, limite):
+    """Monta o trecho de paginação por chave (keyset): "id > último visto ORDER BY id LIMIT n"."""
+    sql, params = "", []
+    if apos_id is not None:
+        sql += f" AND {campo_id} > %s"; params.append(apos_id)
+    sql += f" ORDER BY {campo_id}"
+    if limite is not None:
+        sql += " LIMIT %s"; params.append(limite)
+    return sql, params
+
+@instrumentado
+def find_pagamentos_by_cpf(cpf: str, apos_id=None, limite=None):
+    """Busca os pagamentos de um cliente e retorna uma lista de objetos PagamentoConcreto.
+
+    Com 'limite', retorna só uma página: os próximos pagamentos com id maior
+    que 'apos_id' (use o id_pagamento do último item da página anterior).
+    """
+    pagamentos = []
+    pagina_sql, pagina_params = _clausula_pagina("id", apos_id, limite)
+    sql = SQL_FIND_PAGAMENTOS + pagina_sql
+    anotar(sql=sql)
+    try:
+        with get_db_connection_leitura() as conn:
+            results = _executar_busca(conn, sql, (cpf, *pagina_params))
+        registrar_linhas(len(results))
+        with fase("materializacao"): pagamentos = [PagamentoConcreto.de_linha(row) for row in results]
+    except ERROS_BD as err:
+        registrar_erro(err); print(f"Erro ao buscar pagamentos: {err}")
+    return pagamentos
+
+@instrumentado
+def find_audiencias_by_processo(numero_processo: str, apos_id=None, limite=None):
+    """Busca as audiências de um processo e retorna uma lista de objetos AudienciaConcreta.
+
+    'apos_id' e 'limite' funcionam como em find_pagamentos_by_cpf (id_audiencia).
+    """
+    audiencias = []
+    pagina_sql, pagina_params = _clausula_pagina("a.id", apos_id, limite)
+    sql = SQL_FIND_AUDIENCIAS + pagina_sql
+    anotar(sql=sql)
+    try:
+        with get_db_connection_leitura() as conn:
+            results = _executar_busca(conn, sql, (numero_processo, *pagina_params))
+        registrar_linhas(len(results))
+        with fase("materializacao"): audiencias = [AudienciaConcreta.de_linha(row) for row in results]
+    except ERROS_BD as err:
+        registrar_erro(err); print(f"Erro ao buscar audiências: {err}")
+    return audiencias
+
+@instrumentado
+def listar_nomes_clientes(tamanho_bloco=10000):
+    """Retorna [(cpf, nome), ...] de todos os clientes, lidos em blocos (monta o índice de 'indice_nomes.py')."""
+    anotar(sql=SQL_LISTAR_NOMES)
+    pares = []
+    try:
+        with get_db_connection_leitura() as conn:
+            cursor = conn.cursor()
+            with fase("execucao"): cursor.execute(SQL_LISTAR_NOMES)
+            with fase("leitura"):
+                while True:
+                    bloco = cursor.fetchmany(tamanho_bloco)
+                    if not bloco: break
+                    pares.extend(bloco)
+            cursor.close()
+        registrar_linhas(len(pares))
+    except ERROS_BD as err:
+        registrar_erro(err); print(f"Erro ao listar os nomes dos clientes: {err}")
+    return pares
+
+def exportar(tabela, tamanho_bloco=10000):
+    """Gera todos os registros de 'tabela' (objetos do modelo) em ordem de chave, lidos em blocos.
+
+    Diferente das buscas, erros do banco são propagados: uma exportação
+    interrompida não pode passar por completa.
+    """
+    sql, classe = SQL_EXPORTAR[tabela], CLASSES_EXPORTAR[tabela]
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql)
+        while linhas := cursor.fetchmany(tamanho_bloco):
+            for linha in linhas:
+                yield classe.de_linha(linha)
+        cursor.close()
+
+@instrumentado
+def listar_audiencias():
+    """Retorna todas as audiências (AudienciaConcreta), para montar a agenda de 'agenda_audiencias.py'."""
+    anotar(sql=SQL_LISTAR_AUDIENCIAS)
+    audiencias = []
+    try:
+        with get_db_connection_leitura() as conn:
+            cursor = conn.cursor()
+            with fase("execucao"): cursor.execute(SQL_LISTAR_AUDIENCIAS)
+            with fase("leitura"): results = cursor.fetchall()
+            cursor.close()
+        registrar_linhas(len(results))
+        with fase("materializacao"): audiencias = [AudienciaConcreta.de_linha(row) for row in results]
+    except ERROS_BD as err:
+        registrar_erro(err); print(f"Erro ao listar as audiências: {err}")
+    return audiencias
+
+
+# --- RELATÓRIOS FINANCEIROS (somados no banco; ver 'relatorios_financeiros.py') ---
+
+def _relatorio(sql, params, descricao):
+    """Executa uma consulta de agregação e retorna as linhas (poucas: já vêm agrupadas)."""
+    anotar(sql=sql)
+    linhas = []
+    try:
+        with get_db_connection_leitura() as conn:
+            cursor = conn.cursor()
+            with fase("execucao"): cursor.execute(sql, params)
+            with fase("leitura"): linhas = cursor.fetchall()
+            cursor.close()
+        registrar_linhas(len(linhas))
+    except ERROS_BD as err:
+        registrar_erro(err); print(f"Erro ao gerar o relatório de {descricao}: {err}")
+    return linhas
+
+@instrumentado
+def totais_por_cliente(inicio=None, fim=None):
+    """Total, recebido e em aberto de cada cliente (lista de dicionários, maiores totais primeiro)."""
+    sql, params = relatorios_financeiros.sql_totais_por_cliente(inicio, fim)
+    return relatorios_financeiros.montar(relatorios_financeiros.COLUNAS_POR_CLIENTE,
+                                         _relatorio(sql, params, "totais por cliente"))
+
+@instrumentado
+def totais_por_mes(inicio=None, fim=None):
+    """Total, recebido e em aberto por mês 'AAAA-MM' (lista de dicionários em ordem de mês)."""
+    sql, params = relatorios_financeiros.sql_totais_por_mes(inicio, fim)
+    return relatorios_financeiros.montar(relatorios_financeiros.COLUNAS_POR_MES,
+                                         _relatorio(sql, params, "totais por mês"))
+
+@instrumentado
+def situacao_pagamentos(hoje=None):
+    """Quantidade e total de pagamentos recebidos, a vencer e vencidos."""
+    sql, params = relatorios_financeiros.sql_situacao(hoje)
+    return relatorios_financeiros.montar_situacao(_relatorio(sql, params, "situação dos pagamentos"))
+
+
+# --- INSERÇÃO EM LOTE ---
+
+class ResultadoLote:
+    """Resumo de uma inserção em lote: quantos registros entraram e quais foram rejeitados."""
+    def __init__(self):
+        self.inseridos = 0
+        self.rejeitados = []  # Lista de (posição na entrada, registro, motivo)
+        self.erro = None      # Erro do banco que interrompeu a inserção (None = foi até o fim)
+
+    def __repr__(self):
+        interrompido = f", erro={self.erro!r}" if self.erro is not None else ""
+        return f"ResultadoLote(inseridos={self.inseridos}, rejeitados={len(self.rejeitados)}{interrompido})"
+
+# Erros causados pelo próprio registro (chave duplicada, referência inexistente, valor inválido)
+ERROS_REGISTRO = (mysql.connector.IntegrityError, mysql.connector.DataError)
+
+def _inserir_em_lote(sql, registros, para_valores, tamanho_lote, ao_concluir_lote):
+    """Insere 'registros' em blocos de 'tamanho_lote', com um INSERT multi-linha e um commit por bloco.
+
+    Se o bloco inteiro falhar (ex.: um CPF duplicado), ele é desfeito e repetido
+    linha a linha na mesma transação, para que só os registros com problema
+    sejam rejeitados sem abortar o restante da importação. Só erros do próprio
+    registro (ERROS_REGISTRO) são rejeitados; os demais (queda da conexão,
+    deadlock) interrompem a importação, com os blocos já gravados mantidos.
+    """
+    resultado = ResultadoLote()
+    iterador = iter(registros)
+    posicao = 0
+    anotar(sql=sql, tamanho_lote=tamanho_lote)
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            while True:
+                bloco = list(islice(iterador, tamanho_lote))
+                if not bloco: break
+                inseridos_antes, rejeitados_antes = resultado.inseridos, len(resultado.rejeitados)
+                linhas = []  # Trios (posição, registro, valores) prontos para o banco
+                for registro in bloco:
+                    try:
+                        linhas.append((posicao, registro, para_valores(registro)))
+                    except (AttributeError, TypeError, ValueError) as err:
+                        resultado.rejeitados.append((posicao, registro, f"Registro inválido: {err}"))
+                    posicao += 1
+                if linhas:
+                    try:
+                        with fase("execucao"): cursor.executemany(sql, [valores for _, _, valores in linhas])
+                        with fase("commit"): conn.commit()
+                        resultado.inseridos += len(linhas)
+                    except ERROS_REGISTRO:
+                        conn.rollback()
+                        inseridos, rejeitados = 0, []  # Só contam depois do commit do bloco
+                        for pos, registro, valores in linhas:
+                            try:
+                                cursor.execute(sql, valores)
+                                inseridos += 1
+                            except ERROS_REGISTRO as err:
+                                rejeitados.append((pos, registro, str(err)))
+                        conn.commit()
+                        resultado.inseridos += inseridos
+                        resultado.rejeitados.extend(rejeitados)
+                    ROTEADOR.registrar_escrita()
+                if ao_concluir_lote:
+                    ao_concluir_lote(resultado.inseridos - inseridos_antes, resultado.rejeitados[rejeitados_antes:])
+            cursor.close()
+    except ERROS_BD as err:
+        resultado.erro = err
+        registrar_erro(err); print(f"Erro na inserção em lote (interrompida): {err}")
+    registrar_linhas(resultado.inseridos)
+    return resultado
+
+@instrumentado
+def add_clientes(clientes, tamanho_lote=TAMANHO_LOTE_PADRAO, ao_concluir_lote=None):
+    """Adiciona vários clientes (qualquer iterável de ClienteConcreto) e retorna um ResultadoLote."""
+    return _inserir_em_lote(SQL_INSERT_CLIENTE, clientes, _valores_cliente, tamanho_lote, ao_concluir_lote)
+
+@instrumentado
+def add_processos(processos, tamanho_lote=TAMANHO_LOTE_PADRAO, ao_concluir_lote=None):
+    """Adiciona vários processos (qualquer iterável de ProcessoConcreto) e retorna um ResultadoLote."""
+    return _inserir_em_lote(SQL_INSERT_PROCESSO, processos, _valores_processo, tamanho_lote, ao_concluir_lote)
+
+@instrumentado
+def add_pagamentos(pagamentos, tamanho_lote=TAMANHO_LOTE_PADRAO, ao_concluir_lote=None):
+    """Adiciona vários pagamentos (qualquer iterável de PagamentoConcreto) e retorna um ResultadoLote."""
+    return _inserir_em_lote(SQL_INSERT_PAGAMENTO, pagamentos, _valores_pagamento, tamanho_lote, ao_concluir_lote)
@@ -0,0 +1,253 @@
+# benchmark_acesso_dados.py
+# =====================================================================
+# BENCHMARK DAS FUNÇÕES DE ACESSO A DADOS
+# Mede add_cliente, find_cliente_by_cpf, find_pagamentos_by_cpf e
+# find_audiencias_by_processo com as tabelas em tamanhos diferentes
+# (por padrão 1.000, 100.000 e 1.000.000 de linhas por tabela).
+# Para cada operação informa a latência p50/p95/p99 e as operações por
+# segundo; os resultados podem ser salvos em JSON e comparados com um
+# arquivo de referência (baseline) para acusar regressões.
+#
+# Uso:
+#   python benchmark_acesso_dados.py                          (SQLite em arquivo temporário)
+#   python benchmark_acesso_dados.py --tamanhos 1000 100000 --saida atual.json
+#   python benchmark_acesso_dados.py --saida atual.json --baseline referencia.json
+#   python benchmark_acesso_dados.py --backend mysql --banco-mysql advocacia_bench
+#
+# Para medir o ganho dos comandos preparados do MySQL, rode uma vez com
+# --sem-preparadas --saida sem.json e outra com --baseline sem.json.
+#
+# Com MySQL, as tabelas do banco indicado são ESVAZIADAS a cada tamanho:
+# use um banco só para o benchmark, nunca o 'advocacia_db' de produção.
+# =====================================================================
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from statistics import quantiles
+
+from modelo_abstrato import ClienteConcreto, ProcessoConcreto, PagamentoConcreto, AudienciaConcreta
+from repositorio import RepositorioMemoria, RepositorioSQLite, RepositorioMySQL
+
+TAMANHOS_PADRAO = [1_000, 100_000, 1_000_000]
+PAGAMENTOS_POR_CLIENTE = 10    # Pagamentos e audiências se concentram em 1/10 dos clientes/processos
+TAMANHO_PAGINA = 100           # Mesma página usada pelo navegador de resultados
+TAMANHO_LOTE = 10_000          # Linhas por executemany na semeadura
+
+
+# --- Dados de exemplo ---
+
+def _cpf(i): return f"{i:011d}"
+def _numero(i): return f"{i:07d}-00.2024"
+
+def _linhas(n):
+    """Linhas de cada tabela para 'n' registros por tabela (na ordem das colunas do INSERT)."""
+    grupos = max(1, n // PAGAMENTOS_POR_CLIENTE)
+    return {
+        "clientes": ((_cpf(i), f"Cliente {i}", 20 + i % 60, "11 99999-0000", "Rua A, 1", f"c{i}@x.com") for i in range(n)),
+        "processos": ((_numero(i), _cpf(i), "Ação de cobrança") for i in range(n)),
+        "pagamentos": ((_cpf(i % grupos), 100.0 + i % 7, "Honorários") for i in range(n)),
+        "audiencias": ((_numero(i % grupos), f"2025-{1 + i % 12:02d}-{1 + i % 28:02d} 14:00:00", "Fórum Central", "Conciliação")
+                       for i in range(n)),
+    }
+
+SQL_SEMEADURA = {
+    "clientes": "INSERT INTO clientes (cpf, nome, idade, telefone, endereco, email) VALUES (?, ?, ?, ?, ?, ?)",
+    "processos": "INSERT INTO processos (numero_processo, cliente_cpf, descricao) VALUES (?, ?, ?)",
+    "pagamentos": "INSERT INTO pagamentos (cliente_cpf, valor, descricao) VALUES (?, ?, ?)",
+    "audiencias": "INSERT INTO audiencias (numero_processo, data_hora, local, tipo) VALUES (?, ?, ?, ?)",
+}
+
+def _em_lotes(linhas, tamanho):
+    lote = []
+    for linha in linhas:
+        lote.append(linha)
+        if len(lote) == tamanho:
+            yield lote; lote = []
+    if lote: yield lote
+
+
+# --- Preparação de cada backend (repositório vazio + semeadura em lote) ---
+
+def _semear_sql(conn, linhas_por_tabela, marcador):
+    cursor = conn.cursor()
+    for tabela, linhas in linhas_por_tabela.items():
+        sql = SQL_SEMEADURA[tabela].replace("?", marcador)
+        for lote in _em_lotes(linhas, TAMANHO_LOTE):
+            cursor.executemany(sql, lote)
+        conn.commit()
+    cursor.close()
+
+# 'linhas' (opcional) troca os dados de _linhas(n) por outros no mesmo formato
+def preparar_memoria(n, args, linhas=None):
+    repo = RepositorioMemoria()
+    bd = repo.armazenamento
+    linhas = linhas or _linhas(n)
+    for cpf, nome, *resto in linhas["clientes"]:
+        bd.clientes.inserir(ClienteConcreto(nome, cpf, *resto))
+    for numero, cpf, descricao in linhas["processos"]:
+        bd.processos.inserir(ProcessoConcreto(numero, descricao, cpf))
+    for cpf, valor, descricao in linhas["pagamentos"]:
+        bd.pagamentos.inserir(PagamentoConcreto(cpf, valor, descricao))
+    for numero, data_hora, local, tipo in linhas["audiencias"]:
+        bd.audiencias.inserir(AudienciaConcreta(numero, datetime.fromisoformat(data_hora), local, tipo,
+                                                bd.processos.obter(numero).cliente_cpf))
+    return repo
+
+def preparar_sqlite(n, args, linhas=None):
+    caminho = os.path.join(args.pasta, f"benchmark_{n}.db")
+    for sufixo in ("", "-wal", "-shm"):
+        if os.path.exists(caminho + sufixo): os.remove(caminho + sufixo)
+    repo = RepositorioSQLite(caminho)
+    _semear_sql(repo._conexao(), linhas or _linhas(n), "?")
+    repo._conexao().execute("ANALYZE")
+    return repo
+
+def preparar_mysql(n, args, linhas=None):
+    import banco_dados, migracoes
+    banco_dados.DB_CONFIG['database'] = args.banco_mysql
+    banco_dados.PREPARADAS_CONFIG['ativo'] = not getattr(args, "sem_preparadas", False)
+    migracoes.aplicar_migracoes()
+    with banco_dados.get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for tabela in ("audiencias", "pagamentos", "processos", "clientes"):
+            cursor.execute(f"TRUNCATE TABLE {tabela}")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        _semear_sql(conn, linhas or _linhas(n), "%s")
+        for tabela in SQL_SEMEADURA:
+            cursor.execute(f"ANALYZE TABLE {tabela}"); cursor.fetchall()
+        cursor.close()
+    # Sem cache: mede o caminho até o banco, não o acerto no CacheLRU
+    banco_dados.CACHE_CLIENTES.limpar(); banco_dados.CACHE_PROCESSOS.limpar()
+    banco_dados.CACHE_CLIENTES.ttl = banco_dados.CACHE_PROCESSOS.ttl = 0
+    return RepositorioMySQL()
+
+BACKENDS = {"memoria": preparar_memoria, "sqlite": preparar_sqlite, "mysql": preparar_mysql}
+
+
+# --- Medição ---
+
+def _operacoes(repo, n, rng):
+    """Retorna {nome: função sem argumentos} das operações medidas, com chaves sorteadas."""
+    grupos = max(1, n // PAGAMENTOS_POR_CLIENTE)
+    novos = iter(range(n, 10 * n + 1_000_000))  # CPFs que ainda não existem
+    return {
+        "add_cliente": lambda: repo.add_cliente(
+            ClienteConcreto("Cliente novo", _cpf(next(novos)), 30, "11 99999-0000", "Rua B, 2", "novo@x.com")),
+        "find_cliente_by_cpf": lambda: repo.find_cliente_by_cpf(_cpf(rng.randrange(n))),
+        "find_pagamentos_by_cpf": lambda: repo.find_pagamentos_by_cpf(_cpf(rng.randrange(grupos)), limite=TAMANHO_PAGINA),
+        "find_audiencias_by_processo": lambda: repo.find_audiencias_by_processo(_numero(rng.randrange(grupos)),
+                                                                                limite=TAMANHO_PAGINA),
+    }
+
+def medir(operacao, iteracoes, aquecimento):
+    """Executa a operação e retorna as latências (ms) em p50/p95/p99 e as operações por segundo."""
+    for _ in range(aquecimento):
+        operacao()
+    tempos = []
+    inicio_total = time.perf_counter()
+    for _ in range(iteracoes):
+        inicio = time.perf_counter()
+        operacao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    total = time.perf_counter() - inicio_total
+    percentis = quantiles(tempos, n=100, method="inclusive")
+    return {"p50_ms": percentis[49], "p95_ms": percentis[94], "p99_ms": percentis[98],
+            "ops_s": iteracoes / total, "iteracoes": iteracoes}
+
+
+# --- Comparação com a referência ---
+
+def comparar(atual, referencia, tolerancia):
+    """Lista as regressões: p95 maior ou ops/s menor que a referência além da tolerância (fração)."""
+    regressoes = []
+    for tamanho, operacoes in atual["resultados"].items():
+        for nome, medida in operacoes.items():
+            antes = referencia.get("resultados", {}).get(tamanho, {}).get(nome)
+            if antes is None:
+                continue
+            if medida["p95_ms"] > antes["p95_ms"] * (1 + tolerancia):
+                regressoes.append(f"{nome} com {tamanho} linhas: p95 {antes['p95_ms']:.3f} -> {medida['p95_ms']:.3f} ms")
+            if medida["ops_s"] < antes["ops_s"] * (1 - tolerancia):
+                regressoes.append(f"{nome} com {tamanho} linhas: ops/s {antes['ops_s']:,.0f} -> {medida['ops_s']:,.0f}")
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das funções de acesso a dados.")
+    parser.add_argument("--backend", choices=BACKENDS, default="sqlite", help="Armazenamento medido (padrão: sqlite).")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO, help="Linhas por tabela.")
+    parser.add_argument("--iteracoes", type=int, default=2000, help="Execuções medidas por operação.")
+    parser.add_argument("--aquecimento", type=int, default=100, help="Execuções descartadas antes de medir.")
+    parser.add_argument("--semente", type=int, default=42, help="Semente das chaves sorteadas (reprodutibilidade).")
+    parser.add_argument("--pasta", default=None, help="Pasta dos arquivos SQLite (padrão: temporária).")
+    parser.add_argument("--banco-mysql", default=None, help="Banco MySQL de teste (obrigatório com --backend mysql).")
+    parser.add_argument("--sem-preparadas", action="store_true",
+                        help="MySQL: envia o texto do SQL a cada busca, sem comandos preparados.")
+    parser.add_argument("--saida", help="Arquivo JSON onde salvar os resultados.")
+    parser.add_argument("--baseline", help="Arquivo JSON de referência para comparar.")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Piora aceita em relação à referência (0.2 = 20%%).")
+    args = parser.parse_args(argv)
+
+    if args.backend == "mysql" and not args.banco_mysql:
+        parser.error("--backend mysql exige --banco-mysql (um banco só para o benchmark; as tabelas são esvaziadas).")
+    pasta_temporaria = None
+    if args.backend == "sqlite" and args.pasta is None:
+        pasta_temporaria = tempfile.TemporaryDirectory(prefix="benchmark_")
+        args.pasta = pasta_temporaria.name
+
+    resultado = {
+        "meta": {"backend": args.backend, "data": datetime.now().isoformat(timespec="seconds"),
+                 "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+                 "plataforma": platform.platform(), "iteracoes": args.iteracoes, "semente": args.semente,
+                 "preparadas": args.backend == "mysql" and not args.sem_preparadas},
+        "resultados": {},
+    }
+    print(f"{'Linhas':>10} {'Operação':<28} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'ops/s':>11}")
+    try:
+        for n in args.tamanhos:
+            inicio = time.perf_counter()
+            repo = BACKENDS[args.backend](n, args)
+            print(f"{n:>10} (semeadura em {time.perf_counter() - inicio:.1f}s)")
+            rng = random.Random(args.semente)
+            medidas = {}
+            for nome, operacao in _operacoes(repo, n, rng).items():
+                medidas[nome] = m = medir(operacao, args.iteracoes, args.aquecimento)
+                print(f"{n:>10} {nome:<28} {m['p50_ms']:>9.3f} {m['p95_ms']:>9.3f} {m['p99_ms']:>9.3f} {m['ops_s']:>11,.0f}")
+            resultado["resultados"][str(n)] = medidas
+            if args.backend == "mysql":
+                import banco_dados
+                print(f"{n:>10} comandos preparados: {banco_dados.estatisticas_preparadas()}")
+            if args.backend != "mysql":  # O pool do MySQL é reaproveitado no próximo tamanho
+                repo.fechar()
+    finally:
+        if pasta_temporaria is not None: pasta_temporaria.cleanup()
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+        print(f"Resultados salvos em '{args.saida}'.")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as arquivo:
+            referencia = json.load(arquivo)
+        if referencia.get("meta", {}).get("backend") != args.backend:
+            print(f"Aviso: a referência foi medida com outro backend ({referencia.get('meta', {}).get('backend')}).")
+        regressoes = comparar(resultado, referencia, args.tolerancia)
+        for regressao in regressoes:
+            print(f"REGRESSÃO: {regressao}")
+        if regressoes:
+            return 1
+        print(f"Sem regressões em relação a '{args.baseline}' (tolerância de {args.tolerancia:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
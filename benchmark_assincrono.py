@@ -0,0 +1,140 @@
+# benchmark_assincrono.py
+# =====================================================================
+# BENCHMARK: BUSCAS EM LOTE SÍNCRONAS x ASYNCIO x IN (...)
+# Busca um lote de CPFs (por padrão 500) de três formas e compara a vazão:
+#   - síncrona: find_cliente_by_cpf um CPF depois do outro;
+#   - asyncio:  RepositorioAssincrono.buscar_clientes, com várias
+#               concorrências (consultas simultâneas);
+#   - IN:       find_clientes_by_cpfs, uma consulta "WHERE cpf IN (...)"
+#               por bloco de chaves.
+#
+# Com SQLite/memória cada busca leva microssegundos e não há rede, então
+# não há espera para sobrepor. --latencia-ms acrescenta uma espera fixa a
+# cada busca (a cada bloco, na forma IN), simulando a ida e volta até um
+# servidor MySQL (padrão: 1 ms nesses backends, 0 com --backend mysql, que
+# já tem a rede de verdade).
+#
+# Uso:
+#   python benchmark_assincrono.py                              (SQLite + 1 ms simulado)
+#   python benchmark_assincrono.py --lote 500 --concorrencias 1 4 16 --saida assincrono.json
+#   python benchmark_assincrono.py --backend mysql --banco-mysql advocacia_bench
+#
+# Com MySQL, as tabelas do banco indicado são ESVAZIADAS (ver
+# benchmark_acesso_dados.py): use um banco só para o benchmark.
+# =====================================================================
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from statistics import median
+
+from benchmark_acesso_dados import BACKENDS, _cpf
+from repositorio import TAMANHO_BLOCO_CHAVES_SQLITE
+from repositorio_assincrono import buscar_clientes_em_lote
+
+
+class RepositorioComLatencia:
+    """Acrescenta uma espera fixa a cada busca de cliente, como a ida e volta até um servidor."""
+
+    def __init__(self, repo, latencia_ms):
+        self.repo = repo
+        self.latencia = latencia_ms / 1000
+
+    def find_cliente_by_cpf(self, cpf):
+        time.sleep(self.latencia)
+        return self.repo.find_cliente_by_cpf(cpf)
+
+    def find_clientes_by_cpfs(self, cpfs):
+        cpfs = list(dict.fromkeys(cpfs))
+        time.sleep(self.latencia * -(-len(cpfs) // TAMANHO_BLOCO_CHAVES_SQLITE))  # Uma ida e volta por bloco
+        return self.repo.find_clientes_by_cpfs(cpfs)
+
+
+def medir_sincrono(repo, cpfs):
+    inicio = time.perf_counter()
+    encontrados = {cpf: repo.find_cliente_by_cpf(cpf) for cpf in cpfs}
+    return time.perf_counter() - inicio, encontrados
+
+def medir_assincrono(repo, cpfs, concorrencia):
+    inicio = time.perf_counter()
+    encontrados = buscar_clientes_em_lote(repo, cpfs, concorrencia)
+    return time.perf_counter() - inicio, encontrados
+
+def medir_in(repo, cpfs):
+    inicio = time.perf_counter()
+    encontrados = repo.find_clientes_by_cpfs(cpfs)
+    return time.perf_counter() - inicio, encontrados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Buscas em lote: síncronas x asyncio x IN (...).")
+    parser.add_argument("--backend", choices=BACKENDS, default="sqlite", help="Armazenamento medido (padrão: sqlite).")
+    parser.add_argument("--tamanho", type=int, default=100_000, help="Linhas por tabela.")
+    parser.add_argument("--lote", type=int, default=500, help="CPFs buscados por lote.")
+    parser.add_argument("--concorrencias", type=int, nargs="+", default=[1, 4, 16, 32],
+                        help="Consultas simultâneas medidas na versão asyncio.")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Lotes medidos por forma (vale a mediana).")
+    parser.add_argument("--latencia-ms", type=float, default=None,
+                        help="Espera simulada por busca (padrão: 1 ms; 0 com MySQL).")
+    parser.add_argument("--semente", type=int, default=42, help="Semente dos CPFs sorteados.")
+    parser.add_argument("--pasta", default=None, help="Pasta do arquivo SQLite (padrão: temporária).")
+    parser.add_argument("--banco-mysql", default=None, help="Banco MySQL de teste (obrigatório com --backend mysql).")
+    parser.add_argument("--saida", help="Arquivo JSON onde salvar os resultados.")
+    args = parser.parse_args(argv)
+
+    if args.backend == "mysql" and not args.banco_mysql:
+        parser.error("--backend mysql exige --banco-mysql (um banco só para o benchmark; as tabelas são esvaziadas).")
+    if args.latencia_ms is None:
+        args.latencia_ms = 0.0 if args.backend == "mysql" else 1.0
+    pasta_temporaria = None
+    if args.backend == "sqlite" and args.pasta is None:
+        pasta_temporaria = tempfile.TemporaryDirectory(prefix="benchmark_")
+        args.pasta = pasta_temporaria.name
+
+    rng = random.Random(args.semente)
+    try:
+        repo = BACKENDS[args.backend](args.tamanho, args)
+        medido = RepositorioComLatencia(repo, args.latencia_ms) if args.latencia_ms else repo
+        # Metade dos CPFs existe, metade não (como numa planilha a validar)
+        lotes = [[_cpf(rng.randrange(2 * args.tamanho)) for _ in range(args.lote)] for _ in range(args.repeticoes)]
+
+        formas = [("síncrona", lambda cpfs: medir_sincrono(medido, cpfs))]
+        formas += [(f"asyncio x{c}", lambda cpfs, c=c: medir_assincrono(medido, cpfs, c)) for c in args.concorrencias]
+        formas.append(("IN (...)", lambda cpfs: medir_in(medido, cpfs)))
+        print(f"{args.lote} CPFs por lote, {args.tamanho} clientes, backend {args.backend}, "
+              f"latência simulada {args.latencia_ms} ms")
+        print(f"{'Forma':<14} {'Lote (ms)':>10} {'buscas/s':>11} {'Ganho':>7}")
+        resultados, referencia, esperado = {}, None, None
+        for nome, medir in formas:
+            tempos = []
+            for cpfs in lotes:
+                segundos, encontrados = medir(cpfs)
+                tempos.append(segundos)
+            if esperado is None:
+                esperado = encontrados
+            elif {c: e is None for c, e in encontrados.items()} != {c: e is None for c, e in esperado.items()}:
+                raise AssertionError(f"A forma '{nome}' encontrou clientes diferentes da síncrona.")
+            segundos = median(tempos)
+            referencia = referencia or segundos
+            resultados[nome] = {"lote_ms": segundos * 1000, "buscas_s": args.lote / segundos, "ganho": referencia / segundos}
+            print(f"{nome:<14} {segundos * 1000:>10.1f} {args.lote / segundos:>11,.0f} {referencia / segundos:>6.1f}x")
+        if args.backend != "mysql":
+            repo.fechar()
+    finally:
+        if pasta_temporaria is not None: pasta_temporaria.cleanup()
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump({"meta": {"backend": args.backend, "data": datetime.now().isoformat(timespec="seconds"),
+                                "tamanho": args.tamanho, "lote": args.lote, "latencia_ms": args.latencia_ms},
+                       "resultados": resultados}, arquivo, indent=2, ensure_ascii=False)
+        print(f"Resultados salvos em '{args.saida}'.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
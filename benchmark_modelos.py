@@ -0,0 +1,121 @@
+# benchmark_modelos.py
+# =====================================================================
+# BENCHMARK DE MEMÓRIA E VELOCIDADE DOS MODELOS
+# Compara as classes de 'modelo_abstrato.py' (com __slots__) com uma cópia
+# da versão anterior (atributos em __dict__), criando N objetos de cada.
+#
+# Uso:
+#   python benchmark_modelos.py            (1.000.000 de objetos por classe)
+#   python benchmark_modelos.py --n 200000
+# =====================================================================
+
+import argparse
+import gc
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+
+from modelo_abstrato import ClienteConcreto, ProcessoConcreto, PagamentoConcreto, AudienciaConcreta
+
+
+# --- Versão anterior dos modelos (sem __slots__), só para comparação ---
+
+class _ClienteAntigo(ABC):
+    def __init__(self, nome, cpf, idade, telefone, endereco, email):
+        self.nome = nome; self.cpf = cpf; self.idade = idade
+        self.telefone = telefone; self.endereco = endereco; self.email = email
+    @abstractmethod
+    def obter_identificacao(self): pass
+
+class ClienteAntigo(_ClienteAntigo):
+    def obter_identificacao(self): return f"Cliente: {self.nome} (CPF: {self.cpf})"
+
+class _ProcessoAntigo(ABC):
+    def __init__(self, numero, descricao, cliente_cpf):
+        self.numero = numero; self.descricao = descricao; self.cliente_cpf = cliente_cpf
+    @abstractmethod
+    def obter_resumo(self): pass
+
+class ProcessoAntigo(_ProcessoAntigo):
+    def obter_resumo(self): return f"Processo #{self.numero}"
+
+class _PagamentoAntigo(ABC):
+    def __init__(self, cliente_cpf, valor, descricao):
+        self.cliente_cpf = cliente_cpf; self.valor = valor; self.descricao = descricao
+    @abstractmethod
+    def confirmar_pagamento(self): pass
+
+class PagamentoAntigo(_PagamentoAntigo):
+    def confirmar_pagamento(self): return f"Pagamento de R${self.valor:.2f}"
+
+class _AudienciaAntiga(ABC):
+    def __init__(self, processo_numero, data_hora, local, tipo, cliente_cpf):
+        self.processo_numero = processo_numero; self.data_hora = data_hora
+        self.local = local; self.tipo = tipo; self.cliente_cpf = cliente_cpf
+    @abstractmethod
+    def informar_status_audiencia(self): pass
+
+class AudienciaAntiga(_AudienciaAntiga):
+    def informar_status_audiencia(self): return f"Audiência do Processo #{self.processo_numero}"
+
+
+# --- Linhas de exemplo, como viriam do banco (ordem do construtor) ---
+
+def _linhas(nome_modelo, n):
+    if nome_modelo == "Cliente":
+        return [(f"Cliente {i}", f"{i:011d}", 30 + i % 50, "11 99999-0000", "Rua A, 1", "c@x.com") for i in range(n)]
+    if nome_modelo == "Processo":
+        return [(f"{i:07d}-00.2024", "Ação de cobrança", f"{i % 1000:011d}") for i in range(n)]
+    if nome_modelo == "Pagamento":
+        return [(f"{i % 1000:011d}", 100.0 + i % 7, "Honorários") for i in range(n)]
+    return [(f"{i % 1000:07d}-00.2024", "10/03/2025 14:00", "Fórum Central", "Conciliação", f"{i % 1000:011d}")
+            for i in range(n)]
+
+MODELOS = [
+    ("Cliente", ClienteAntigo, ClienteConcreto),
+    ("Processo", ProcessoAntigo, ProcessoConcreto),
+    ("Pagamento", PagamentoAntigo, PagamentoConcreto),
+    ("Audiencia", AudienciaAntiga, AudienciaConcreta),
+]
+
+
+def medir(construir, linhas):
+    """Cria um objeto por linha e retorna (segundos, bytes por objeto).
+
+    O tempo é medido sem o tracemalloc ligado, que deixaria a criação mais lenta.
+    """
+    gc.collect()
+    inicio = time.perf_counter()
+    objetos = [construir(linha) for linha in linhas]
+    decorrido = time.perf_counter() - inicio
+    del objetos
+    gc.collect()
+    tracemalloc.start()
+    objetos = [construir(linha) for linha in linhas]
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Desconta a própria lista, que é igual nas duas versões
+    memoria = atual - objetos.__sizeof__()
+    del objetos
+    return decorrido, memoria / len(linhas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara memória e velocidade dos modelos com e sem __slots__.")
+    parser.add_argument("--n", type=int, default=1_000_000, help="Quantidade de objetos por classe.")
+    args = parser.parse_args(argv)
+
+    print(f"{'Modelo':<10} {'Versão':<18} {'Tempo (s)':>10} {'Objetos/s':>12} {'Bytes/obj':>10}")
+    for nome, antiga, nova in MODELOS:
+        linhas = _linhas(nome, args.n)
+        # A versão anterior só podia ser criada com argumentos nomeados/posicionais;
+        # a nova usa de_linha(), que desempacota a tupla do banco direto no construtor.
+        for rotulo, construir in (("antiga (__dict__)", lambda linha, c=antiga: c(*linha)),
+                                  ("nova (__slots__)", nova.de_linha)):
+            tempo, memoria = medir(construir, linhas)
+            print(f"{nome:<10} {rotulo:<18} {tempo:>10.3f} {args.n / tempo:>12,.0f} {memoria:>10.1f}")
+        del linhas
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# benchmark_visao_cliente.py
+# =====================================================================
+# BENCHMARK: VISÃO DO CLIENTE EM VÁRIAS BUSCAS x NUMA SÓ CONSULTA
+# Monta a situação completa de clientes sorteados de duas formas:
+#   - separadas: find_cliente_by_cpf + find_processos_by_cpf +
+#     find_pagamentos_by_cpf + find_audiencias_by_processo para cada
+#     processo (3 + N idas ao banco);
+#   - única:     visao_cliente_by_cpf (UNION ALL, 1 ida ao banco).
+# Informa as idas ao banco por visão e a latência p50/p95 de cada forma.
+#
+# Como em benchmark_assincrono.py, --latencia-ms acrescenta uma espera fixa
+# a cada ida ao banco, simulando a rede até um servidor MySQL (padrão: 1 ms
+# com SQLite/memória, 0 com --backend mysql).
+#
+# Uso:
+#   python benchmark_visao_cliente.py
+#   python benchmark_visao_cliente.py --processos 8 --amostras 500 --saida visao.json
+#   python benchmark_visao_cliente.py --backend mysql --banco-mysql advocacia_bench
+#
+# Com MySQL, as tabelas do banco indicado são ESVAZIADAS (ver
+# benchmark_acesso_dados.py): use um banco só para o benchmark.
+# =====================================================================
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from statistics import mean, quantiles
+
+from benchmark_acesso_dados import BACKENDS, _cpf
+
+
+class RepositorioContado:
+    """Conta as idas ao banco (chamadas ao repositório) e acrescenta a latência simulada a cada uma."""
+
+    def __init__(self, repo, latencia_ms):
+        self.repo = repo
+        self.latencia = latencia_ms / 1000
+        self.idas = 0
+
+    def __getattr__(self, nome):
+        funcao = getattr(self.repo, nome)
+        def chamar(*args, **kwargs):
+            self.idas += 1
+            if self.latencia: time.sleep(self.latencia)
+            return funcao(*args, **kwargs)
+        return chamar
+
+
+def _linhas(args):
+    """Linhas de cada tabela (formato de benchmark_acesso_dados) com quantidades fixas por cliente."""
+    def numero(i, j): return f"{i:07d}-{j:02d}.2024"
+    n, processos = args.clientes, args.processos
+    return {
+        "clientes": ((_cpf(i), f"Cliente {i}", 20 + i % 60, "11 99999-0000", "Rua A, 1", f"c{i}@x.com") for i in range(n)),
+        "processos": ((numero(i, j), _cpf(i), "Ação de cobrança") for i in range(n) for j in range(processos)),
+        "pagamentos": ((_cpf(i), 100.0 + k % 7, "Honorários") for i in range(n) for k in range(args.pagamentos)),
+        "audiencias": ((numero(i, j), f"2025-{1 + k % 12:02d}-{1 + (i + k) % 28:02d} 14:00:00", "Fórum Central",
+                        "Conciliação")
+                       for i in range(n) for j in range(processos) for k in range(args.audiencias)),
+    }
+
+def visao_separada(repo, cpf):
+    cliente = repo.find_cliente_by_cpf(cpf)
+    processos = repo.find_processos_by_cpf(cpf)
+    pagamentos = repo.find_pagamentos_by_cpf(cpf)
+    audiencias = [a for p in processos for a in repo.find_audiencias_by_processo(p.numero)]
+    return cliente, len(processos), len(pagamentos), len(audiencias)
+
+def visao_unica(repo, cpf):
+    visao = repo.visao_cliente_by_cpf(cpf)
+    return visao.cliente, len(visao.processos), len(visao.pagamentos), len(visao.audiencias)
+
+FORMAS = {"separadas": visao_separada, "única": visao_unica}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Visão do cliente: várias buscas x uma consulta.")
+    parser.add_argument("--backend", choices=BACKENDS, default="sqlite", help="Armazenamento medido (padrão: sqlite).")
+    parser.add_argument("--clientes", type=int, default=10_000, help="Clientes semeados.")
+    parser.add_argument("--processos", type=int, default=4, help="Processos por cliente.")
+    parser.add_argument("--pagamentos", type=int, default=12, help="Pagamentos por cliente.")
+    parser.add_argument("--audiencias", type=int, default=3, help="Audiências por processo.")
+    parser.add_argument("--amostras", type=int, default=200, help="Clientes sorteados por forma.")
+    parser.add_argument("--latencia-ms", type=float, default=None,
+                        help="Espera simulada por ida ao banco (padrão: 1 ms; 0 com MySQL).")
+    parser.add_argument("--semente", type=int, default=42, help="Semente dos CPFs sorteados.")
+    parser.add_argument("--pasta", default=None, help="Pasta do arquivo SQLite (padrão: temporária).")
+    parser.add_argument("--banco-mysql", default=None, help="Banco MySQL de teste (obrigatório com --backend mysql).")
+    parser.add_argument("--saida", help="Arquivo JSON onde salvar os resultados.")
+    args = parser.parse_args(argv)
+
+    if args.backend == "mysql" and not args.banco_mysql:
+        parser.error("--backend mysql exige --banco-mysql (um banco só para o benchmark; as tabelas são esvaziadas).")
+    if args.latencia_ms is None:
+        args.latencia_ms = 0.0 if args.backend == "mysql" else 1.0
+    pasta_temporaria = None
+    if args.backend == "sqlite" and args.pasta is None:
+        pasta_temporaria = tempfile.TemporaryDirectory(prefix="benchmark_")
+        args.pasta = pasta_temporaria.name
+
+    rng = random.Random(args.semente)
+    try:
+        repo = BACKENDS[args.backend](args.clientes, args, _linhas(args))
+        cpfs = [_cpf(rng.randrange(args.clientes)) for _ in range(args.amostras)]
+        print(f"{args.amostras} visões, {args.processos} processos, {args.pagamentos} pagamentos e "
+              f"{args.audiencias} audiências/processo por cliente, backend {args.backend}, "
+              f"latência simulada {args.latencia_ms} ms")
+        print(f"{'Forma':<10} {'Idas/visão':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'visões/s':>9}")
+        resultados, esperado = {}, None
+        for nome, montar in FORMAS.items():
+            contado = RepositorioContado(repo, args.latencia_ms)
+            tempos, obtidos = [], []
+            inicio_forma = time.perf_counter()
+            for cpf in cpfs:
+                inicio = time.perf_counter()
+                obtidos.append(montar(contado, cpf)[1:])
+                tempos.append(time.perf_counter() - inicio)
+            total = time.perf_counter() - inicio_forma
+            if esperado is None:
+                esperado = obtidos
+            elif obtidos != esperado:
+                raise AssertionError(f"A forma '{nome}' montou visões diferentes da primeira.")
+            percentis = quantiles(tempos, n=100) if len(tempos) > 1 else tempos * 99
+            resultados[nome] = {"idas_por_visao": contado.idas / len(cpfs), "p50_ms": percentis[49] * 1000,
+                                "p95_ms": percentis[94] * 1000, "visoes_s": len(cpfs) / total, "media_ms": mean(tempos) * 1000}
+            r = resultados[nome]
+            print(f"{nome:<10} {r['idas_por_visao']:>10.1f} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['visoes_s']:>9,.0f}")
+        separadas, unica = resultados["separadas"], resultados["única"]
+        print(f"Idas ao banco: {separadas['idas_por_visao']:.1f} -> {unica['idas_por_visao']:.1f}; "
+              f"latência p50 {separadas['p50_ms'] / unica['p50_ms']:.1f}x menor.")
+        if args.backend != "mysql":
+            repo.fechar()
+    finally:
+        if pasta_temporaria is not None: pasta_temporaria.cleanup()
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump({"meta": {"backend": args.backend, "data": datetime.now().isoformat(timespec="seconds"),
+                                "clientes": args.clientes, "processos": args.processos, "pagamentos": args.pagamentos,
+                                "audiencias": args.audiencias, "latencia_ms": args.latencia_ms},
+                       "resultados": resultados}, arquivo, indent=2, ensure_ascii=False)
+        print(f"Resultados salvos em '{args.saida}'.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# cache_lru.py
+# =====================================================================
+# CACHE LRU COM EXPIRAÇÃO (TTL)
+# Guarda os últimos resultados de buscas por chave (CPF, número do
+# processo...) para evitar idas repetidas ao banco. Quando enche, remove
+# o item usado há mais tempo; itens mais velhos que 'ttl' segundos são
+# descartados na leitura. Seguro para uso por várias threads.
+# =====================================================================
+
+import threading
+import time
+from collections import OrderedDict
+
+_AUSENTE = object()
+
+
+class CacheLRU:
+    """Cache com limite de tamanho (LRU) e tempo de vida (TTL) por item, com contadores."""
+
+    def __init__(self, tamanho_maximo=1000, ttl=60.0):
+        if tamanho_maximo < 1:
+            raise ValueError("O tamanho máximo do cache deve ser pelo menos 1.")
+        self.tamanho_maximo = tamanho_maximo
+        self.ttl = ttl
+        self._itens = OrderedDict()  # chave -> (valor, instante de expiração)
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0     # Itens removidos por falta de espaço (LRU)
+        self.expiracoes = 0   # Itens descartados por terem passado do TTL
+        self.invalidacoes = 0
+
+    def obter(self, chave, padrao=None):
+        """Retorna o valor guardado para 'chave' (e conta acerto) ou 'padrao' (e conta falha)."""
+        with self._lock:
+            item = self._itens.get(chave, _AUSENTE)
+            if item is not _AUSENTE:
+                valor, expira_em = item
+                if expira_em > time.monotonic():
+                    self._itens.move_to_end(chave)
+                    self.acertos += 1
+                    return valor
+                del self._itens[chave]
+                self.expiracoes += 1
+            self.falhas += 1
+            return padrao
+
+    def guardar(self, chave, valor):
+        """Guarda (ou substitui) o valor de 'chave', removendo o item menos usado se o cache estiver cheio."""
+        with self._lock:
+            self._itens[chave] = (valor, time.monotonic() + self.ttl)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho_maximo:
+                self._itens.popitem(last=False)
+                self.remocoes += 1
+
+    def invalidar(self, chave):
+        """Remove 'chave' do cache, se estiver lá."""
+        with self._lock:
+            if self._itens.pop(chave, _AUSENTE) is not _AUSENTE:
+                self.invalidacoes += 1
+
+    def limpar(self):
+        with self._lock:
+            self.invalidacoes += len(self._itens)
+            self._itens.clear()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def estatisticas(self):
+        """Retorna os contadores do cache (acertos, falhas, remoções...) e a taxa de acerto."""
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "tamanho": len(self._itens),
+                "tamanho_maximo": self.tamanho_maximo,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "remocoes": self.remocoes,
+                "expiracoes": self.expiracoes,
+                "invalidacoes": self.invalidacoes,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+            }
@@ -0,0 +1,207 @@
+# diario_alteracoes.py
+# =====================================================================
+# DIÁRIO DE ALTERAÇÕES (JOURNAL) DO ARMAZENAMENTO EM MEMÓRIA
+# Entre um snapshot e outro, cada registro cadastrado no repositório em
+# memória é acrescentado ao fim de um arquivo de diário. Ao abrir o
+# programa, o diário é reaplicado por cima do último snapshot, então um
+# cadastro confirmado não se perde se o programa fechar de repente.
+#
+# Gravação em grupo (group commit): os registros entram numa fila e uma
+# thread gravadora os escreve juntos, com um único fsync por lote. Quem
+# cadastrou espera esse fsync (no máximo a janela DIARIO_CONFIG['janela_ms']
+# mais o tempo do disco); cadastros que chegam durante a janela pegam
+# carona no mesmo fsync.
+#
+# Formato: uma linha por registro, "<crc32 em 8 hex> <json>\n", com o json
+# = [tabela, [valores em texto como no snapshot]]. Uma linha incompleta ou
+# com CRC errado no fim (gravação interrompida) é descartada na leitura.
+# Se uma gravação falhar, quem esperava recebe o erro e o arquivo é cortado
+# de volta ao último registro íntegro, para que os registros seguintes não
+# fiquem atrás de uma linha incompleta (que esconderia todos eles).
+#
+# Uso:
+#   registros, tamanho_valido = ler_diario("sistema_juridico.diario")
+#   diario = DiarioAlteracoes("sistema_juridico.diario", tamanho_valido)
+#   diario.registrar("clientes", cliente).esperar()
+#   diario.fechar()
+# =====================================================================
+
+import json
+import os
+import threading
+import time
+import zlib
+
+from snapshot import valores_em_texto, objeto_de_texto
+
+DIARIO_CONFIG = {
+    'janela_ms': 5,                               # Quanto a gravadora espera juntando registros antes do fsync
+    'compactar_apos_bytes': 8 * 1024 * 1024,      # Tamanho a partir do qual o repositório compacta o diário
+}
+
+
+def _linha(tabela, objeto):
+    dados = json.dumps([tabela, valores_em_texto(tabela, objeto)], ensure_ascii=False,
+                       separators=(",", ":")).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(dados), dados)
+
+
+def ler_diario(caminho):
+    """Lê o diário e retorna ([(tabela, objeto)], tamanho_valido).
+
+    'tamanho_valido' é o número de bytes até o último registro íntegro; o
+    que vier depois (gravação interrompida) é ignorado. Arquivo inexistente
+    equivale a um diário vazio.
+    """
+    registros, tamanho_valido = [], 0
+    if not os.path.exists(caminho):
+        return registros, 0
+    with open(caminho, "rb") as arquivo:
+        for linha in arquivo:
+            if not linha.endswith(b"\n") or len(linha) < 10 or linha[8:9] != b" ":
+                break
+            dados = linha[9:-1]
+            try:
+                if int(linha[:8], 16) != zlib.crc32(dados):
+                    break
+                tabela, textos = json.loads(dados)
+            except ValueError:
+                break
+            registros.append((tabela, objeto_de_texto(tabela, textos)))
+            tamanho_valido += len(linha)
+    return registros, tamanho_valido
+
+
+class _Pendente:
+    """Registro na fila da gravadora; esperar() retorna quando ele está no disco."""
+    __slots__ = ("linha", "evento", "erro")
+
+    def __init__(self, linha):
+        self.linha = linha
+        self.evento = threading.Event()
+        self.erro = None
+
+    def esperar(self):
+        self.evento.wait()
+        if self.erro is not None:
+            raise self.erro
+
+
+class DiarioAlteracoes:
+    """Diário só de acréscimos com fsync em grupo.
+
+    - caminho: arquivo do diário (criado se não existir).
+    - tamanho_valido: resultado de ler_diario; se o arquivo for maior (fim
+      incompleto), ele é cortado nesse ponto antes de receber novos registros.
+    - janela_ms: espera da gravadora para juntar registros num só fsync.
+    """
+
+    def __init__(self, caminho, tamanho_valido=None, janela_ms=None):
+        self.caminho = caminho
+        self.janela = (DIARIO_CONFIG['janela_ms'] if janela_ms is None else janela_ms) / 1000
+        self._arquivo = open(caminho, "ab", buffering=0)  # Sem buffer: um lote que falhou não fica para o próximo
+        if tamanho_valido is not None and self._arquivo.tell() > tamanho_valido:
+            self._arquivo.truncate(tamanho_valido)
+        self.tamanho = self._arquivo.tell()
+        self.gravados = 0   # Registros já no disco
+        self.fsyncs = 0     # Lotes gravados (um fsync cada)
+        self._fila = []
+        self._condicao = threading.Condition()
+        self._lock_arquivo = threading.RLock()
+        self._fechando = False
+        self._quebrado = None  # Erro que impediu cortar uma gravação incompleta: o diário não aceita mais nada
+        self._gravadora = threading.Thread(target=self._gravar_em_grupo, name="diario-alteracoes", daemon=True)
+        self._gravadora.start()
+
+    # --- Registro ---
+
+    def registrar(self, tabela, objeto):
+        """Põe o registro na fila e retorna um _Pendente; chame .esperar() para ter certeza de que foi gravado."""
+        pendente = _Pendente(_linha(tabela, objeto))
+        with self._condicao:
+            if self._fechando:
+                raise ValueError("Diário fechado.")
+            self._fila.append(pendente)
+            self._condicao.notify()
+        return pendente
+
+    def sincronizar(self):
+        """Espera a gravação de tudo que já foi registrado."""
+        with self._condicao:
+            ultimo = self._fila[-1] if self._fila else None
+        if ultimo is not None:
+            ultimo.esperar()
+        with self._lock_arquivo:
+            pass  # Um lote já retirado da fila pode estar sendo gravado
+
+    def _gravar_em_grupo(self):
+        while True:
+            with self._condicao:
+                while not self._fila and not self._fechando:
+                    self._condicao.wait()
+                if not self._fila:
+                    return
+            if self.janela and not self._fechando:
+                time.sleep(self.janela)  # Junta os registros que chegarem nesse meio-tempo
+            with self._lock_arquivo:
+                with self._condicao:
+                    lote, self._fila = self._fila, []
+                erro = self._quebrado
+                try:
+                    if erro is None:
+                        self._escrever(b"".join(pendente.linha for pendente in lote))
+                        os.fsync(self._arquivo.fileno())
+                        self.tamanho = self._arquivo.tell()
+                        self.gravados += len(lote)
+                        self.fsyncs += 1
+                except OSError as err:
+                    print(f"Erro ao gravar o diário de alterações: {err}")
+                    erro = err
+                    try:
+                        self._arquivo.truncate(self.tamanho)  # Tira o que o lote chegou a escrever
+                    except OSError as err_corte:
+                        print(f"Erro ao cortar o diário de alterações, que não aceitará novos registros: {err_corte}")
+                        self._quebrado = err
+            for pendente in lote:
+                pendente.erro = erro
+                pendente.evento.set()
+
+    def _escrever(self, dados):
+        dados = memoryview(dados)
+        while dados:
+            dados = dados[self._arquivo.write(dados):]  # Sem buffer, write pode escrever só uma parte
+
+    # --- Compactação ---
+
+    def rotacionar(self, destino):
+        """Acrescenta o conteúdo gravado do diário ao arquivo 'destino' e esvazia o diário.
+
+        Registros ainda na fila vão para o diário esvaziado. Usado pela
+        compactação: 'destino' é incorporado ao snapshot enquanto o diário
+        continua recebendo cadastros.
+        """
+        with self._lock_arquivo:
+            self._arquivo.flush()
+            with open(self.caminho, "rb") as origem, open(destino, "ab") as saida:
+                saida.write(origem.read())
+                saida.flush()
+                os.fsync(saida.fileno())
+            self.esvaziar()
+
+    def esvaziar(self):
+        """Descarta os registros gravados (já incorporados a um snapshot)."""
+        with self._lock_arquivo:
+            self._arquivo.truncate(0)
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+            self.tamanho = 0
+
+    def fechar(self):
+        """Grava o que estiver na fila e fecha o arquivo."""
+        with self._condicao:
+            if self._fechando:
+                return
+            self._fechando = True
+            self._condicao.notify()
+        self._gravadora.join()
+        self._arquivo.close()
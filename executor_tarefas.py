@@ -0,0 +1,162 @@
+# executor_tarefas.py
+# =====================================================================
+# EXECUÇÃO DE TAREFAS FORA DA THREAD DO TKINTER
+# As chamadas ao banco rodam em threads de trabalho; os resultados voltam
+# por uma fila que é esvaziada na thread principal com master.after(),
+# de modo que a janela nunca congela esperando o MySQL.
+#
+# Cada tarefa é medida como uma ação da interface ('instrumentacao.py'):
+# o span vai do clique (submeter) até o resultado chegar à thread principal, e as
+# consultas feitas na thread de trabalho ficam registradas como filhas dele.
+#
+# O botão 'Cancelar' só alcança as tarefas canceláveis (buscas e páginas);
+# cadastros são submetidos com cancelavel=False e o resultado deles (gravado
+# ou não) sempre chega à interface.
+# =====================================================================
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import instrumentacao
+
+
+class Tarefa:
+    """Representa uma chamada em andamento; se 'cancelavel', pode ser cancelada pela interface."""
+    def __init__(self, descricao, ao_concluir=None, ao_falhar=None, span=None, cancelavel=True):
+        self.descricao = descricao
+        self.ao_concluir = ao_concluir
+        self.ao_falhar = ao_falhar
+        self.cancelavel = cancelavel
+        self.cancelada = False
+        self.span = span
+        self._future = None
+
+    def cancelar(self):
+        """Cancela a tarefa: se ainda não começou, nem roda; se já começou, o resultado é descartado."""
+        self.cancelada = True
+        if self._future is not None:
+            self._future.cancel()
+
+
+class ExecutorTarefas:
+    """Executa funções em threads de trabalho e entrega os resultados na thread do Tkinter.
+
+    'ao_mudar_ocupado' (opcional) é chamada na thread principal com a lista de
+    tarefas pendentes sempre que ela muda, para exibir um indicador de ocupado.
+    """
+
+    def __init__(self, master, max_trabalhadores=4, intervalo_ms=50, ao_mudar_ocupado=None):
+        self.master = master
+        self.intervalo_ms = intervalo_ms
+        self.ao_mudar_ocupado = ao_mudar_ocupado
+        self._executor = ThreadPoolExecutor(max_workers=max_trabalhadores, thread_name_prefix="tarefa-bd")
+        self._resultados = queue.Queue()
+        self._pendentes = []
+        self._drenando = False
+        self._encerrado = False  # Depois de encerrar() a janela pode já ter sido destruída
+
+    def submeter(self, descricao, funcao, *args, ao_concluir=None, ao_falhar=None, acao=None, cancelavel=True,
+                 **kwargs):
+        """Agenda 'funcao(*args, **kwargs)' numa thread de trabalho e retorna a Tarefa.
+
+        'ao_concluir(resultado)' ou 'ao_falhar(exceção)' são chamadas depois na
+        thread do Tkinter, a menos que a tarefa tenha sido cancelada.
+        'acao' é o nome do span de ação (ex.: "Buscar Pagamentos"); sem ele,
+        usa a descrição. Com cancelavel=False (cadastros), cancelar_todas() não
+        alcança a tarefa e o resultado é sempre entregue.
+        Deve ser chamada a partir da thread principal.
+        """
+        span = instrumentacao.iniciar(acao or descricao, tipo="acao", descricao=descricao)
+        tarefa = Tarefa(descricao, ao_concluir, ao_falhar, span, cancelavel)
+
+        def trabalhar():
+            if tarefa.cancelada:
+                self._resultados.put((tarefa, None, None)); return
+            try:
+                with instrumentacao.dentro_de(span):
+                    resultado = funcao(*args, **kwargs)
+                self._resultados.put((tarefa, resultado, None))
+            except Exception as err:
+                self._resultados.put((tarefa, None, err))
+
+        def ao_terminar(future):
+            # Uma tarefa cancelada antes de começar não passa por trabalhar()
+            if future.cancelled(): self._resultados.put((tarefa, None, None))
+
+        tarefa._future = self._executor.submit(trabalhar)
+        tarefa._future.add_done_callback(ao_terminar)
+        self._pendentes.append(tarefa)
+        self._notificar()
+        if not self._drenando:
+            self._drenando = True
+            self.master.after(self.intervalo_ms, self._drenar)
+        return tarefa
+
+    def cancelar_todas(self):
+        """Cancela as tarefas canceláveis pendentes (ex.: botão 'Cancelar' de uma busca demorada).
+
+        As não canceláveis (cadastros) continuam, e o resultado delas é entregue normalmente.
+        """
+        self._cancelar(lambda tarefa: tarefa.cancelavel)
+
+    def _cancelar(self, filtro):
+        canceladas = [tarefa for tarefa in self._pendentes if filtro(tarefa)]
+        for tarefa in canceladas:
+            tarefa.cancelar()
+            self._pendentes.remove(tarefa)
+        if canceladas:
+            self._notificar()
+
+    @property
+    def pendentes(self):
+        return list(self._pendentes)
+
+    def encerrar(self):
+        """Libera as threads de trabalho sem esperar as tarefas em andamento.
+
+        Pode ser chamada de dentro de um ao_concluir/ao_falhar (ex.: fechar a
+        janela quando a conexão falha): _drenar para em seguida, sem tocar
+        nos widgets nem agendar um novo after() na janela destruída.
+        """
+        self._encerrado = True
+        self._cancelar(lambda tarefa: True)  # Inclusive cadastros: não há mais janela para o resultado
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- Entrega dos resultados (thread principal) ---
+
+    def _drenar(self):
+        if self._encerrado:
+            return
+        mudou = False
+        while True:
+            try:
+                tarefa, resultado, erro = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            if tarefa in self._pendentes:
+                self._pendentes.remove(tarefa); mudou = True
+            # A ação termina quando o resultado chega à thread principal (inclui a espera
+            # na fila, mas não o tempo que o usuário leva para fechar uma messagebox)
+            instrumentacao.finalizar(tarefa.span, erro="cancelada" if tarefa.cancelada else erro)
+            if tarefa.cancelada:
+                continue
+            try:
+                if erro is not None:
+                    if tarefa.ao_falhar: tarefa.ao_falhar(erro)
+                    else: print(f"Erro na tarefa '{tarefa.descricao}': {erro}")
+                elif tarefa.ao_concluir:
+                    tarefa.ao_concluir(resultado)
+            except Exception as err:
+                print(f"Erro ao tratar o resultado de '{tarefa.descricao}': {err}")
+            if self._encerrado:
+                return
+        if mudou:
+            self._notificar()
+        if self._pendentes or not self._resultados.empty():
+            self.master.after(self.intervalo_ms, self._drenar)
+        else:
+            self._drenando = False
+
+    def _notificar(self):
+        if self.ao_mudar_ocupado:
+            self.ao_mudar_ocupado(list(self._pendentes))
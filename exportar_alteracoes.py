@@ -0,0 +1,256 @@
+# exportar_alteracoes.py
+# =====================================================================
+# EXPORTAÇÃO INCREMENTAL DE PAGAMENTOS E AUDIÊNCIAS (ROTINA NOTURNA)
+# Gera, em CSV ou JSONL, só os registros alterados desde a última
+# exportação, para o sistema de contabilidade não precisar de uma cópia
+# completa toda noite.
+#
+# Cada INSERT/UPDATE/DELETE em pagamentos e audiências é anotado pelos
+# gatilhos na tabela 'alteracoes' (migração 4 no MySQL, ALTERACOES_SQLITE
+# no SQLite), com uma versão crescente. O arquivo de marcas guarda, por
+# tabela, a última versão exportada; a exportação lê as versões acima
+# dela e só grava a marca nova depois que a saída estiver completa.
+#
+# Uso:
+#   python exportar_alteracoes.py pagamentos --saida pagamentos.csv
+#   python exportar_alteracoes.py audiencias --formato jsonl --saida audiencias.jsonl
+#   python exportar_alteracoes.py pagamentos --completo --saida carga.csv   (todos os registros)
+#   python exportar_alteracoes.py pagamentos --backend sqlite --sqlite teste.db
+#
+# Cada linha traz 'versao', 'operacao' (I, U ou D) e as colunas do registro
+# como estão no banco no momento da leitura (vazias quando foi excluído).
+# Um registro alterado várias vezes sai uma vez só, com a última versão.
+# A entrega é "pelo menos uma vez": o destino deve gravar por 'id'
+# (inserir ou substituir), porque um registro alterado durante a
+# exportação pode sair de novo na próxima.
+#
+# Memória constante: o cursor do MySQL é sem buffer (as linhas vêm do
+# servidor em blocos de 'tamanho_bloco') e cada linha é escrita assim que
+# lida. Sem marca gravada para a tabela, a primeira exportação é completa.
+# =====================================================================
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+EXPORTACAO_CONFIG = {
+    # Só entram alterações mais velhas que isto: uma versão menor ainda não
+    # confirmada (transação em andamento, como um lote de importação) não
+    # fica para trás quando uma maior já foi exportada.
+    'margem_s': 60,
+    'tamanho_bloco': 5000,       # Linhas por ida ao servidor
+    'arquivo_marcas': os.environ.get("SISTEMA_JURIDICO_MARCAS_EXPORTACAO", "marcas_exportacao.json"),
+}
+
+# Colunas exportadas de cada tabela (a primeira é sempre o id)
+COLUNAS = {
+    "pagamentos": ("id", "cliente_cpf", "valor", "descricao", "data_vencimento", "data_pagamento"),
+    "audiencias": ("id", "numero_processo", "data_hora", "local", "tipo"),
+}
+
+# Diferenças de SQL entre os backends: marcador de parâmetro e a versão
+# mais alta que já passou da margem (o parâmetro da margem muda de forma).
+DIALETOS = {
+    "mysql": {
+        "marcador": "%s",
+        "limite": """SELECT COALESCE(MAX(versao), %s) FROM alteracoes
+                     WHERE versao > %s AND alterado_em <= NOW(6) - INTERVAL %s SECOND""",
+        "margem": lambda segundos: segundos,
+    },
+    "sqlite": {
+        "marcador": "?",
+        "limite": """SELECT COALESCE(MAX(versao), ?) FROM alteracoes
+                     WHERE versao > ? AND alterado_em <= strftime('%Y-%m-%d %H:%M:%f', 'now', ?)""",
+        "margem": lambda segundos: f"-{segundos} seconds",
+    },
+}
+
+
+# --- Consultas ---
+
+def _sql_alteradas(tabela, marcador):
+    # A subconsulta reduz as alterações do intervalo à última de cada registro
+    # (índice ix_alteracoes_tabela_versao); o LEFT JOIN traz o estado atual,
+    # que não existe mais quando o registro foi excluído.
+    colunas = ", ".join(f"t.{coluna}" for coluna in COLUNAS[tabela][1:])
+    return f"""SELECT a.versao, a.operacao, a.registro_id, {colunas}
+               FROM (SELECT registro_id, MAX(versao) AS versao FROM alteracoes
+                     WHERE tabela = {marcador} AND versao > {marcador} AND versao <= {marcador}
+                     GROUP BY registro_id) u
+               JOIN alteracoes a ON a.versao = u.versao
+               LEFT JOIN {tabela} t ON t.id = a.registro_id
+               ORDER BY a.versao"""
+
+def _sql_completa(tabela, marcador):
+    return f"SELECT {marcador}, 'I', {', '.join(COLUNAS[tabela])} FROM {tabela} ORDER BY id"
+
+def versao_limite(conn, desde, dialeto="mysql", margem_s=None):
+    """Retorna a versão mais alta (acima de 'desde') alterada há mais de 'margem_s' segundos, ou 'desde'."""
+    config = DIALETOS[dialeto]
+    margem_s = EXPORTACAO_CONFIG['margem_s'] if margem_s is None else margem_s
+    cursor = conn.cursor()
+    cursor.execute(config["limite"], (desde, desde, config["margem"](margem_s)))
+    limite = cursor.fetchall()[0][0]
+    cursor.close()
+    return limite
+
+def linhas_alteradas(conn, tabela, desde, limite, dialeto="mysql", tamanho_bloco=None):
+    """Gera (versao, operacao, *colunas) das alterações de 'tabela' em (desde, limite], em ordem de versão.
+
+    Com 'desde' None gera todos os registros atuais (carga completa), com a
+    versão 'limite'. Erros do banco são propagados.
+    """
+    marcador = DIALETOS[dialeto]["marcador"]
+    if desde is None:
+        sql, params = _sql_completa(tabela, marcador), (limite,)
+    else:
+        sql, params = _sql_alteradas(tabela, marcador), (tabela, desde, limite)
+    # Sem buffer no MySQL: o resultado não é trazido inteiro para a memória
+    cursor = conn.cursor(buffered=False) if dialeto == "mysql" else conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        while linhas := cursor.fetchmany(tamanho_bloco or EXPORTACAO_CONFIG['tamanho_bloco']):
+            for versao, operacao, *colunas in linhas:
+                if colunas[1] is None:
+                    operacao = "D"  # Excluído depois da última alteração lida
+                yield (versao, operacao, *colunas)
+    finally:
+        cursor.close()
+
+
+# --- Saída ---
+
+def _texto(valor):
+    if hasattr(valor, "isoformat"):
+        return valor.isoformat()  # date/datetime
+    return valor
+
+def _json_padrao(valor):
+    return float(valor)  # Decimal do MySQL
+
+class EscritorCSV:
+    def __init__(self, arquivo, tabela):
+        self._escritor = csv.writer(arquivo)
+        self._escritor.writerow(("versao", "operacao", *COLUNAS[tabela]))
+
+    def escrever(self, linha):
+        self._escritor.writerow([_texto(valor) for valor in linha])
+
+class EscritorJSONL:
+    def __init__(self, arquivo, tabela):
+        self._arquivo = arquivo
+        self._campos = ("versao", "operacao", *COLUNAS[tabela])
+
+    def escrever(self, linha):
+        dados = dict(zip(self._campos, (_texto(valor) for valor in linha)))
+        self._arquivo.write(json.dumps(dados, ensure_ascii=False, default=_json_padrao) + "\n")
+
+ESCRITORES = {"csv": EscritorCSV, "jsonl": EscritorJSONL}
+
+
+def exportar(conn, tabela, arquivo, formato="csv", desde=None, dialeto="mysql", margem_s=None, tamanho_bloco=None):
+    """Escreve em 'arquivo' as alterações de 'tabela' depois da versão 'desde' (None = todos os registros).
+
+    Retorna (linhas escritas, versão até onde a exportação foi): é o valor a
+    gravar como marca depois que o arquivo estiver seguro no disco.
+    """
+    limite = versao_limite(conn, desde or 0, dialeto, margem_s)
+    escritor = ESCRITORES[formato](arquivo, tabela)
+    total = 0
+    for linha in linhas_alteradas(conn, tabela, desde, limite, dialeto, tamanho_bloco):
+        escritor.escrever(linha)
+        total += 1
+    return total, limite
+
+
+# --- Marcas (última versão exportada de cada tabela) ---
+
+def ler_marcas(caminho):
+    """Retorna {tabela: versão} do arquivo de marcas ({} se ainda não existir)."""
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except FileNotFoundError:
+        return {}
+
+def _gravar_atomico(caminho, escrever):
+    # Escreve num arquivo temporário, força para o disco e só então troca pelo
+    # definitivo: uma queda no meio deixa o arquivo anterior intacto.
+    temporario = caminho + ".parcial"
+    with open(temporario, "w", newline="", encoding="utf-8") as arquivo:
+        resultado = escrever(arquivo)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+    return resultado
+
+def gravar_marca(caminho, tabela, versao):
+    """Atualiza a marca de 'tabela' no arquivo de marcas (troca atômica)."""
+    marcas = ler_marcas(caminho)
+    marcas[tabela] = versao
+    _gravar_atomico(caminho, lambda arquivo: json.dump(marcas, arquivo, indent=2, sort_keys=True))
+
+
+# --- Linha de comando ---
+
+def _conexao(backend, caminho_sqlite):
+    """Abre a conexão do backend; devolve (gerenciador de contexto da conexão, dialeto)."""
+    if backend == "sqlite":
+        import sqlite3
+        from contextlib import closing
+        from repositorio import REPOSITORIO_CONFIG, RepositorioSQLite
+        caminho = caminho_sqlite or REPOSITORIO_CONFIG['caminho_sqlite']
+        RepositorioSQLite(caminho).fechar()  # Cria as tabelas e os gatilhos se faltarem
+        return closing(sqlite3.connect(caminho)), "sqlite"
+    from banco_dados import get_db_connection
+    return get_db_connection(), "mysql"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta as alterações de pagamentos ou audiências desde a última exportação.")
+    parser.add_argument("tabela", choices=sorted(COLUNAS))
+    parser.add_argument("--saida", help="Arquivo de saída (padrão: saída padrão).")
+    parser.add_argument("--formato", choices=sorted(ESCRITORES), help="Formato (padrão: pela extensão da saída, ou csv).")
+    parser.add_argument("--marcas", default=EXPORTACAO_CONFIG['arquivo_marcas'], help="Arquivo com a última versão exportada.")
+    parser.add_argument("--completo", action="store_true", help="Exporta todos os registros, ignorando a marca.")
+    parser.add_argument("--sem-marca", action="store_true", help="Não grava a marca nova (exportação de conferência).")
+    parser.add_argument("--margem", type=float, default=EXPORTACAO_CONFIG['margem_s'],
+                        help="Segundos de idade mínima de uma alteração para entrar na exportação.")
+    parser.add_argument("--bloco", type=int, default=EXPORTACAO_CONFIG['tamanho_bloco'], help="Linhas por ida ao servidor.")
+    parser.add_argument("--backend", choices=["mysql", "sqlite"], default="mysql")
+    parser.add_argument("--sqlite", help="Arquivo do banco SQLite (com --backend sqlite).")
+    args = parser.parse_args(argv)
+
+    formato = args.formato or ("jsonl" if args.saida and args.saida.lower().endswith((".jsonl", ".json")) else "csv")
+    desde = None if args.completo else ler_marcas(args.marcas).get(args.tabela)
+    inicio = time.perf_counter()
+    contexto, dialeto = _conexao(args.backend, args.sqlite)
+    try:
+        with contexto as conn:
+            def escrever(arquivo):
+                return exportar(conn, args.tabela, arquivo, formato, desde, dialeto, args.margem, args.bloco)
+            if args.saida:
+                total, limite = _gravar_atomico(args.saida, escrever)
+            else:
+                total, limite = escrever(sys.stdout)
+                sys.stdout.flush()
+    except Exception as err:
+        # A marca não muda: a próxima execução exporta o mesmo intervalo de novo
+        print(f"Erro ao exportar {args.tabela}: {err}", file=sys.stderr)
+        return 2
+
+    if not args.sem_marca:
+        gravar_marca(args.marcas, args.tabela, limite)
+    decorrido = time.perf_counter() - inicio
+    if desde is None: intervalo = "completa"
+    elif limite > desde: intervalo = f"versões {desde + 1}..{limite}"
+    else: intervalo = "nenhuma alteração nova"
+    print(f"{args.tabela}: {total} registro(s) exportado(s) ({intervalo}, {formato}) em {decorrido:.2f}s.",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
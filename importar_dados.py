@@ -0,0 +1,159 @@
+# importar_dados.py
+# =====================================================================
+# IMPORTADOR EM LOTE (LINHA DE COMANDO)
+# Carrega clientes, processos ou pagamentos de um arquivo CSV ou JSONL
+# usando as funções de inserção em lote de 'banco_dados.py'.
+#
+# Exemplos:
+#   python importar_dados.py clientes clientes.csv
+#   python importar_dados.py pagamentos pagamentos.jsonl --lote 5000
+#
+# O arquivo é lido em fluxo (não é carregado inteiro na memória). Linhas
+# com problema são listadas como rejeitadas, sem interromper a importação.
+# =====================================================================
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from bisect import bisect_right
+from datetime import date, datetime
+
+from modelo_abstrato import ClienteConcreto, ProcessoConcreto, PagamentoConcreto
+from banco_dados import TAMANHO_LOTE_PADRAO, add_clientes, add_processos, add_pagamentos
+
+
+def _texto_opcional(valor):
+    return valor if valor not in (None, "") else None
+
+def _inteiro_opcional(valor):
+    return int(valor) if valor not in (None, "") else None
+
+def _data_opcional(valor):
+    """Aceita 'AAAA-MM-DD' ou 'DD/MM/AAAA'."""
+    if valor in (None, ""): return None
+    if "/" in valor: return datetime.strptime(valor, "%d/%m/%Y").date()
+    return date.fromisoformat(valor)
+
+def _cliente(campos):
+    return ClienteConcreto(nome=campos["nome"], cpf=campos["cpf"], idade=_inteiro_opcional(campos.get("idade")),
+                           telefone=_texto_opcional(campos.get("telefone")), endereco=_texto_opcional(campos.get("endereco")),
+                           email=_texto_opcional(campos.get("email")))
+
+def _processo(campos):
+    return ProcessoConcreto(numero=campos["numero"], descricao=campos["descricao"], cliente_cpf=campos["cliente_cpf"])
+
+def _pagamento(campos):
+    return PagamentoConcreto(cliente_cpf=campos["cliente_cpf"], valor=float(campos["valor"]),
+                             descricao=_texto_opcional(campos.get("descricao")),
+                             data_vencimento=_data_opcional(campos.get("data_vencimento")),
+                             data_pagamento=_data_opcional(campos.get("data_pagamento")))
+
+# Tipo de registro -> (função que monta o objeto do modelo, função de inserção em lote)
+TIPOS = {
+    "clientes": (_cliente, add_clientes),
+    "processos": (_processo, add_processos),
+    "pagamentos": (_pagamento, add_pagamentos),
+}
+
+
+class LeitorRegistros:
+    """Lê um arquivo CSV/JSONL em fluxo e gera objetos do modelo.
+
+    Linhas que não podem ser convertidas são guardadas em 'rejeitados' e puladas.
+    Como o lote só recebe as linhas válidas, 'linha_da_posicao' converte a
+    posição de um registro no lote de volta para a linha do arquivo.
+    """
+
+    def __init__(self, caminho, formato, montar):
+        self.caminho = caminho
+        self.formato = formato
+        self.montar = montar
+        self.rejeitados = []  # Lista de (linha do arquivo, motivo)
+        self._saltos = []     # Posições (no lote) onde alguma linha foi pulada
+        self._primeira_linha = 2 if formato == "csv" else 1  # CSV tem cabeçalho
+
+    def __iter__(self):
+        posicao = 0
+        with open(self.caminho, newline="", encoding="utf-8") as arquivo:
+            for numero_linha, campos, motivo in self._linhas(arquivo):
+                registro = None
+                if campos is not None:
+                    try:
+                        registro = self.montar(campos)
+                    except KeyError as err:
+                        motivo = f"campo obrigatório ausente: {err}"
+                    except (TypeError, ValueError) as err:
+                        motivo = str(err)
+                if registro is None:
+                    if motivo: self.rejeitados.append((numero_linha, motivo))
+                    self._saltos.append(posicao)
+                    continue
+                yield registro
+                posicao += 1
+
+    def _linhas(self, arquivo):
+        # Gera (número da linha, campos, motivo); campos é None quando a linha
+        # deve ser pulada (motivo None para linhas em branco do JSONL).
+        if self.formato == "csv":
+            for i, campos in enumerate(csv.DictReader(arquivo)):
+                yield self._primeira_linha + i, campos, None
+            return
+        for i, texto in enumerate(arquivo):
+            numero_linha = self._primeira_linha + i
+            if not texto.strip():
+                yield numero_linha, None, None; continue
+            try:
+                campos = json.loads(texto)
+            except json.JSONDecodeError as err:
+                yield numero_linha, None, f"JSON inválido: {err.msg}"; continue
+            if isinstance(campos, dict):
+                yield numero_linha, campos, None
+            else:
+                yield numero_linha, None, "a linha não é um objeto JSON"
+
+    def linha_da_posicao(self, posicao):
+        """Retorna a linha do arquivo correspondente à posição de um registro no lote."""
+        return self._primeira_linha + posicao + bisect_right(self._saltos, posicao)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa registros em lote para o banco de dados do sistema jurídico.")
+    parser.add_argument("tipo", choices=sorted(TIPOS), help="Tipo de registro a importar.")
+    parser.add_argument("arquivo", help="Arquivo .csv (com cabeçalho) ou .jsonl (um objeto JSON por linha).")
+    parser.add_argument("--formato", choices=["csv", "jsonl"], help="Formato do arquivo (padrão: pela extensão).")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO, help="Registros por INSERT/commit.")
+    args = parser.parse_args(argv)
+
+    formato = args.formato or ("jsonl" if os.path.splitext(args.arquivo)[1].lower() in (".jsonl", ".json") else "csv")
+    montar, inserir_lote = TIPOS[args.tipo]
+    leitor = LeitorRegistros(args.arquivo, formato, montar)
+
+    inicio = time.perf_counter()
+    def ao_concluir_lote(inseridos, rejeitados):
+        decorrido = time.perf_counter() - inicio
+        print(f"  +{inseridos} registros ({len(rejeitados)} rejeitados no lote), {decorrido:.1f}s decorridos")
+        for posicao, _, motivo in rejeitados:
+            print(f"  Linha {leitor.linha_da_posicao(posicao)} rejeitada pelo banco: {motivo}")
+
+    print(f"Importando {args.tipo} de '{args.arquivo}' ({formato}, lotes de {args.lote})...")
+    resultado = inserir_lote(leitor, tamanho_lote=args.lote, ao_concluir_lote=ao_concluir_lote)
+    decorrido = time.perf_counter() - inicio
+
+    for numero_linha, motivo in leitor.rejeitados:
+        print(f"  Linha {numero_linha} rejeitada na leitura: {motivo}")
+    total_rejeitados = len(resultado.rejeitados) + len(leitor.rejeitados)
+    taxa = resultado.inseridos / decorrido if decorrido > 0 else 0.0
+    if resultado.erro is not None:
+        print(f"Interrompido por erro do banco após {resultado.inseridos} inseridos e {total_rejeitados} "
+              f"rejeitados ({decorrido:.2f}s); os lotes gravados foram mantidos.")
+        return 2
+    print(f"Concluído: {resultado.inseridos} inseridos, {total_rejeitados} rejeitados "
+          f"em {decorrido:.2f}s ({taxa:.0f} linhas/s).")
+    return 0 if total_rejeitados == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
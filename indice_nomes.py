@@ -0,0 +1,221 @@
+# indice_nomes.py
+# =====================================================================
+# ÍNDICE DE NOMES DE CLIENTES (BUSCA POR PREFIXO E APROXIMADA)
+# Permite achar clientes pelo começo do nome ("maria sil" -> "Maria da
+# Silva Souza"), sem diferenciar acentos e maiúsculas, em milissegundos
+# mesmo com 1 milhão de clientes. O índice é montado uma vez e depois
+# atualizado a cada cliente novo (adicionar).
+#
+# Ordem dos resultados:
+#   1. nome igual ao digitado;
+#   2. nome que começa com o texto digitado (os mais próximos do tamanho
+#      digitado primeiro);
+#   3. nome em que cada palavra digitada é início de alguma palavra do
+#      nome ("silva mar" acha "Maria da Silva");
+#   4. nomes parecidos, para erros de digitação: cada palavra digitada é
+#      comparada com o vocabulário (palavras distintas dos nomes) por pares
+#      de letras em comum, e só os nomes com palavras parecidas são vistos.
+# =====================================================================
+
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+PALAVRAS_IGNORADAS = {"da", "das", "de", "do", "dos", "e"}  # Não entram no índice por palavra
+MAX_CANDIDATOS = 20000    # Candidatos verificados no passo por palavras
+MAX_PALAVRAS_PARECIDAS = 50   # Palavras do vocabulário aceitas para cada palavra digitada
+SIMILARIDADE_MINIMA = 0.5
+
+
+def normalizar(texto):
+    """Minúsculas, sem acentos e com espaços simples: 'José  Ávila' -> 'jose avila'."""
+    if not texto.isascii():
+        # Separa letra e acento (NFKD) e descarta o que não é ASCII, tudo em C
+        texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return " ".join(texto.casefold().split())
+
+def _bigramas(palavra):
+    # Com espaço nas pontas, a primeira e a última letra também contam
+    # (pares de letras toleram trocas como "mraia" x "maria" melhor que trigramas)
+    texto = f" {palavra} "
+    return {texto[i:i + 2] for i in range(len(texto) - 1)}
+
+def _similaridade(a, b):
+    """Coeficiente de Dice entre os conjuntos de pares de letras (0 a 1)."""
+    return 2 * len(a & b) / (len(a) + len(b))
+
+def _fim_prefixo(prefixo):
+    # Menor texto maior que todos os que começam com 'prefixo' (limite do bisect)
+    return prefixo + "\U0010ffff"
+
+
+class IndiceNomes:
+    """Índice em memória de (CPF, nome) para busca por prefixo e aproximada.
+
+    Cada cliente recebe um número interno; as estruturas guardam só esses
+    números (em arrays compactos) e as palavras são internadas, já que
+    sobrenomes se repetem muito. O índice de pares de letras da busca
+    aproximada é só do vocabulário, que é pequeno mesmo com milhões de nomes.
+    Não é seguro entre threads: adicionar() altera as listas paralelas uma de
+    cada vez, então buscar() e adicionar() precisam do mesmo lock (o
+    Repositorio usa _lock_indice).
+    """
+
+    def __init__(self):
+        self._cpfs = []           # número -> CPF
+        self._nomes = []          # número -> nome original (exibido)
+        self._normalizados = []   # número -> nome normalizado (os mesmos objetos da lista ordenada)
+        self._posicao = {}        # CPF -> número
+        self._nomes_ordenados = []          # nomes normalizados em ordem
+        self._ids_nomes = array("I")        # número de cada item de _nomes_ordenados
+        self._palavras_ordenadas = []       # palavras normalizadas em ordem
+        self._ids_palavras = array("I")
+        self._vocabulario = {}              # palavra -> seus pares de letras
+        self._bigramas = {}                 # par de letras -> palavras que o contêm
+
+    def __len__(self):
+        return len(self._cpfs)
+
+    def __contains__(self, cpf):
+        return cpf in self._posicao
+
+    # --- Montagem e atualização ---
+
+    def _registrar(self, cpf, nome):
+        numero = len(self._cpfs)
+        self._cpfs.append(cpf)
+        self._nomes.append(nome)
+        self._posicao[cpf] = numero
+        normalizado = normalizar(nome)
+        self._normalizados.append(normalizado)
+        palavras = [sys.intern(p) for p in normalizado.split() if p not in PALAVRAS_IGNORADAS]
+        return numero, normalizado, palavras
+
+    def _ao_vocabulario(self, palavra):
+        if palavra in self._vocabulario: return
+        bigramas = self._vocabulario[palavra] = _bigramas(palavra)
+        for bigrama in bigramas:
+            self._bigramas.setdefault(bigrama, []).append(palavra)
+
+    def construir(self, pares):
+        """Monta o índice de uma vez a partir de (CPF, nome); bem mais rápido que adicionar um a um."""
+        nomes, ids_nomes = list(self._nomes_ordenados), array("I", self._ids_nomes)
+        palavras, ids_palavras = list(self._palavras_ordenadas), array("I", self._ids_palavras)
+        for cpf, nome in pares:
+            if cpf in self._posicao or not nome: continue
+            numero, normalizado, palavras_nome = self._registrar(cpf, nome)
+            nomes.append(normalizado); ids_nomes.append(numero)
+            palavras.extend(palavras_nome); ids_palavras.extend([numero] * len(palavras_nome))
+        # Uma ordenação só (estável, por texto) para cada lista
+        ordem = sorted(range(len(nomes)), key=nomes.__getitem__)
+        self._nomes_ordenados = [nomes[i] for i in ordem]
+        self._ids_nomes = array("I", [ids_nomes[i] for i in ordem])
+        ordem = sorted(range(len(palavras)), key=palavras.__getitem__)
+        self._palavras_ordenadas = [palavras[i] for i in ordem]
+        self._ids_palavras = array("I", [ids_palavras[i] for i in ordem])
+        for palavra in dict.fromkeys(self._palavras_ordenadas):
+            self._ao_vocabulario(palavra)
+        return self
+
+    def adicionar(self, cpf, nome):
+        """Inclui um cliente novo (ou ignora, se o CPF já estiver no índice)."""
+        if cpf in self._posicao or not nome: return
+        numero, normalizado, palavras = self._registrar(cpf, nome)
+        posicao = bisect_left(self._nomes_ordenados, normalizado)
+        self._nomes_ordenados.insert(posicao, normalizado)
+        self._ids_nomes.insert(posicao, numero)
+        for palavra in palavras:
+            posicao = bisect_left(self._palavras_ordenadas, palavra)
+            self._palavras_ordenadas.insert(posicao, palavra)
+            self._ids_palavras.insert(posicao, numero)
+            self._ao_vocabulario(palavra)
+
+    # --- Busca ---
+
+    def buscar(self, texto, limite=10):
+        """Retorna até 'limite' tuplas (CPF, nome, pontuação), das mais relevantes para as menos."""
+        consulta = normalizar(texto)
+        if not consulta or limite < 1: return []
+        resultados, vistos = [], set()
+
+        def incluir(numero, pontuacao):
+            if numero not in vistos:
+                vistos.add(numero)
+                resultados.append((self._cpfs[numero], self._nomes[numero], pontuacao))
+
+        # 1 e 2: nome inteiro começando com o texto (faixa contínua da lista ordenada)
+        inicio = bisect_left(self._nomes_ordenados, consulta)
+        fim = bisect_left(self._nomes_ordenados, _fim_prefixo(consulta), inicio)
+        for posicao in range(inicio, min(fim, inicio + limite)):
+            nome = self._nomes_ordenados[posicao]
+            incluir(self._ids_nomes[posicao], 3.0 if nome == consulta else 2.0 + len(consulta) / len(nome))
+        resultados.sort(key=lambda r: -r[2])
+        if len(resultados) >= limite: return resultados[:limite]
+
+        # 3: cada palavra digitada é início de alguma palavra do nome
+        tokens = [t for t in consulta.split() if t not in PALAVRAS_IGNORADAS] or consulta.split()
+        faixas = []
+        for token in tokens:
+            inicio = bisect_left(self._palavras_ordenadas, token)
+            faixas.append((bisect_left(self._palavras_ordenadas, _fim_prefixo(token), inicio) - inicio, inicio, token))
+        quantidade, inicio, menor = min(faixas)  # Percorre só a palavra mais rara
+        outros = [t for t in tokens if t != menor]
+        por_palavra = []
+        for posicao in range(inicio, inicio + min(quantidade, MAX_CANDIDATOS)):
+            numero = self._ids_palavras[posicao]
+            if numero in vistos: continue
+            palavras = self._normalizados[numero].split()
+            if all(any(p.startswith(t) for p in palavras) for t in outros):
+                por_palavra.append((numero, 1.0 + len(consulta) / max(len(self._nomes[numero]), 1)))
+                if len(por_palavra) >= limite - len(resultados): break
+        for numero, pontuacao in por_palavra:
+            incluir(numero, pontuacao)
+        if len(resultados) >= limite: return resultados[:limite]
+
+        # 4: nomes com palavras parecidas com as digitadas (erros de digitação)
+        for numero, pontuacao in self._parecidos(tokens, limite - len(resultados), vistos):
+            incluir(numero, pontuacao)
+        return resultados[:limite]
+
+    def _palavras_parecidas(self, token):
+        """{palavra do vocabulário: similaridade} das mais parecidas com 'token'."""
+        bigramas = _bigramas(token)
+        contagem = Counter()
+        for bigrama in bigramas:
+            contagem.update(self._bigramas.get(bigrama, ()))
+        # Dice >= mínimo exige um número mínimo de pares em comum; corta o resto sem calcular
+        parecidas = {}
+        for palavra, em_comum in contagem.most_common():
+            if 2 * em_comum < SIMILARIDADE_MINIMA * (len(bigramas) + 2): break
+            similaridade = _similaridade(bigramas, self._vocabulario[palavra])
+            if similaridade >= SIMILARIDADE_MINIMA: parecidas[palavra] = similaridade
+        return dict(sorted(parecidas.items(), key=lambda item: -item[1])[:MAX_PALAVRAS_PARECIDAS])
+
+    def _faixa_palavra(self, palavra):
+        inicio = bisect_left(self._palavras_ordenadas, palavra)
+        return inicio, bisect_left(self._palavras_ordenadas, palavra + "\0", inicio)
+
+    def _parecidos(self, tokens, limite, ignorar):
+        if limite < 1: return []
+        parecidas = [self._palavras_parecidas(token) for token in tokens]
+        # Os candidatos vêm só da palavra digitada com menos nomes, percorrendo as
+        # palavras parecidas da mais para a menos parecida
+        faixas = [[self._faixa_palavra(palavra) for palavra in p] for p in parecidas]
+        menor = min(range(len(tokens)), key=lambda i: sum(fim - inicio for inicio, fim in faixas[i]))
+        candidatos, verificados = [], set(ignorar)
+        for inicio, fim in faixas[menor]:
+            for posicao in range(inicio, fim):
+                numero = self._ids_palavras[posicao]
+                if numero in verificados: continue
+                verificados.add(numero)
+                if len(verificados) > MAX_CANDIDATOS + len(ignorar): break
+                palavras = self._normalizados[numero].split()
+                # Média, entre as palavras digitadas, da palavra do nome mais parecida com cada uma
+                pontuacao = sum(max((1.0 if p.startswith(t) else s.get(p, 0.0)) for p in palavras)
+                                for t, s in zip(tokens, parecidas)) / len(tokens)
+                if pontuacao >= SIMILARIDADE_MINIMA: candidatos.append((numero, pontuacao))
+            if len(candidatos) >= limite: break  # As próximas palavras são menos parecidas
+        candidatos.sort(key=lambda c: -c[1])
+        return candidatos[:limite]
@@ -0,0 +1,329 @@
+# instrumentacao.py
+# =====================================================================
+# INSTRUMENTAÇÃO DAS CONSULTAS E DAS AÇÕES DA INTERFACE
+# Cada função de acesso a dados roda dentro de um "span" que mede o tempo
+# total e o tempo de cada fase (conexão = espera pelo pool, execução,
+# leitura das linhas, materialização dos objetos), além da quantidade de
+# linhas. Cada clique da interface que vira uma tarefa do ExecutorTarefas
+# abre um span de ação; as consultas feitas pela tarefa ficam ligadas a
+# ele, então uma busca lenta pode ser ligada ao clique que a pediu.
+#
+# Spans terminados são entregues aos "sinks" registrados:
+#   - SinkArquivoLog: uma linha por span num arquivo de log;
+#   - HistogramaMemoria: histograma de latência por nome, em memória;
+#   - SinkPrometheus: grava periodicamente o histograma no formato texto
+#     do Prometheus;
+#   - LogConsultasLentas: registra só as consultas acima de um limite.
+# Sem sinks registrados, o custo é só o de medir os tempos.
+# =====================================================================
+
+import contextvars
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import count
+
+
+# Configuração usada por configurar_padrao() (None desliga o item).
+INSTRUMENTACAO_CONFIG = {
+    'arquivo_log': None,                        # Ex.: "instrumentacao.log" (todos os spans)
+    'arquivo_lentas': "consultas_lentas.log",   # Consultas acima do limite
+    'limite_lento_ms': 200.0,
+    'arquivo_prometheus': None,                 # Ex.: "metricas.prom"
+    'intervalo_prometheus': 10.0,               # Segundos entre regravações do arquivo
+}
+
+_span_atual = contextvars.ContextVar("span_atual", default=None)
+_ids = count(1)
+
+
+class Span:
+    """Medição de uma consulta ("consulta") ou de uma ação da interface ("acao")."""
+
+    __slots__ = ("id", "nome", "tipo", "pai", "atributos", "fases", "linhas", "erro", "inicio", "fim", "_relogio")
+
+    def __init__(self, nome, tipo, pai=None, **atributos):
+        self.id = next(_ids)
+        self.nome = nome
+        self.tipo = tipo
+        self.pai = pai
+        self.atributos = atributos
+        self.fases = {}       # nome da fase -> segundos
+        self.linhas = None
+        self.erro = None
+        self.inicio = datetime.now()
+        self.fim = None
+        self._relogio = time.perf_counter()
+
+    @property
+    def duracao(self):
+        """Duração em segundos (até agora, se o span ainda não terminou)."""
+        return (self.fim if self.fim is not None else time.perf_counter()) - self._relogio
+
+    def acao(self):
+        """Retorna o span de ação da interface ao qual este span pertence (ou None)."""
+        span = self
+        while span is not None and span.tipo != "acao":
+            span = span.pai
+        return span
+
+    def descricao(self):
+        """Texto de uma linha com o resumo do span (usado pelos logs)."""
+        partes = [self.inicio.isoformat(timespec="milliseconds"), self.tipo, self.nome, f"{self.duracao * 1000:.2f}ms"]
+        if self.linhas is not None: partes.append(f"linhas={self.linhas}")
+        partes += [f"{fase}={segundos * 1000:.2f}ms" for fase, segundos in self.fases.items()]
+        partes += [f"{chave}={valor}" for chave, valor in self.atributos.items() if chave != "sql"]
+        acao = self.acao()
+        if acao is not None and acao is not self: partes.append(f"acao={acao.nome}#{acao.id}")
+        if self.erro is not None: partes.append(f"erro={self.erro!r}")
+        return " ".join(partes)
+
+
+# --- Registro de sinks e criação de spans ---
+
+_sinks = []
+_sinks_lock = threading.Lock()
+
+def adicionar_sink(sink):
+    """Registra um sink (objeto com o método registrar(span)) e o retorna."""
+    with _sinks_lock:
+        _sinks.append(sink)
+    return sink
+
+def remover_sink(sink):
+    with _sinks_lock:
+        if sink in _sinks: _sinks.remove(sink)
+
+def _entregar(span):
+    for sink in list(_sinks):
+        try:
+            sink.registrar(span)
+        except Exception as err:  # Um sink com problema não pode derrubar a consulta
+            print(f"Erro no sink de instrumentação {type(sink).__name__}: {err}")
+
+def iniciar(nome, tipo="consulta", **atributos):
+    """Abre um span sem torná-lo o atual (para spans que atravessam threads, como as ações)."""
+    return Span(nome, tipo, _span_atual.get(), **atributos)
+
+def finalizar(span, erro=None):
+    """Encerra um span aberto com iniciar() e o entrega aos sinks."""
+    if span.fim is not None: return
+    span.fim = time.perf_counter()
+    if erro is not None: span.erro = erro
+    _entregar(span)
+
+@contextmanager
+def dentro_de(span):
+    """Torna 'span' o atual no bloco (os spans criados dentro dele ficam como filhos)."""
+    token = _span_atual.set(span)
+    try:
+        yield span
+    finally:
+        _span_atual.reset(token)
+
+@contextmanager
+def span(nome, tipo="consulta", **atributos):
+    """Mede o bloco como um span filho do span atual."""
+    novo = iniciar(nome, tipo, **atributos)
+    token = _span_atual.set(novo)
+    try:
+        yield novo
+    except BaseException as err:
+        novo.erro = err
+        raise
+    finally:
+        _span_atual.reset(token)
+        finalizar(novo)
+
+def instrumentado(funcao):
+    """Decorador: executa a função dentro de um span com o nome dela."""
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        with span(funcao.__name__):
+            return funcao(*args, **kwargs)
+    return envoltorio
+
+def span_atual():
+    return _span_atual.get()
+
+@contextmanager
+def fase(nome):
+    """Soma o tempo do bloco à fase 'nome' do span atual (sem span atual, não faz nada)."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar_fase(nome, time.perf_counter() - inicio)
+
+def registrar_fase(nome, segundos):
+    atual = _span_atual.get()
+    if atual is not None:
+        atual.fases[nome] = atual.fases.get(nome, 0.0) + segundos
+
+def registrar_linhas(quantidade):
+    atual = _span_atual.get()
+    if atual is not None:
+        atual.linhas = (atual.linhas or 0) + quantidade
+
+def registrar_erro(erro):
+    """Marca o span atual com um erro que a função tratou (e só exibiu) em vez de propagar."""
+    atual = _span_atual.get()
+    if atual is not None:
+        atual.erro = erro
+
+def anotar(**atributos):
+    """Acrescenta atributos (sql, cache...) ao span atual."""
+    atual = _span_atual.get()
+    if atual is not None:
+        atual.atributos.update(atributos)
+
+
+# --- Sinks ---
+
+class SinkArquivoLog:
+    """Acrescenta uma linha por span ao arquivo 'caminho'."""
+
+    def __init__(self, caminho, tipos=None):
+        self.caminho = caminho
+        self.tipos = tipos  # None = todos; ex.: {"acao"}
+        self._lock = threading.Lock()
+
+    def _escrever(self, linha):
+        with self._lock, open(self.caminho, "a", encoding="utf-8") as arquivo:
+            arquivo.write(linha + "\n")
+
+    def registrar(self, span):
+        if self.tipos is None or span.tipo in self.tipos:
+            self._escrever(span.descricao())
+
+
+class LogConsultasLentas(SinkArquivoLog):
+    """Registra as consultas que levaram 'limite_ms' ou mais, com o SQL e a ação de origem."""
+
+    def __init__(self, caminho, limite_ms=200.0):
+        super().__init__(caminho, tipos={"consulta"})
+        self.limite_ms = limite_ms
+
+    def registrar(self, span):
+        if span.tipo != "consulta" or span.duracao * 1000 < self.limite_ms:
+            return
+        linha = "LENTA " + span.descricao()
+        sql = span.atributos.get("sql")
+        if sql: linha += "\n    " + " ".join(sql.split())
+        self._escrever(linha)
+
+
+LIMITES_HISTOGRAMA_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+class HistogramaMemoria:
+    """Histograma de latência por (tipo, nome) com faixas fixas em milissegundos."""
+
+    def __init__(self, limites_ms=LIMITES_HISTOGRAMA_MS):
+        self.limites_ms = tuple(limites_ms)
+        self._series = {}  # (tipo, nome) -> {"faixas": [...], "soma": s, "contagem": n, "linhas": n, "erros": n}
+        self._lock = threading.Lock()
+
+    def registrar(self, span):
+        ms = span.duracao * 1000
+        with self._lock:
+            serie = self._series.get((span.tipo, span.nome))
+            if serie is None:
+                serie = self._series[(span.tipo, span.nome)] = {
+                    "faixas": [0] * len(self.limites_ms), "soma": 0.0, "contagem": 0, "linhas": 0, "erros": 0}
+            for i, limite in enumerate(self.limites_ms):
+                if ms <= limite:
+                    serie["faixas"][i] += 1
+                    break
+            serie["soma"] += ms
+            serie["contagem"] += 1
+            serie["linhas"] += span.linhas or 0
+            serie["erros"] += span.erro is not None
+
+    def percentil(self, tipo, nome, p):
+        """Estimativa do percentil 'p' (0-100) em ms: o limite superior da faixa onde ele cai."""
+        with self._lock:
+            serie = self._series.get((tipo, nome))
+            if not serie or not serie["contagem"]: return None
+            alvo, acumulado = serie["contagem"] * p / 100, 0
+            for limite, quantidade in zip(self.limites_ms, serie["faixas"]):
+                acumulado += quantidade
+                if acumulado >= alvo: return limite
+            return float("inf")
+
+    def resumo(self):
+        """Retorna {(tipo, nome): {"contagem", "media_ms", "p50_ms", "p95_ms", "p99_ms", "linhas", "erros"}}."""
+        with self._lock:
+            chaves = list(self._series)
+        resumo = {}
+        for tipo, nome in chaves:
+            serie = self._series[(tipo, nome)]
+            resumo[(tipo, nome)] = {"contagem": serie["contagem"], "media_ms": serie["soma"] / serie["contagem"],
+                                    "p50_ms": self.percentil(tipo, nome, 50), "p95_ms": self.percentil(tipo, nome, 95),
+                                    "p99_ms": self.percentil(tipo, nome, 99),
+                                    "linhas": serie["linhas"], "erros": serie["erros"]}
+        return resumo
+
+    def texto_prometheus(self, prefixo="sistema_juridico"):
+        """Exporta as séries no formato texto do Prometheus (histograma em segundos)."""
+        linhas = []
+        with self._lock:
+            series = sorted(self._series.items())
+            for tipo in sorted({tipo for tipo, _ in self._series}):
+                metrica = f"{prefixo}_{tipo}_duracao_segundos"
+                linhas += [f"# HELP {metrica} Duração dos spans do tipo '{tipo}'.", f"# TYPE {metrica} histogram"]
+                for (tipo_serie, nome), serie in series:
+                    if tipo_serie != tipo: continue
+                    acumulado = 0
+                    for limite, quantidade in zip(self.limites_ms, serie["faixas"]):
+                        acumulado += quantidade
+                        linhas.append(f'{metrica}_bucket{{nome="{nome}",le="{limite / 1000:g}"}} {acumulado}')
+                    linhas.append(f'{metrica}_bucket{{nome="{nome}",le="+Inf"}} {serie["contagem"]}')
+                    linhas.append(f'{metrica}_sum{{nome="{nome}"}} {serie["soma"] / 1000:.6f}')
+                    linhas.append(f'{metrica}_count{{nome="{nome}"}} {serie["contagem"]}')
+            for sufixo, campo, ajuda in (("linhas_total", "linhas", "Linhas lidas/gravadas"),
+                                         ("erros_total", "erros", "Spans terminados com erro")):
+                metrica = f"{prefixo}_{sufixo}"
+                linhas += [f"# HELP {metrica} {ajuda}.", f"# TYPE {metrica} counter"]
+                linhas += [f'{metrica}{{tipo="{tipo}",nome="{nome}"}} {serie[campo]}' for (tipo, nome), serie in series]
+        return "\n".join(linhas) + "\n"
+
+
+class SinkPrometheus:
+    """Mantém um HistogramaMemoria e regrava 'caminho' no formato Prometheus a cada 'intervalo' segundos."""
+
+    def __init__(self, caminho, intervalo=10.0, histograma=None):
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.histograma = histograma or HistogramaMemoria()
+        self._ultima_gravacao = 0.0
+        self._lock = threading.Lock()
+
+    def registrar(self, span):
+        self.histograma.registrar(span)
+        if time.monotonic() - self._ultima_gravacao >= self.intervalo:
+            self.despejar()
+
+    def despejar(self):
+        """Grava o arquivo agora (troca atômica, para quem estiver lendo nunca ver um arquivo pela metade)."""
+        with self._lock:
+            self._ultima_gravacao = time.monotonic()
+            temporario = self.caminho + ".tmp"
+            with open(temporario, "w", encoding="utf-8") as arquivo:
+                arquivo.write(self.histograma.texto_prometheus())
+            os.replace(temporario, self.caminho)
+
+
+def configurar_padrao(config=None):
+    """Registra os sinks descritos em INSTRUMENTACAO_CONFIG e retorna a lista deles."""
+    config = {**INSTRUMENTACAO_CONFIG, **(config or {})}
+    sinks = []
+    if config['arquivo_log']:
+        sinks.append(adicionar_sink(SinkArquivoLog(config['arquivo_log'])))
+    if config['arquivo_lentas']:
+        sinks.append(adicionar_sink(LogConsultasLentas(config['arquivo_lentas'], config['limite_lento_ms'])))
+    if config['arquivo_prometheus']:
+        sinks.append(adicionar_sink(SinkPrometheus(config['arquivo_prometheus'], config['intervalo_prometheus'])))
+    return sinks
@@ -1,197 +1,38 @@
 # =====================================================================
 # INTERFACE E BANCO DE DADOS DO SISTEMA JURÍDICO
-# Este arquivo contém a interface gráfica (Tkinter) e as funções
-# de acesso ao banco de dados (MySQL).
+# Este arquivo contém a interface gráfica (Tkinter); o acesso aos dados
+# fica no repositório de 'repositorio.py' (por padrão, o MySQL de
+# 'banco_dados.py'; use SISTEMA_JURIDICO_BACKEND=sqlite para um arquivo local).
 #
 # PRÉ-REQUISITO:
-# Este arquivo DEVE estar na mesma pasta que o seu arquivo 'modelo_abstrato.py'
-# para que a importação das classes funcione corretamente.
+# Este arquivo DEVE estar na mesma pasta que os arquivos 'modelo_abstrato.py',
+# 'repositorio.py', 'banco_dados.py', 'pool_conexoes.py', 'executor_tarefas.py',
+# 'navegador_resultados.py', 'janela_busca_nomes.py', 'janela_agenda.py' e 'janela_visao_cliente.py'
+# para que as importações funcionem.
 # =====================================================================
 
 import tkinter as tk
 from tkinter import messagebox, simpledialog
 from datetime import datetime
-import mysql.connector
-from mysql.connector import errorcode
 
-# --- PASSO 1: IMPORTAÇÃO DO SEU ARQUIVO DE MODELO ---
-# O Python vai procurar por 'modelo_abstrato.py' na mesma pasta.
+# --- PASSO 1: IMPORTAÇÃO DO SEU ARQUIVO DE MODELO E DO BANCO DE DADOS ---
+# O Python vai procurar por 'modelo_abstrato.py' e 'repositorio.py' na mesma pasta.
 try:
-    from modelo_abstrato import ClienteConcreto, ProcessoConcreto, PagamentoConcreto, AudienciaConcreta
+    from modelo_abstrato import ClienteConcreto, ProcessoConcreto, PagamentoConcreto, AudienciaConcreta, ErroCadastro
+    from repositorio import criar_repositorio
+    import instrumentacao
+    from executor_tarefas import ExecutorTarefas
+    from navegador_resultados import NavegadorResultados, COLUNAS_PAGAMENTOS, COLUNAS_AUDIENCIAS, linha_pagamento, linha_audiencia
+    from janela_busca_nomes import JanelaBuscaNomes
+    from janela_agenda import JanelaAgenda
+    from janela_visao_cliente import JanelaVisaoCliente
 except ImportError:
-    print("ERRO CRÍTICO: O arquivo 'modelo_abstrato.py' não foi encontrado.")
-    print("Certifique-se de que ele está na mesma pasta que este script.")
+    print("ERRO CRÍTICO: O arquivo 'modelo_abstrato.py' ou 'repositorio.py' não foi encontrado.")
+    print("Certifique-se de que eles estão na mesma pasta que este script.")
     exit()
 
 
-# --- PASSO 2: CONFIGURAÇÃO DO BANCO DE DADOS ---
-# !!! IMPORTANTE: Altere estes valores para os da sua configuração do MySQL !!!
-DB_CONFIG = {
-    'user': 'root',
-    'password': 'root', # Coloque a senha do seu usuário root aqui
-    'host': '127.0.0.1',             # ou 'localhost'
-    'database': 'advocacia_db',      # O nome do banco de dados que criamos
-    'raise_on_warnings': True
-}
-
-
-# --- PASSO 3: FUNÇÕES DE BANCO DE DADOS ---
-
-def get_db_connection():
-    """Cria e retorna um objeto de conexão com o banco de dados."""
-    try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        return conn
-    except mysql.connector.Error as err:
-        if err.errno == errorcode.ER_ACCESS_DENIED_ERROR:
-            print("Erro de Conexão: Usuário ou senha do banco de dados incorretos.")
-        elif err.errno == errorcode.ER_BAD_DB_ERROR:
-            print(f"Erro de Conexão: O banco de dados '{DB_CONFIG['database']}' não existe.")
-        else:
-            print(f"Erro ao conectar ao banco de dados: {err}")
-        return None
-
-def add_cliente(cliente: ClienteConcreto):
-    """Adiciona um novo cliente ao banco de dados."""
-    conn = get_db_connection()
-    if not conn: return False
-    sql = "INSERT INTO clientes (cpf, nome, idade, telefone, endereco, email) VALUES (%s, %s, %s, %s, %s, %s)"
-    values = (cliente.cpf, cliente.nome, cliente.idade, cliente.telefone, cliente.endereco, cliente.email)
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql, values)
-        conn.commit()
-        return True
-    except mysql.connector.Error as err:
-        print(f"Erro ao adicionar cliente: {err}"); conn.rollback(); return False
-    finally:
-        if conn.is_connected(): cursor.close(); conn.close()
-
-def add_processo(processo: ProcessoConcreto):
-    """Adiciona um novo processo ao banco de dados."""
-    conn = get_db_connection()
-    if not conn: return False
-    sql = "INSERT INTO processos (numero_processo, cliente_cpf, descricao) VALUES (%s, %s, %s)"
-    values = (processo.numero, processo.cliente_cpf, processo.descricao)
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql, values)
-        conn.commit()
-        return True
-    except mysql.connector.Error as err:
-        print(f"Erro ao adicionar processo: {err}"); conn.rollback(); return False
-    finally:
-        if conn.is_connected(): cursor.close(); conn.close()
-
-def add_pagamento(pagamento: PagamentoConcreto):
-    """Adiciona um novo pagamento ao banco de dados."""
-    conn = get_db_connection()
-    if not conn: return False
-    sql = "INSERT INTO pagamentos (cliente_cpf, valor, descricao) VALUES (%s, %s, %s)"
-    values = (pagamento.cliente_cpf, pagamento.valor, pagamento.descricao)
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql, values)
-        conn.commit()
-        return True
-    except mysql.connector.Error as err:
-        print(f"Erro ao adicionar pagamento: {err}"); conn.rollback(); return False
-    finally:
-        if conn.is_connected(): cursor.close(); conn.close()
-
-def add_audiencia(audiencia: AudienciaConcreta):
-    """Adiciona uma nova audiência ao banco de dados."""
-    conn = get_db_connection()
-    if not conn: return False
-    try:
-        data_hora_mysql = datetime.strptime(audiencia.data_hora, '%d/%m/%Y %H:%M').strftime('%Y-%m-%d %H:%M:%S')
-    except ValueError:
-        messagebox.showwarning("Formato Inválido", "Formato de data/hora inválido. Use DD/MM/AAAA HH:MM"); return False
-    sql = "INSERT INTO audiencias (numero_processo, data_hora, local, tipo) VALUES (%s, %s, %s, %s)"
-    values = (audiencia.processo_numero, data_hora_mysql, audiencia.local, audiencia.tipo)
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql, values)
-        conn.commit()
-        return True
-    except mysql.connector.Error as err:
-        print(f"Erro ao adicionar audiência: {err}"); conn.rollback(); return False
-    finally:
-        if conn.is_connected(): cursor.close(); conn.close()
-
-def find_cliente_by_cpf(cpf: str):
-    """Busca um cliente pelo CPF e retorna um objeto ClienteConcreto ou None."""
-    conn = get_db_connection()
-    if not conn: return None
-    cliente = None
-    sql = "SELECT cpf, nome, idade, telefone, endereco, email FROM clientes WHERE cpf = %s"
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql, (cpf,))
-        result = cursor.fetchone()
-        if result:
-            cliente = ClienteConcreto(nome=result[1], cpf=result[0], idade=result[2], telefone=result[3], endereco=result[4], email=result[5])
-    except mysql.connector.Error as err: print(f"Erro ao buscar cliente: {err}")
-    finally:
-        if conn.is_connected(): cursor.close(); conn.close()
-    return cliente
-
-def find_processo_by_numero(numero: str):
-    """Busca um processo pelo número e retorna um objeto ProcessoConcreto ou None."""
-    conn = get_db_connection()
-    if not conn: return None
-    processo = None
-    sql = "SELECT numero_processo, descricao, cliente_cpf FROM processos WHERE numero_processo = %s"
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql, (numero,))
-        result = cursor.fetchone()
-        if result:
-            processo = ProcessoConcreto(numero=result[0], descricao=result[1], cliente_cpf=result[2])
-    except mysql.connector.Error as err: print(f"Erro ao buscar processo: {err}")
-    finally:
-        if conn.is_connected(): cursor.close(); conn.close()
-    return processo
-
-def find_pagamentos_by_cpf(cpf: str):
-    """Busca todos os pagamentos de um cliente e retorna uma lista de objetos PagamentoConcreto."""
-    conn = get_db_connection()
-    if not conn: return []
-    pagamentos = []
-    sql = "SELECT cliente_cpf, valor, descricao FROM pagamentos WHERE cliente_cpf = %s"
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql, (cpf,))
-        results = cursor.fetchall()
-        for row in results:
-            pagamentos.append(PagamentoConcreto(cliente_cpf=row[0], valor=row[1], descricao=row[2]))
-    except mysql.connector.Error as err: print(f"Erro ao buscar pagamentos: {err}")
-    finally:
-        if conn.is_connected(): cursor.close(); conn.close()
-    return pagamentos
-
-def find_audiencias_by_processo(numero_processo: str):
-    """Busca todas as audiências de um processo e retorna uma lista de objetos AudienciaConcreta."""
-    conn = get_db_connection()
-    if not conn: return []
-    audiencias = []
-    sql = """SELECT a.numero_processo, p.cliente_cpf, a.data_hora, a.local, a.tipo 
-             FROM audiencias a JOIN processos p ON a.numero_processo = p.numero_processo
-             WHERE a.numero_processo = %s"""
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql, (numero_processo,))
-        results = cursor.fetchall()
-        for row in results:
-            data_hora_display = row[2].strftime('%d/%m/%Y %H:%M')
-            audiencias.append(AudienciaConcreta(processo_numero=row[0], cliente_cpf=row[1], data_hora=data_hora_display, local=row[3], tipo=row[4]))
-    except mysql.connector.Error as err: print(f"Erro ao buscar audiências: {err}")
-    finally:
-        if conn.is_connected(): cursor.close(); conn.close()
-    return audiencias
-
-
-# --- PASSO 4: INTERFACE GRÁFICA (TKINTER) ---
+# --- PASSO 2: INTERFACE GRÁFICA (TKINTER) ---
 
 class BaseDialog(tk.Toplevel):
     """Classe base para as janelas de diálogo de entrada de dados."""
@@ -260,7 +101,10 @@ class ProcessoDialog(BaseDialog):
 
 class PagamentoDialog(BaseDialog):
     def __init__(self, parent):
-        fields = [("CPF do Cliente", "cliente_cpf", "", "str"), ("Valor", "valor", "", "float"), ("Descrição", "descricao", "", "str")]
+        # Sem data de pagamento e com vencimento, o pagamento fica em aberto
+        fields = [("CPF do Cliente", "cliente_cpf", "", "str"), ("Valor", "valor", "", "float"), ("Descrição", "descricao", "", "str"),
+                  ("Vencimento (DD/MM/AAAA)", "data_vencimento", "", "optional"),
+                  ("Pago em (DD/MM/AAAA)", "data_pagamento", datetime.now().strftime('%d/%m/%Y'), "optional")]
         super().__init__(parent, "Registrar Pagamento", fields)
 
 class AudienciaDialog(BaseDialog):
@@ -270,12 +114,42 @@ class AudienciaDialog(BaseDialog):
         super().__init__(parent, "Agendar Audiência", fields)
 
 class SistemaJuridicoAcaoGUI:
-    """Classe principal que monta e gerencia a interface gráfica."""
-    def __init__(self, master):
+    """Classe principal que monta e gerencia a interface gráfica.
+
+    As operações do repositório rodam no ExecutorTarefas (fora da thread do
+    Tkinter); os resultados são exibidos quando chegam, sem congelar a janela.
+    """
+    def __init__(self, master, repo):
         self.master = master
+        self.repo = repo
         master.title("Sistema Jurídico (Interface + BD)")
-        master.geometry("450x350")
+        master.geometry("450x515")
+        self.executor = ExecutorTarefas(master, ao_mudar_ocupado=self._atualizar_ocupado)
         self.setup_ui()
+        master.protocol("WM_DELETE_WINDOW", self._on_fechar)
+        # A janela aparece na hora; a conexão é testada em segundo plano
+        # (no MySQL, já deixa aberta a conexão mínima que o pool vai reaproveitar)
+        self.executor.submeter("Conectando ao banco de dados...", self.repo.verificar_conexao,
+                               ao_concluir=self._conexao_verificada, ao_falhar=self._falha_conexao,
+                               acao="Verificar Conexão", cancelavel=False)
+
+    def _conexao_verificada(self, conectou):
+        if not conectou:
+            self._falha_conexao(None)
+            return
+        print("Conexão com o banco de dados bem-sucedida.")
+        # Monta o índice de nomes e a agenda em segundo plano, para a primeira busca já ser rápida
+        self.executor.submeter("Preparando busca por nome...", self.repo.preparar_busca_por_nome,
+                               acao="Preparar Busca por Nome", cancelavel=False)
+        self.executor.submeter("Preparando agenda...", self.repo.preparar_agenda, acao="Preparar Agenda",
+                               cancelavel=False)
+
+    def _falha_conexao(self, err):
+        print("Falha ao conectar ao banco de dados. A aplicação será encerrada.")
+        messagebox.showerror("Erro Crítico de Banco de Dados",
+                             f"Não foi possível conectar ao banco de dados ({self.repo.nome}).\n"
+                             "Verifique se o servidor está rodando e se as credenciais estão corretas.")
+        self._on_fechar()
 
     def setup_ui(self):
         main_frame = tk.Frame(self.master, padx=20, pady=20)
@@ -290,100 +164,180 @@ class SistemaJuridicoAcaoGUI:
         tk.Button(main_frame, text="6. Buscar Processo", command=self.buscar_processo_dialog, width=30).pack(pady=3)
         tk.Button(main_frame, text="7. Buscar Pagamentos", command=self.buscar_pagamento_dialog, width=30).pack(pady=3)
         tk.Button(main_frame, text="8. Buscar Audiências", command=self.buscar_audiencia_dialog, width=30).pack(pady=3)
+        tk.Button(main_frame, text="9. Buscar Cliente por Nome", command=self.buscar_cliente_por_nome, width=30).pack(pady=3)
+        tk.Button(main_frame, text="10. Agenda de Audiências", command=self.ver_agenda, width=30).pack(pady=3)
+        tk.Button(main_frame, text="11. Visão Completa do Cliente", command=self.ver_visao_cliente, width=30).pack(pady=3)
+        # Barra de status: indica operações em andamento e permite cancelar as buscas
+        status_frame = tk.Frame(self.master, padx=10, pady=5)
+        status_frame.pack(side=tk.BOTTOM, fill="x")
+        self.status_label = tk.Label(status_frame, text="Pronto.", anchor="w")
+        self.status_label.pack(side=tk.LEFT, expand=True, fill="x")
+        self.cancelar_button = tk.Button(status_frame, text="Cancelar", command=self.executor.cancelar_todas, state=tk.DISABLED)
+        self.cancelar_button.pack(side=tk.RIGHT)
+
+    # --- Execução em segundo plano ---
+
+    def _executar(self, descricao, funcao, ao_concluir, acao=None):
+        """Roda o cadastro 'funcao' fora da thread do Tkinter e chama 'ao_concluir(resultado)' quando terminar.
+
+        'acao' é o nome do botão nas medições de 'instrumentacao.py'. O botão
+        'Cancelar' não alcança cadastros: o usuário sempre fica sabendo se gravou.
+        """
+        self.executor.submeter(descricao, funcao, ao_concluir=ao_concluir, ao_falhar=self._mostrar_falha, acao=acao,
+                               cancelavel=False)
+
+    def _atualizar_ocupado(self, pendentes):
+        if pendentes:
+            texto = pendentes[-1].descricao + (f" (+{len(pendentes) - 1})" if len(pendentes) > 1 else "")
+            self.status_label.config(text=texto)
+            self.cancelar_button.config(state=tk.NORMAL if any(t.cancelavel for t in pendentes) else tk.DISABLED)
+            self.master.config(cursor="watch")
+        else:
+            self.status_label.config(text="Pronto.")
+            self.cancelar_button.config(state=tk.DISABLED)
+            self.master.config(cursor="")
+
+    def _mostrar_mensagem(self, resultado):
+        """Exibe o (tipo, título, texto) devolvido pelas tarefas de cadastro."""
+        tipo, titulo, texto = resultado
+        {"info": messagebox.showinfo, "aviso": messagebox.showwarning, "erro": messagebox.showerror}[tipo](titulo, texto)
+
+    def _mostrar_falha(self, err):
+        messagebox.showerror("Erro", f"Erro inesperado: {err}")
+
+    def _on_fechar(self):
+        self.executor.encerrar()
+        self.repo.fechar()
+        self.master.destroy()
+
+    # --- Métodos para Adicionar ---
 
     def adicionar_cliente_gui(self):
         data = ClienteDialog(self.master).show()
-        if data:
-            if find_cliente_by_cpf(data["cpf"]):
-                messagebox.showwarning("Erro", f"Cliente com CPF '{data['cpf']}' já existe."); return
-            if add_cliente(ClienteConcreto(**data)):
-                messagebox.showinfo("Sucesso", f"Cliente '{data['nome']}' adicionado!")
-            else:
-                messagebox.showerror("Erro de BD", "Não foi possível adicionar o cliente. Verifique o console.")
+        if not data: return
+        def tarefa():
+            # Uma única ida ao banco: a chave primária do CPF recusa duplicados
+            try:
+                if self.repo.add_cliente(ClienteConcreto(**data)):
+                    return ("info", "Sucesso", f"Cliente '{data['nome']}' adicionado!")
+            except ErroCadastro as err:
+                return ("aviso", "Erro", str(err))
+            return ("erro", "Erro de BD", "Não foi possível adicionar o cliente. Verifique o console.")
+        self._executar("Adicionando cliente...", tarefa, self._mostrar_mensagem, acao="Adicionar Cliente")
 
     def adicionar_processo_gui(self):
         data = ProcessoDialog(self.master).show()
-        if data:
-            if find_processo_by_numero(data["numero"]):
-                messagebox.showwarning("Erro", f"Processo com número '{data['numero']}' já existe."); return
-            if not find_cliente_by_cpf(data["cliente_cpf"]):
-                messagebox.showwarning("Erro", f"Cliente com CPF '{data['cliente_cpf']}' não encontrado."); return
-            if add_processo(ProcessoConcreto(**data)):
-                messagebox.showinfo("Sucesso", f"Processo '{data['numero']}' adicionado!")
-            else:
-                messagebox.showerror("Erro de BD", "Não foi possível adicionar o processo. Verifique o console.")
+        if not data: return
+        def tarefa():
+            # O banco recusa número duplicado (DuplicateProcesso) e CPF inexistente (ClienteNotFound)
+            try:
+                if self.repo.add_processo(ProcessoConcreto(**data)):
+                    return ("info", "Sucesso", f"Processo '{data['numero']}' adicionado!")
+            except ErroCadastro as err:
+                return ("aviso", "Erro", str(err))
+            return ("erro", "Erro de BD", "Não foi possível adicionar o processo. Verifique o console.")
+        self._executar("Adicionando processo...", tarefa, self._mostrar_mensagem, acao="Adicionar Processo")
 
     def registrar_pagamento_gui(self):
         data = PagamentoDialog(self.master).show()
-        if data:
-            if not find_cliente_by_cpf(data["cliente_cpf"]):
-                messagebox.showwarning("Erro", f"Cliente com CPF '{data['cliente_cpf']}' não encontrado."); return
-            if add_pagamento(PagamentoConcreto(**data)):
-                messagebox.showinfo("Sucesso", "Pagamento registrado!")
-            else:
-                messagebox.showerror("Erro de BD", "Não foi possível registrar o pagamento. Verifique o console.")
+        if not data: return
+        try:
+            for campo in ("data_vencimento", "data_pagamento"):
+                if data[campo]: data[campo] = datetime.strptime(data[campo], '%d/%m/%Y').date()
+        except ValueError:
+            messagebox.showwarning("Formato Inválido", "Formato de data inválido. Use DD/MM/AAAA"); return
+        def tarefa():
+            try:
+                if self.repo.add_pagamento(PagamentoConcreto(**data)):
+                    return ("info", "Sucesso", "Pagamento registrado!")
+            except ErroCadastro as err:
+                return ("aviso", "Erro", str(err))
+            return ("erro", "Erro de BD", "Não foi possível registrar o pagamento. Verifique o console.")
+        self._executar("Registrando pagamento...", tarefa, self._mostrar_mensagem, acao="Registrar Pagamento")
 
     def agendar_audiencia_gui(self):
         data = AudienciaDialog(self.master).show()
-        if data:
-            processo = find_processo_by_numero(data["processo_numero"])
-            if not processo:
-                messagebox.showwarning("Erro", f"Processo '{data['processo_numero']}' não encontrado."); return
-            data['cliente_cpf'] = processo.cliente_cpf
-            if add_audiencia(AudienciaConcreta(**data)):
-                messagebox.showinfo("Sucesso", "Audiência agendada!")
-            else:
-                messagebox.showerror("Erro de BD", "Não foi possível agendar a audiência. Verifique o console.")
+        if not data: return
+        try:
+            data["data_hora"] = datetime.strptime(data["data_hora"], '%d/%m/%Y %H:%M')
+        except ValueError:
+            messagebox.showwarning("Formato Inválido", "Formato de data/hora inválido. Use DD/MM/AAAA HH:MM"); return
+        def tarefa():
+            # O CPF do cliente vem do processo; o repositório recusa horário ocupado (ConflitoAgenda)
+            try:
+                if self.repo.add_audiencia(AudienciaConcreta(cliente_cpf=None, **data)):
+                    return ("info", "Sucesso", "Audiência agendada!")
+            except ErroCadastro as err:
+                return ("aviso", "Erro", str(err))
+            return ("erro", "Erro de BD", "Não foi possível agendar a audiência. Verifique o console.")
+        self._executar("Agendando audiência...", tarefa, self._mostrar_mensagem, acao="Agendar Audiência")
+
+    # --- Métodos de Busca ---
 
     def buscar_cliente_dialog(self):
         cpf_busca = simpledialog.askstring("Buscar Cliente", "Digite o CPF do cliente:")
         if not cpf_busca: return
-        cliente = find_cliente_by_cpf(cpf_busca)
-        if cliente: messagebox.showinfo("Cliente Encontrado", cliente.obter_detalhes_completos())
-        else: messagebox.showinfo("Não Encontrado", f"Cliente com CPF '{cpf_busca}' não foi encontrado.")
+        def mostrar(cliente):
+            if cliente: messagebox.showinfo("Cliente Encontrado", cliente.obter_detalhes_completos())
+            else: messagebox.showinfo("Não Encontrado", f"Cliente com CPF '{cpf_busca}' não foi encontrado.")
+        self.executor.submeter(f"Buscando cliente {cpf_busca}...", self.repo.find_cliente_by_cpf, cpf_busca,
+                               ao_concluir=mostrar, ao_falhar=self._mostrar_falha, acao="Buscar Cliente")
+
+    def buscar_cliente_por_nome(self):
+        # Busca enquanto digita (índice em memória); escolher um nome busca os detalhes pelo CPF
+        def escolher(cpf):
+            def mostrar(cliente):
+                if cliente: messagebox.showinfo("Cliente Encontrado", cliente.obter_detalhes_completos(), parent=janela)
+            self.executor.submeter(f"Buscando cliente {cpf}...", self.repo.find_cliente_by_cpf, cpf,
+                                   ao_concluir=mostrar, ao_falhar=self._mostrar_falha, acao="Buscar Cliente")
+        janela = JanelaBuscaNomes(self.master, self.repo.buscar_clientes_por_nome, escolher,
+                                  executor=self.executor, acao="Buscar Cliente por Nome")
+
+    def ver_agenda(self):
+        JanelaAgenda(self.master, self.repo.agenda_entre, executor=self.executor, acao="Agenda de Audiências")
+
+    def ver_visao_cliente(self):
+        cpf_busca = simpledialog.askstring("Visão Completa do Cliente", "Digite o CPF do cliente:")
+        if not cpf_busca: return
+        # Cliente, processos, pagamentos e audiências numa só consulta
+        JanelaVisaoCliente(self.master, self.repo.visao_cliente_by_cpf, cpf_busca, executor=self.executor,
+                           acao="Visão Completa do Cliente")
 
     def buscar_processo_dialog(self):
         numero_busca = simpledialog.askstring("Buscar Processo", "Digite o número do processo:")
         if not numero_busca: return
-        processo = find_processo_by_numero(numero_busca)
-        if processo: messagebox.showinfo("Processo Encontrado", processo.obter_detalhes_completos())
-        else: messagebox.showinfo("Não Encontrado", f"Processo com número '{numero_busca}' não encontrado.")
+        def mostrar(processo):
+            if processo: messagebox.showinfo("Processo Encontrado", processo.obter_detalhes_completos())
+            else: messagebox.showinfo("Não Encontrado", f"Processo com número '{numero_busca}' não encontrado.")
+        self.executor.submeter(f"Buscando processo {numero_busca}...", self.repo.find_processo_by_numero, numero_busca,
+                               ao_concluir=mostrar, ao_falhar=self._mostrar_falha, acao="Buscar Processo")
 
     def buscar_pagamento_dialog(self):
         cpf_busca = simpledialog.askstring("Buscar Pagamentos", "Digite o CPF do cliente:")
         if not cpf_busca: return
-        pagamentos = find_pagamentos_by_cpf(cpf_busca)
-        if pagamentos:
-            list_str = f"--- Pagamentos para CPF: {cpf_busca} ---\n\n"
-            for i, p in enumerate(pagamentos):
-                list_str += f"Pagamento #{i+1}:\n{p.obter_detalhes_completos()}\n{'-'*40}\n"
-            messagebox.showinfo("Pagamentos Encontrados", list_str)
-        else: messagebox.showinfo("Não Encontrado", f"Nenhum pagamento encontrado para o CPF '{cpf_busca}'.")
+        # As páginas são buscadas sob demanda (paginação por id) conforme a rolagem
+        NavegadorResultados(self.master, f"Pagamentos do CPF {cpf_busca}", COLUNAS_PAGAMENTOS,
+                            lambda apos, limite: self.repo.find_pagamentos_by_cpf(cpf_busca, apos_id=apos, limite=limite),
+                            linha_pagamento, lambda p: p.id_pagamento, executor=self.executor,
+                            acao="Buscar Pagamentos")
 
     def buscar_audiencia_dialog(self):
         numero_busca = simpledialog.askstring("Buscar Audiências", "Digite o número do processo:")
         if not numero_busca: return
-        audiencias = find_audiencias_by_processo(numero_busca)
-        if audiencias:
-            list_str = f"--- Audiências para Processo: {numero_busca} ---\n\n"
-            for i, a in enumerate(audiencias):
-                list_str += f"Audiência #{i+1}:\n{a.obter_detalhes_completos()}\n{'-'*40}\n"
-            messagebox.showinfo("Audiências Encontradas", list_str)
-        else: messagebox.showinfo("Não Encontrado", f"Nenhuma audiência para o Processo '{numero_busca}'.")
+        NavegadorResultados(self.master, f"Audiências do Processo {numero_busca}", COLUNAS_AUDIENCIAS,
+                            lambda apos, limite: self.repo.find_audiencias_by_processo(numero_busca, apos_id=apos, limite=limite),
+                            linha_audiencia, lambda a: a.id_audiencia, executor=self.executor,
+                            acao="Buscar Audiências")
 
 
-# --- PASSO 5: EXECUÇÃO DA APLICAÇÃO ---
+# --- PASSO 3: EXECUÇÃO DA APLICAÇÃO ---
 if __name__ == "__main__":
-    # Testa a conexão com o banco de dados antes de iniciar a GUI
-    conn = get_db_connection()
-    if conn:
-        conn.close()
-        print("Conexão com o banco de dados bem-sucedida. Iniciando aplicação...")
-        root = tk.Tk()
-        app = SistemaJuridicoAcaoGUI(root)
-        root.mainloop()
-    else:
-        print("Falha ao conectar ao banco de dados. A aplicação não será iniciada.")
-        messagebox.showerror("Erro Crítico de Banco de Dados", 
-                             "Não foi possível conectar ao banco de dados MySQL.\n"
-                             "Verifique se o servidor está rodando e se as credenciais neste arquivo estão corretas.")
+    # Medições: log de consultas lentas (e, se configurados em INSTRUMENTACAO_CONFIG,
+    # log de todos os spans e arquivo de métricas no formato do Prometheus)
+    instrumentacao.configurar_padrao()
+    # A conexão é testada pela própria janela, em segundo plano (sem atrasar a abertura).
+    # Para rotinas sem interface, use a linha de comando: python -m linha_comando --help
+    repo = criar_repositorio("mysql")
+    root = tk.Tk()
+    app = SistemaJuridicoAcaoGUI(root, repo)
+    root.mainloop()
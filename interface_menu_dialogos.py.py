@@ -1,8 +1,17 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog
+from datetime import datetime
 
 # Importa as classes do modelo_abstrato.py
 from modelo_abstrato import ClienteConcreto, ProcessoConcreto, PagamentoConcreto, AudienciaConcreta
+from modelo_abstrato import ErroCadastro, ClienteNotFound
+# Repositório de dados: em memória por padrão (SISTEMA_JURIDICO_BACKEND=sqlite grava num arquivo local)
+from repositorio import criar_repositorio, RepositorioMemoria, REPOSITORIO_CONFIG
+# Janela de resultados paginada (ttk.Treeview) usada nas buscas de pagamentos/audiências
+from navegador_resultados import NavegadorResultados, COLUNAS_PAGAMENTOS, COLUNAS_AUDIENCIAS, linha_pagamento, linha_audiencia
+from janela_busca_nomes import JanelaBuscaNomes
+from janela_agenda import JanelaAgenda
+from janela_visao_cliente import JanelaVisaoCliente
 
 # --- CLASSE BaseDialog E SUAS SUBCLASSES (INSERIDAS DIRETAMENTE AQUI) ---
 class BaseDialog(tk.Toplevel):
@@ -118,7 +127,10 @@ class PagamentoDialog(BaseDialog):
         fields = [
             ("CPF do Cliente", "cliente_cpf", "", "str"),
             ("Valor", "valor", "", "float"),
-            ("Descrição", "descricao", "", "str")
+            ("Descrição", "descricao", "", "str"),
+            # Sem data de pagamento e com vencimento, o pagamento fica em aberto
+            ("Vencimento (DD/MM/AAAA)", "data_vencimento", "", "optional"),
+            ("Pago em (DD/MM/AAAA)", "data_pagamento", datetime.now().strftime('%d/%m/%Y'), "optional")
         ]
         self.entries_labels = {f[1]: f[0] for f in fields}
         super().__init__(parent, "Registrar Pagamento", fields)
@@ -127,7 +139,6 @@ class AudienciaDialog(BaseDialog):
     def __init__(self, parent):
         fields = [
             ("Número do Processo", "processo_numero", "", "str"),
-            ("CPF do Cliente", "cliente_cpf", "", "str"),
             ("Data e Hora (DD/MM/AAAA HH:MM)", "data_hora", "", "str"),
             ("Local", "local", "", "str"),
             ("Tipo", "tipo", "", "str")
@@ -137,22 +148,30 @@ class AudienciaDialog(BaseDialog):
 
 # --- FIM DAS CLASSES DE DIÁLOGO ---
 
+def repositorio_padrao():
+    """Em memória, com os dados guardados no snapshot ('snapshot.py') e no diário de alterações entre uma execução e outra."""
+    if (REPOSITORIO_CONFIG['backend'] or "memoria") == "memoria":
+        return RepositorioMemoria(caminho_snapshot=REPOSITORIO_CONFIG['snapshot_memoria'],
+                                  caminho_diario=REPOSITORIO_CONFIG['diario_memoria'])
+    return criar_repositorio("memoria")
+
 class SistemaJuridicoAcaoGUI:
-    def __init__(self, master):
+    def __init__(self, master, repo=None):
         self.master = master
         master.title("Sistema Jurídico - Ação Rápida")
         master.geometry("450x300") 
 
-        # ESTES SÃO OS ARMAZENAMENTOS DE DADOS ONDE OS OBJETOS SÃO SALVOS.
-        # Eles precisam ser acessados corretamente para que a busca funcione.
-        self.data_stores = {
-            "clientes": {},  # CPF como chave
-            "processos": {}, # Numero como chave
-            "pagamentos": [],
-            "audiencias": []
-        }
+        # REPOSITÓRIO ONDE OS OBJETOS SÃO SALVOS.
+        # Em memória, clientes ficam por CPF e processos por número; pagamentos
+        # e audiências têm índices por CPF/processo, então as buscas não percorrem tudo.
+        self.repo = repo if repo is not None else repositorio_padrao()
 
         self.setup_ui()
+        master.protocol("WM_DELETE_WINDOW", self._on_fechar)
+
+    def _on_fechar(self):
+        self.repo.fechar()
+        self.master.destroy()
 
     def setup_ui(self):
         self.main_frame = tk.Frame(self.master, padx=20, pady=20)
@@ -173,23 +192,27 @@ class SistemaJuridicoAcaoGUI:
         tk.Button(self.main_frame, text="6. Buscar Processo", command=self.buscar_processo_dialog, width=30).pack(pady=3)
         tk.Button(self.main_frame, text="7. Buscar Pagamento", command=self.buscar_pagamento_dialog, width=30).pack(pady=3)
         tk.Button(self.main_frame, text="8. Buscar Audiência", command=self.buscar_audiencia_dialog, width=30).pack(pady=3)
+        tk.Button(self.main_frame, text="9. Buscar Cliente por Nome", command=self.buscar_cliente_por_nome, width=30).pack(pady=3)
+        tk.Button(self.main_frame, text="10. Agenda de Audiências", command=self.ver_agenda, width=30).pack(pady=3)
+        tk.Button(self.main_frame, text="11. Visão Completa do Cliente", command=self.ver_visao_cliente, width=30).pack(pady=3)
 
     # --- Métodos para Adicionar ---
+    # As validações (CPF/processo duplicado, cliente ou processo inexistente)
+    # ficam no repositório, que lança os erros de cadastro do modelo.
     def adicionar_cliente_gui(self):
         dialog = ClienteDialog(self.master)
         data = dialog.show()
         
         if data:
-            if data["cpf"] in self.data_stores["clientes"]:
-                messagebox.showwarning("Erro", f"Cliente com CPF '{data['cpf']}' já existe.")
-                return
-
             try:
                 cliente = ClienteConcreto(data["nome"], data["cpf"], data["idade"], 
                                          data["telefone"], data["endereco"], data["email"])
-                # CORREÇÃO AQUI: Adiciona o objeto cliente ao data_stores
-                self.data_stores["clientes"][data["cpf"]] = cliente
-                messagebox.showinfo("Sucesso", f"Cliente '{data['nome']}' adicionado!")
+                if self.repo.add_cliente(cliente):
+                    messagebox.showinfo("Sucesso", f"Cliente '{data['nome']}' adicionado!")
+                else:
+                    messagebox.showerror("Erro", "Não foi possível gravar o cliente. Verifique o console.")
+            except ErroCadastro as e:
+                messagebox.showwarning("Erro", str(e))
             except Exception as e:
                 messagebox.showerror("Erro", f"Erro ao adicionar cliente: {e}")
 
@@ -198,18 +221,16 @@ class SistemaJuridicoAcaoGUI:
         data = dialog.show()
 
         if data:
-            if data["numero"] in self.data_stores["processos"]:
-                messagebox.showwarning("Erro", f"Processo com número '{data['numero']}' já existe.")
-                return
-            if data["cliente_cpf"] not in self.data_stores["clientes"]:
-                messagebox.showwarning("Erro", f"Cliente com CPF '{data['cliente_cpf']}' não encontrado. Adicione-o primeiro.")
-                return
-
             try:
                 processo = ProcessoConcreto(data["numero"], data["descricao"], data["cliente_cpf"])
-                # CORREÇÃO AQUI: Adiciona o objeto processo ao data_stores
-                self.data_stores["processos"][data["numero"]] = processo
-                messagebox.showinfo("Sucesso", f"Processo '{data['numero']}' adicionado!")
+                if self.repo.add_processo(processo):
+                    messagebox.showinfo("Sucesso", f"Processo '{data['numero']}' adicionado!")
+                else:
+                    messagebox.showerror("Erro", "Não foi possível gravar o processo. Verifique o console.")
+            except ClienteNotFound as e:
+                messagebox.showwarning("Erro", f"{e} Adicione-o primeiro.")
+            except ErroCadastro as e:
+                messagebox.showwarning("Erro", str(e))
             except Exception as e:
                 messagebox.showerror("Erro", f"Erro ao adicionar processo: {e}")
 
@@ -218,15 +239,20 @@ class SistemaJuridicoAcaoGUI:
         data = dialog.show()
 
         if data:
-            if data["cliente_cpf"] not in self.data_stores["clientes"]:
-                messagebox.showwarning("Erro", f"Cliente com CPF '{data['cliente_cpf']}' não encontrado.")
+            try:
+                datas = [datetime.strptime(data[campo], '%d/%m/%Y').date() if data[campo] else None
+                         for campo in ("data_vencimento", "data_pagamento")]
+            except ValueError:
+                messagebox.showwarning("Formato Inválido", "Formato de data inválido. Use DD/MM/AAAA")
                 return
-            
             try:
-                pagamento = PagamentoConcreto(data["cliente_cpf"], data["valor"], data["descricao"])
-                # CORREÇÃO AQUI: Adiciona o objeto pagamento ao data_stores
-                self.data_stores["pagamentos"].append(pagamento)
-                messagebox.showinfo("Sucesso", "Pagamento registrado!")
+                pagamento = PagamentoConcreto(data["cliente_cpf"], data["valor"], data["descricao"], None, *datas)
+                if self.repo.add_pagamento(pagamento):
+                    messagebox.showinfo("Sucesso", "Pagamento registrado!")
+                else:
+                    messagebox.showerror("Erro", "Não foi possível gravar o pagamento. Verifique o console.")
+            except ErroCadastro as e:
+                messagebox.showwarning("Erro", str(e))
             except Exception as e:
                 messagebox.showerror("Erro", f"Erro ao registrar pagamento: {e}")
 
@@ -235,40 +261,58 @@ class SistemaJuridicoAcaoGUI:
         data = dialog.show()
 
         if data:
-            if data["processo_numero"] not in self.data_stores["processos"]:
-                messagebox.showwarning("Erro", f"Processo com número '{data['processo_numero']}' não encontrado.")
-                return
-            if data["cliente_cpf"] not in self.data_stores["clientes"]:
-                messagebox.showwarning("Erro", f"Cliente com CPF '{data['cliente_cpf']}' não encontrado.")
-                return
-
             try:
-                audiencia = AudienciaConcreta(data["processo_numero"], data["data_hora"], 
-                                             data["local"], data["tipo"], data["cliente_cpf"])
-                # CORREÇÃO AQUI: Adiciona o objeto audiencia ao data_stores
-                self.data_stores["audiencias"].append(audiencia)
-                messagebox.showinfo("Sucesso", "Audiência agendada!")
+                data_hora = datetime.strptime(data["data_hora"], '%d/%m/%Y %H:%M')
+            except ValueError:
+                messagebox.showwarning("Formato Inválido", "Formato de data/hora inválido. Use DD/MM/AAAA HH:MM"); return
+            try:
+                # O CPF do cliente é o do processo (preenchido pelo repositório, que também recusa horário ocupado)
+                audiencia = AudienciaConcreta(data["processo_numero"], data_hora,
+                                             data["local"], data["tipo"], None)
+                if self.repo.add_audiencia(audiencia):
+                    messagebox.showinfo("Sucesso", "Audiência agendada!")
+                else:
+                    messagebox.showerror("Erro", "Não foi possível gravar a audiência. Verifique o console.")
+            except ErroCadastro as e:
+                messagebox.showwarning("Erro", str(e))
             except Exception as e:
                 messagebox.showerror("Erro", f"Erro ao agendar audiência: {e}")
 
-    # --- Métodos de Busca (acessam os data_stores agora populados) ---
+    # --- Métodos de Busca (consultam o repositório) ---
     def buscar_cliente_dialog(self):
         cpf_busca = simpledialog.askstring("Buscar Cliente", "Digite o CPF do cliente a buscar:")
         if not cpf_busca: return
 
-        # Acessa o dicionário clientes em data_stores
-        cliente = self.data_stores["clientes"].get(cpf_busca)
+        # Busca o cliente pela chave primária (CPF)
+        cliente = self.repo.find_cliente_by_cpf(cpf_busca)
         if cliente:
             messagebox.showinfo("Cliente Encontrado", cliente.obter_detalhes_completos())
         else:
             messagebox.showinfo("Cliente Não Encontrado", f"Cliente com CPF '{cpf_busca}' não encontrado.")
 
+    def buscar_cliente_por_nome(self):
+        # Busca enquanto digita; escolher um nome mostra os detalhes do cliente
+        def mostrar(cpf):
+            cliente = self.repo.find_cliente_by_cpf(cpf)
+            if cliente: messagebox.showinfo("Cliente Encontrado", cliente.obter_detalhes_completos(), parent=janela)
+        janela = JanelaBuscaNomes(self.master, self.repo.buscar_clientes_por_nome, mostrar)
+
+    def ver_agenda(self):
+        # Semana a semana, lida da agenda em memória do repositório
+        JanelaAgenda(self.master, self.repo.agenda_entre)
+
+    def ver_visao_cliente(self):
+        cpf_busca = simpledialog.askstring("Visão Completa do Cliente", "Digite o CPF do cliente:")
+        if not cpf_busca: return
+        # Dados, processos, pagamentos e audiências do cliente numa só janela
+        JanelaVisaoCliente(self.master, self.repo.visao_cliente_by_cpf, cpf_busca)
+
     def buscar_processo_dialog(self):
         numero_busca = simpledialog.askstring("Buscar Processo", "Digite o número do processo a buscar:")
         if not numero_busca: return
 
-        # Acessa o dicionário processos em data_stores
-        processo = self.data_stores["processos"].get(numero_busca)
+        # Busca o processo pela chave primária (número)
+        processo = self.repo.find_processo_by_numero(numero_busca)
         if processo:
             messagebox.showinfo("Processo Encontrado", processo.obter_detalhes_completos())
         else:
@@ -278,33 +322,19 @@ class SistemaJuridicoAcaoGUI:
         cliente_cpf_busca = simpledialog.askstring("Buscar Pagamento", "Digite o CPF do cliente para buscar pagamentos:")
         if not cliente_cpf_busca: return
 
-        # Itera sobre a lista de pagamentos em data_stores
-        pagamentos_encontrados = [p for p in self.data_stores["pagamentos"] if p.cliente_cpf == cliente_cpf_busca]
-
-        if pagamentos_encontrados:
-            list_str = f"--- Pagamentos para CPF: {cliente_cpf_busca} ---\n\n"
-            for i, pagamento in enumerate(pagamentos_encontrados):
-                list_str += f"Pagamento #{i+1}:\n{pagamento.obter_detalhes_completos()}\n"
-                list_str += "-" * 40 + "\n"
-            messagebox.showinfo("Pagamentos Encontrados", list_str)
-        else:
-            messagebox.showinfo("Pagamento Não Encontrado", f"Nenhum pagamento encontrado para o CPF '{cliente_cpf_busca}'.")
+        # Busca por CPF, exibindo os resultados em páginas conforme a rolagem
+        NavegadorResultados(self.master, f"Pagamentos do CPF {cliente_cpf_busca}", COLUNAS_PAGAMENTOS,
+                            lambda apos, limite: self.repo.find_pagamentos_by_cpf(cliente_cpf_busca, apos, limite),
+                            linha_pagamento, lambda p: p.id_pagamento)
 
     def buscar_audiencia_dialog(self):
         processo_numero_busca = simpledialog.askstring("Buscar Audiência", "Digite o número do processo para buscar audiências:")
         if not processo_numero_busca: return
 
-        # Itera sobre a lista de audiencias em data_stores
-        audiencias_encontradas = [a for a in self.data_stores["audiencias"] if a.processo_numero == processo_numero_busca]
-
-        if audiencias_encontradas:
-            list_str = f"--- Audiências para Processo: {processo_numero_busca} ---\n\n"
-            for i, audiencia in enumerate(audiencias_encontradas):
-                list_str += f"Audiência #{i+1}:\n{audiencia.obter_detalhes_completos()}\n"
-                list_str += "-" * 40 + "\n"
-            messagebox.showinfo("Audiências Encontradas", list_str)
-        else:
-            messagebox.showinfo("Audiência Não Encontrada", f"Nenhuma audiência encontrada para o Processo '{processo_numero_busca}'.")
+        # Busca por número do processo, também em páginas
+        NavegadorResultados(self.master, f"Audiências do Processo {processo_numero_busca}", COLUNAS_AUDIENCIAS,
+                            lambda apos, limite: self.repo.find_audiencias_by_processo(processo_numero_busca, apos, limite),
+                            linha_audiencia, lambda a: a.id_audiencia)
 
 # --- Execução da Aplicação Tkinter ---
 if __name__ == "__main__":
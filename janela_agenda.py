@@ -0,0 +1,121 @@
+# janela_agenda.py
+# =====================================================================
+# JANELA DA AGENDA DE AUDIÊNCIAS (UMA SEMANA POR VEZ)
+# Mostra as audiências de uma semana, opcionalmente de um só local, lidas
+# da agenda em memória do repositório (repo.agenda_entre), e permite
+# avançar/voltar semana a semana.
+# =====================================================================
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import datetime, timedelta
+
+COLUNAS_AGENDA = [("Data/Hora", 130), ("Local", 180), ("Tipo", 130), ("Processo", 110), ("CPF do Cliente", 120)]
+
+def linha_agenda(audiencia):
+    return (f"{audiencia.data_hora:%a %d/%m/%Y %H:%M}", audiencia.local, audiencia.tipo,
+            audiencia.processo_numero, audiencia.cliente_cpf)
+
+def inicio_da_semana(dia):
+    """Segunda-feira 00:00 da semana de 'dia' (date ou datetime)."""
+    dia = datetime(dia.year, dia.month, dia.day)
+    return dia - timedelta(days=dia.weekday())
+
+
+class JanelaAgenda(tk.Toplevel):
+    """Janela com as audiências de uma semana.
+
+    - consultar(inicio, fim, local): retorna as audiências com data/hora em
+      [inicio, fim), em ordem, ex.: repo.agenda_entre.
+    - executor (opcional): ExecutorTarefas para consultar fora da thread do
+      Tkinter (a primeira consulta pode montar a agenda a partir do banco).
+    - acao (opcional): nome da ação da interface nas medições de cada consulta.
+    """
+
+    def __init__(self, parent, consultar, executor=None, acao=None):
+        super().__init__(parent)
+        self.title("Agenda de Audiências")
+        self.geometry(f"720x420+{parent.winfo_x() + 50}+{parent.winfo_y() + 50}")
+        self.consultar = consultar
+        self.executor = executor
+        self.acao = acao
+        self.semana = inicio_da_semana(datetime.now())
+        self.objetos = {}
+        self._tarefa = None
+
+        filtros = tk.Frame(self)
+        filtros.pack(fill="x", padx=5, pady=5)
+        tk.Button(filtros, text="<", width=3, command=lambda: self._mudar_semana(-1)).pack(side=tk.LEFT)
+        self.semana_label = tk.Label(filtros, width=26)
+        self.semana_label.pack(side=tk.LEFT)
+        tk.Button(filtros, text=">", width=3, command=lambda: self._mudar_semana(1)).pack(side=tk.LEFT)
+        tk.Label(filtros, text="Local:").pack(side=tk.LEFT, padx=(15, 2))
+        self.local = tk.StringVar()
+        campo_local = tk.Entry(filtros, textvariable=self.local, width=25)
+        campo_local.pack(side=tk.LEFT)
+        campo_local.bind("<Return>", lambda event: self._carregar())
+        tk.Button(filtros, text="Filtrar", command=self._carregar).pack(side=tk.LEFT, padx=5)
+
+        frame = tk.Frame(self)
+        frame.pack(expand=True, fill="both", padx=5)
+        nomes = [f"c{i}" for i in range(len(COLUNAS_AGENDA))]
+        self.tabela = ttk.Treeview(frame, columns=nomes, show="headings")
+        for nome, (texto, largura) in zip(nomes, COLUNAS_AGENDA):
+            self.tabela.heading(nome, text=texto)
+            self.tabela.column(nome, width=largura, anchor="w")
+        barra = ttk.Scrollbar(frame, orient="vertical", command=self.tabela.yview)
+        self.tabela.configure(yscrollcommand=barra.set)
+        self.tabela.pack(side=tk.LEFT, expand=True, fill="both")
+        barra.pack(side=tk.RIGHT, fill="y")
+        self.tabela.bind("<Double-1>", self._mostrar_detalhes)
+
+        self.status_label = tk.Label(self, text="Carregando...", anchor="w")
+        self.status_label.pack(fill="x", padx=5, pady=5)
+        self.protocol("WM_DELETE_WINDOW", self._on_fechar)
+        self._carregar()
+
+    def _mudar_semana(self, passo):
+        self.semana += timedelta(weeks=passo)
+        self._carregar()
+
+    def _carregar(self):
+        fim = self.semana + timedelta(weeks=1)
+        self.semana_label.config(text=f"{self.semana:%d/%m/%Y} a {fim - timedelta(days=1):%d/%m/%Y}")
+        if self._tarefa is not None:
+            self._tarefa.cancelar()
+        local = self.local.get().strip() or None
+        if self.executor is not None:
+            self._tarefa = self.executor.submeter("Carregando agenda...", self.consultar, self.semana, fim, local,
+                                                  ao_concluir=self._exibir, ao_falhar=self._falhou, acao=self.acao)
+        else:
+            try:
+                audiencias = self.consultar(self.semana, fim, local)
+            except Exception as err:
+                self._falhou(err)
+            else:
+                self._exibir(audiencias)
+
+    def _exibir(self, audiencias):
+        if not self.winfo_exists():
+            return
+        self._tarefa = None
+        self.tabela.delete(*self.tabela.get_children())
+        self.objetos = {self.tabela.insert("", tk.END, values=linha_agenda(a)): a for a in audiencias}
+        self.status_label.config(text=f"{len(audiencias)} audiência(s) na semana. Clique duas vezes para ver detalhes."
+                                 if audiencias else "Nenhuma audiência na semana.")
+
+    def _falhou(self, err):
+        self._tarefa = None
+        if self.winfo_exists():
+            self.status_label.config(text="Erro ao carregar a agenda.")
+            messagebox.showerror("Erro", f"Erro ao carregar a agenda: {err}", parent=self)
+
+    def _mostrar_detalhes(self, event=None):
+        selecionado = self.tabela.focus()
+        if selecionado in self.objetos:
+            messagebox.showinfo("Detalhes", self.objetos[selecionado].obter_detalhes_completos(), parent=self)
+
+    def _on_fechar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancelar()
+        self.destroy()
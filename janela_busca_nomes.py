@@ -0,0 +1,134 @@
+# janela_busca_nomes.py
+# =====================================================================
+# BUSCA DE CLIENTES POR NOME ENQUANTO SE DIGITA
+# Janela com um campo de texto e a lista dos clientes mais parecidos com
+# o que foi digitado (índice de 'indice_nomes.py', pelo repositório). A
+# busca só é feita depois de uma pequena pausa na digitação, e respostas
+# que chegam atrasadas (de um texto já alterado) são descartadas.
+# =====================================================================
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+COLUNAS_NOMES = [("Nome", 320), ("CPF", 140)]
+
+
+class JanelaBuscaNomes(tk.Toplevel):
+    """Janela de busca de clientes por nome.
+
+    - buscar(texto, limite): retorna tuplas (cpf, nome, pontuação), ex.:
+      repo.buscar_clientes_por_nome.
+    - ao_escolher(cpf): chamada com o CPF da linha escolhida (duplo clique ou Enter).
+    - executor (opcional): ExecutorTarefas para buscar fora da thread do
+      Tkinter; sem ele, a busca é feita diretamente (índice já em memória).
+    - acao (opcional): nome da ação da interface nas medições de cada busca.
+    """
+
+    def __init__(self, parent, buscar, ao_escolher, executor=None, acao=None, limite=20, atraso_ms=150):
+        super().__init__(parent)
+        self.title("Buscar Cliente por Nome")
+        self.geometry(f"500x380+{parent.winfo_x() + 50}+{parent.winfo_y() + 50}")
+        self.buscar = buscar
+        self.ao_escolher = ao_escolher
+        self.executor = executor
+        self.acao = acao
+        self.limite = limite
+        self.atraso_ms = atraso_ms
+        self._agendada = None   # id do after() da próxima busca
+        self._sequencia = 0     # Só a resposta da busca mais recente é exibida
+        self._tarefa = None
+
+        self.texto = tk.StringVar()
+        campo = tk.Entry(self, textvariable=self.texto, width=50)
+        campo.pack(fill="x", padx=5, pady=5)
+        campo.focus_set()
+        self.texto.trace_add("write", lambda *_: self._agendar())
+
+        frame = tk.Frame(self)
+        frame.pack(expand=True, fill="both", padx=5)
+        nomes = [f"c{i}" for i in range(len(COLUNAS_NOMES))]
+        self.tabela = ttk.Treeview(frame, columns=nomes, show="headings", selectmode="browse")
+        for nome, (texto, largura) in zip(nomes, COLUNAS_NOMES):
+            self.tabela.heading(nome, text=texto)
+            self.tabela.column(nome, width=largura, anchor="w")
+        barra = ttk.Scrollbar(frame, orient="vertical", command=self.tabela.yview)
+        self.tabela.configure(yscrollcommand=barra.set)
+        self.tabela.pack(side=tk.LEFT, expand=True, fill="both")
+        barra.pack(side=tk.RIGHT, fill="y")
+        self.tabela.bind("<Double-1>", self._escolher)
+        self.tabela.bind("<Return>", self._escolher)
+        campo.bind("<Return>", self._escolher)
+        campo.bind("<Down>", self._ir_para_lista)
+
+        self.status_label = tk.Label(self, text="Digite parte do nome do cliente.", anchor="w")
+        self.status_label.pack(fill="x", padx=5, pady=5)
+        self.protocol("WM_DELETE_WINDOW", self._on_fechar)
+
+    # --- Busca ---
+
+    def _agendar(self):
+        # Cada tecla reinicia a espera: só busca quando a digitação pausa
+        if self._agendada is not None:
+            self.after_cancel(self._agendada)
+        self._agendada = self.after(self.atraso_ms, self._buscar)
+
+    def _buscar(self):
+        self._agendada = None
+        self._sequencia += 1
+        sequencia, texto = self._sequencia, self.texto.get().strip()
+        if self._tarefa is not None:
+            self._tarefa.cancelar()
+            self._tarefa = None
+        if not texto:
+            self._exibir(sequencia, []); return
+        if self.executor is not None:
+            self._tarefa = self.executor.submeter(f"Buscando '{texto}'...", self.buscar, texto, self.limite,
+                                                  ao_concluir=lambda r: self._exibir(sequencia, r),
+                                                  ao_falhar=self._falhou, acao=self.acao)
+        else:
+            try:
+                resultados = self.buscar(texto, self.limite)
+            except Exception as err:
+                self._falhou(err)
+            else:
+                self._exibir(sequencia, resultados)
+
+    def _exibir(self, sequencia, resultados):
+        if sequencia != self._sequencia or not self.winfo_exists():
+            return  # Resposta de um texto que já mudou
+        self._tarefa = None
+        self.tabela.delete(*self.tabela.get_children())
+        for cpf, nome, _ in resultados:
+            self.tabela.insert("", tk.END, iid=cpf, values=(nome, cpf))
+        if resultados:
+            self.status_label.config(text=f"{len(resultados)} cliente(s). Clique duas vezes ou Enter para ver detalhes.")
+        else:
+            self.status_label.config(text="Nenhum cliente encontrado." if self.texto.get().strip()
+                                     else "Digite parte do nome do cliente.")
+
+    def _falhou(self, err):
+        self._tarefa = None
+        if self.winfo_exists():
+            self.status_label.config(text="Erro ao buscar clientes.")
+            messagebox.showerror("Erro", f"Erro ao buscar clientes: {err}", parent=self)
+
+    # --- Escolha ---
+
+    def _ir_para_lista(self, event=None):
+        linhas = self.tabela.get_children()
+        if linhas:
+            self.tabela.focus_set()
+            self.tabela.focus(linhas[0])
+            self.tabela.selection_set(linhas[0])
+
+    def _escolher(self, event=None):
+        selecionado = self.tabela.focus() or next(iter(self.tabela.get_children()), None)
+        if selecionado:
+            self.ao_escolher(selecionado)
+
+    def _on_fechar(self):
+        if self._agendada is not None:
+            self.after_cancel(self._agendada)
+        if self._tarefa is not None:
+            self._tarefa.cancelar()
+        self.destroy()
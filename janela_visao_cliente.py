@@ -0,0 +1,107 @@
+# janela_visao_cliente.py
+# =====================================================================
+# JANELA DA VISÃO COMPLETA DO CLIENTE
+# Mostra os dados do cliente e, em abas, os seus processos, pagamentos e
+# audiências, tudo lido de uma vez pelo repositório
+# (repo.visao_cliente_by_cpf, uma só consulta; ver 'visao_cliente.py').
+# =====================================================================
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from navegador_resultados import COLUNAS_PAGAMENTOS, linha_pagamento
+
+COLUNAS_PROCESSOS = [("Número", 140), ("Descrição", 420), ("Audiências", 90)]
+COLUNAS_AUDIENCIAS_CLIENTE = [("Data/Hora", 130), ("Processo", 140), ("Local", 200), ("Tipo", 150)]
+
+def linha_audiencia_cliente(audiencia):
+    return (f"{audiencia.data_hora:%d/%m/%Y %H:%M}", audiencia.processo_numero, audiencia.local, audiencia.tipo)
+
+
+class JanelaVisaoCliente(tk.Toplevel):
+    """Janela com tudo de um cliente: dados, processos, pagamentos e audiências.
+
+    - buscar_visao(cpf): retorna a VisaoCliente ou None, ex.: repo.visao_cliente_by_cpf.
+    - executor (opcional): ExecutorTarefas para buscar fora da thread do
+      Tkinter; sem ele, a busca é feita diretamente.
+    - acao (opcional): nome da ação da interface nas medições da busca.
+    """
+
+    def __init__(self, parent, buscar_visao, cpf, executor=None, acao=None):
+        super().__init__(parent)
+        self.title(f"Cliente {cpf}")
+        self.geometry(f"720x460+{parent.winfo_x() + 50}+{parent.winfo_y() + 50}")
+        self.cpf = cpf
+        self._tarefa = None
+
+        self.dados_label = tk.Label(self, text="", justify="left", anchor="w", font=("Arial", 11))
+        self.dados_label.pack(fill="x", padx=10, pady=(10, 5))
+        abas = ttk.Notebook(self)
+        abas.pack(expand=True, fill="both", padx=5)
+        self.tabelas = {}
+        for nome, titulo, colunas in (("processos", "Processos", COLUNAS_PROCESSOS),
+                                      ("pagamentos", "Pagamentos", COLUNAS_PAGAMENTOS),
+                                      ("audiencias", "Audiências", COLUNAS_AUDIENCIAS_CLIENTE)):
+            frame = tk.Frame(abas)
+            abas.add(frame, text=titulo)
+            self.tabelas[nome] = self._criar_tabela(frame, colunas)
+        self.abas = abas
+
+        self.status_label = tk.Label(self, text=f"Buscando o cliente {cpf}...", anchor="w")
+        self.status_label.pack(fill="x", padx=5, pady=5)
+        self.protocol("WM_DELETE_WINDOW", self._on_fechar)
+
+        if executor is not None:
+            self._tarefa = executor.submeter(f"Buscando cliente {cpf}...", buscar_visao, cpf,
+                                             ao_concluir=self._exibir, ao_falhar=self._falhou, acao=acao)
+        else:
+            try:
+                visao = buscar_visao(cpf)
+            except Exception as err:
+                self._falhou(err)
+            else:
+                self._exibir(visao)
+
+    def _criar_tabela(self, frame, colunas):
+        nomes = [f"c{i}" for i in range(len(colunas))]
+        tabela = ttk.Treeview(frame, columns=nomes, show="headings")
+        for nome, (texto, largura) in zip(nomes, colunas):
+            tabela.heading(nome, text=texto)
+            tabela.column(nome, width=largura, anchor="w")
+        barra = ttk.Scrollbar(frame, orient="vertical", command=tabela.yview)
+        tabela.configure(yscrollcommand=barra.set)
+        tabela.pack(side=tk.LEFT, expand=True, fill="both")
+        barra.pack(side=tk.RIGHT, fill="y")
+        return tabela
+
+    def _exibir(self, visao):
+        self._tarefa = None
+        if not self.winfo_exists():
+            return
+        if visao is None:
+            self.status_label.config(text="Cliente não encontrado.")
+            messagebox.showinfo("Não Encontrado", f"Cliente com CPF '{self.cpf}' não foi encontrado.", parent=self)
+            self.destroy(); return
+        self.title(f"Cliente {visao.cliente.nome} ({visao.cliente.cpf})")
+        self.dados_label.config(text=visao.cliente.obter_detalhes_completos())
+        for processo in visao.processos:
+            self.tabelas["processos"].insert("", tk.END, values=(processo.numero, processo.descricao,
+                                                                 len(visao.audiencias_do_processo(processo.numero))))
+        for pagamento in visao.pagamentos:
+            self.tabelas["pagamentos"].insert("", tk.END, values=linha_pagamento(pagamento))
+        for audiencia in visao.audiencias:
+            self.tabelas["audiencias"].insert("", tk.END, values=linha_audiencia_cliente(audiencia))
+        for indice, quantidade in enumerate((len(visao.processos), len(visao.pagamentos), len(visao.audiencias))):
+            self.abas.tab(indice, text=f"{self.abas.tab(indice, 'text')} ({quantidade})")
+        self.status_label.config(text=f"Total de pagamentos: R${visao.total_pagamentos():.2f}")
+
+    def _falhou(self, err):
+        self._tarefa = None
+        if self.winfo_exists():
+            self.status_label.config(text="Erro ao buscar o cliente.")
+            messagebox.showerror("Erro", f"Erro ao buscar o cliente: {err}", parent=self)
+
+    def _on_fechar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancelar()
+        self.destroy()
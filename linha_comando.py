@@ -0,0 +1,303 @@
+# linha_comando.py
+# =====================================================================
+# LINHA DE COMANDO SEM INTERFACE GRÁFICA (ROTINAS NOTURNAS)
+# As mesmas operações das interfaces (cadastrar, buscar, listar, exportar)
+# pelo terminal, com a resposta em JSON na saída padrão. Só o que o comando
+# usa é importado: tkinter nunca, e o driver do MySQL só com o backend
+# "mysql". Mensagens de erro do repositório vão para a saída de erros,
+# para não misturar com o JSON.
+#
+# Uso:
+#   python -m linha_comando buscar cliente 12345678900
+#   python -m linha_comando buscar nome "joao silva" --limite 5
+#   python -m linha_comando adicionar clientes nome="Ana Souza" cpf=12345678900 idade=34
+#   python -m linha_comando adicionar pagamentos --jsonl pagamentos.jsonl
+#   python -m linha_comando listar pagamentos 12345678900 --limite 50
+#   python -m linha_comando listar agenda 2025-03-10 2025-03-17 --local "Fórum Central"
+#   python -m linha_comando exportar clientes --saida clientes.jsonl
+#   python -m linha_comando --backend sqlite --sqlite teste.db buscar processo 0001-00.2024
+#   python -m linha_comando partida        (mede a partida a frio contra ORCAMENTO_PARTIDA_MS)
+#
+# Backend: --backend, ou SISTEMA_JURIDICO_BACKEND, ou "mysql" (como a
+# interface com banco). Datas: AAAA-MM-DD ou DD/MM/AAAA (com HH:MM nas
+# audiências).
+# Código de saída: 0 = ok, 1 = não encontrado/recusado/acima do orçamento,
+# 2 = erro de uso.
+# =====================================================================
+
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+# Partida a frio de "buscar cliente" no SQLite: processo novo até a resposta
+ORCAMENTO_PARTIDA_MS = 300
+# Módulos que um comando de dados não deve carregar (ver o comando "partida")
+MODULOS_PESADOS = ("tkinter", "mysql.connector")
+
+TABELAS = ("clientes", "processos", "pagamentos", "audiencias")
+
+
+class ErroUso(Exception):
+    """Argumentos inválidos para o comando (código de saída 2)."""
+    pass
+
+
+# --- Conversões ---
+
+def _campos(objeto):
+    """Atributos do objeto do modelo (todos os __slots__ da hierarquia) em um dict."""
+    return {campo: getattr(objeto, campo) for classe in reversed(type(objeto).__mro__)
+            for campo in getattr(classe, "__slots__", ())}
+
+def _json_padrao(valor):
+    if hasattr(valor, "isoformat"):
+        return valor.isoformat()  # date/datetime
+    try:
+        return float(valor)  # Decimal do MySQL
+    except (TypeError, ValueError):
+        raise TypeError(f"Valor não serializável: {valor!r}")
+
+def _escrever(saida, dados):
+    saida.write(json.dumps(dados, ensure_ascii=False, default=_json_padrao) + "\n")
+
+def _texto_iso(tipo, texto):
+    """Aceita datas no formato brasileiro e devolve o texto ISO esperado pelo esquema do snapshot."""
+    from datetime import datetime
+    if texto is None or "/" not in texto or tipo not in ("date", "datetime"):
+        return texto
+    if tipo == "date":
+        return datetime.strptime(texto, "%d/%m/%Y").date().isoformat()
+    return datetime.strptime(texto, "%d/%m/%Y %H:%M").isoformat()
+
+def _montar(tabela, campos):
+    """Monta o objeto do modelo de 'tabela' a partir de {campo: valor} (valores em texto ou JSON)."""
+    from snapshot import ESQUEMA_SNAPSHOT, objeto_de_texto
+    _, colunas = ESQUEMA_SNAPSHOT[tabela]
+    desconhecidos = set(campos) - {coluna for coluna, _ in colunas}
+    if desconhecidos:
+        raise ErroUso(f"Campo(s) desconhecido(s) em {tabela}: {', '.join(sorted(desconhecidos))}.")
+    textos = []
+    for coluna, tipo in colunas:
+        valor = campos.get(coluna)
+        textos.append(None if valor in (None, "") else _texto_iso(tipo, str(valor)))
+    try:
+        return objeto_de_texto(tabela, textos)
+    except ValueError as err:
+        raise ErroUso(f"Valor inválido em {tabela}: {err}")
+
+def _campos_jsonl(texto):
+    try:
+        campos = json.loads(texto)
+    except json.JSONDecodeError as err:
+        raise ErroUso(f"JSON inválido: {err.msg}")
+    if not isinstance(campos, dict):
+        raise ErroUso("a linha não é um objeto JSON")
+    return campos
+
+def _data(texto):
+    from datetime import datetime
+    formato = "%d/%m/%Y" if "/" in texto else "%Y-%m-%d"
+    try:
+        return datetime.strptime(texto, formato)
+    except ValueError:
+        raise ErroUso(f"Data inválida: '{texto}' (use AAAA-MM-DD ou DD/MM/AAAA).")
+
+
+# --- Repositório ---
+
+def abrir_repositorio(backend=None, caminho_sqlite=None):
+    """Cria o repositório do backend pedido (importa só o necessário para ele)."""
+    from repositorio import REPOSITORIO_CONFIG
+    backend = backend or REPOSITORIO_CONFIG['backend'] or "mysql"
+    if backend == "memoria":
+        from repositorio import RepositorioMemoria
+        return RepositorioMemoria(caminho_snapshot=REPOSITORIO_CONFIG['snapshot_memoria'],
+                                  caminho_diario=REPOSITORIO_CONFIG['diario_memoria'])
+    if backend == "sqlite":
+        from repositorio import RepositorioSQLite
+        return RepositorioSQLite(caminho_sqlite)
+    if backend == "mysql":
+        from repositorio import RepositorioMySQL
+        return RepositorioMySQL()
+    raise ErroUso(f"Backend '{backend}' desconhecido.")
+
+
+# --- Comandos ---
+# Cada comando recebe (repo, args, saida) e retorna o código de saída.
+
+def cmd_adicionar(repo, args, saida):
+    from modelo_abstrato import ErroCadastro
+    adicionar = {"clientes": repo.add_cliente, "processos": repo.add_processo,
+                 "pagamentos": repo.add_pagamento, "audiencias": repo.add_audiencia}[args.tabela]
+    if args.jsonl:
+        arquivo = sys.stdin if args.jsonl == "-" else open(args.jsonl, encoding="utf-8")
+        registros = ((numero, texto) for numero, texto in enumerate(arquivo, 1) if texto.strip())
+    else:
+        campos = {}
+        for par in args.campos:
+            campo, separador, valor = par.partition("=")
+            if not separador:
+                raise ErroUso(f"Use campo=valor (recebido '{par}').")
+            campos[campo] = valor
+        if not campos:
+            raise ErroUso("Informe os campos (campo=valor ...) ou --jsonl ARQUIVO.")
+        registros = [(None, campos)]
+    inseridos, recusados, ultimo = 0, [], None
+    try:
+        for numero, campos in registros:
+            try:
+                objeto = _montar(args.tabela, _campos_jsonl(campos) if args.jsonl else campos)
+                gravou = adicionar(objeto)
+            except (ErroCadastro, ErroUso) as err:
+                if isinstance(err, ErroUso) and not args.jsonl:
+                    raise  # Um registro só: campo errado é erro de uso
+                recusados.append({"linha": numero, "erro": str(err), "tipo": type(err).__name__})
+                continue
+            if gravou:
+                inseridos += 1; ultimo = objeto
+            else:
+                recusados.append({"linha": numero, "erro": "Erro do armazenamento (ver mensagens acima).",
+                                  "tipo": "ErroArmazenamento"})
+    finally:
+        if args.jsonl and args.jsonl != "-":
+            arquivo.close()
+    if args.jsonl:
+        _escrever(saida, {"tabela": args.tabela, "inseridos": inseridos, "recusados": recusados})
+    elif recusados:
+        _escrever(saida, {"erro": recusados[0]["erro"], "tipo": recusados[0]["tipo"]})
+    else:
+        _escrever(saida, {"inserido": _campos(ultimo)})
+    return 1 if recusados else 0
+
+def cmd_buscar(repo, args, saida):
+    if args.tipo == "nome":
+        _escrever(saida, [{"cpf": cpf, "nome": nome, "pontuacao": round(pontuacao, 3)}
+                          for cpf, nome, pontuacao in repo.buscar_clientes_por_nome(args.chave, args.limite)])
+        return 0
+    buscar = repo.find_cliente_by_cpf if args.tipo == "cliente" else repo.find_processo_by_numero
+    objeto = buscar(args.chave)
+    _escrever(saida, _campos(objeto) if objeto is not None else None)
+    return 0 if objeto is not None else 1
+
+def cmd_listar(repo, args, saida):
+    if args.tipo == "agenda":
+        if args.fim is None:
+            raise ErroUso("listar agenda exige INICIO e FIM.")
+        objetos = repo.agenda_entre(_data(args.chave), _data(args.fim), args.local)
+    elif args.tipo == "pagamentos":
+        objetos = repo.find_pagamentos_by_cpf(args.chave, apos_id=args.apos_id, limite=args.limite)
+    else:
+        objetos = repo.find_audiencias_by_processo(args.chave, apos_id=args.apos_id, limite=args.limite)
+    _escrever(saida, [_campos(objeto) for objeto in objetos])
+    return 0
+
+def cmd_exportar(repo, args, saida):
+    destino = open(args.saida, "w", encoding="utf-8") if args.saida else saida
+    total = 0
+    try:
+        for objeto in repo.exportar(args.tabela, args.bloco):
+            _escrever(destino, _campos(objeto))
+            total += 1
+    finally:
+        if args.saida:
+            destino.close()
+    resumo = {"tabela": args.tabela, "registros": total, "saida": args.saida}
+    _escrever(saida if args.saida else sys.stderr, resumo)
+    return 0
+
+def cmd_partida(args, saida):
+    """Mede a partida a frio (processo novo) de 'buscar cliente' no SQLite e confere o orçamento."""
+    import subprocess
+    import tempfile
+    from statistics import median
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory(prefix="partida_") as temporaria:
+        comando = [sys.executable, "-m", "linha_comando", "--backend", "sqlite",
+                   "--sqlite", os.path.join(temporaria, "partida.db"), "--listar-modulos", "buscar", "cliente", "0"]
+        tempos, pesados = [], set()
+        for i in range(args.vezes + 1):  # A primeira cria o banco e os .pyc: não conta
+            inicio = time.perf_counter()
+            processo = subprocess.run(comando, cwd=pasta, capture_output=True, text=True)
+            decorrido = (time.perf_counter() - inicio) * 1000
+            if processo.returncode not in (0, 1):
+                raise RuntimeError(f"O comando medido falhou: {processo.stderr.strip()}")
+            pesados.update(json.loads(processo.stderr.strip().splitlines()[-1])["modulos_pesados"])
+            if i > 0: tempos.append(decorrido)
+    resultado = {"mediana_ms": round(median(tempos), 1), "maximo_ms": round(max(tempos), 1),
+                 "orcamento_ms": args.orcamento_ms, "modulos_pesados": sorted(pesados),
+                 "dentro_do_orcamento": median(tempos) <= args.orcamento_ms and not pesados}
+    _escrever(saida, resultado)
+    return 0 if resultado["dentro_do_orcamento"] else 1
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog="python -m linha_comando",
+                                     description="Operações do sistema jurídico sem interface gráfica (saída em JSON).")
+    parser.add_argument("--backend", choices=("memoria", "sqlite", "mysql"),
+                        help="Armazenamento (padrão: SISTEMA_JURIDICO_BACKEND ou mysql).")
+    parser.add_argument("--sqlite", help="Arquivo do backend sqlite (padrão: o de REPOSITORIO_CONFIG).")
+    parser.add_argument("--listar-modulos", action="store_true", help=argparse.SUPPRESS)  # Usado por "partida"
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    adicionar = comandos.add_parser("adicionar", help="Cadastra um registro (campo=valor) ou vários (--jsonl).")
+    adicionar.add_argument("tabela", choices=TABELAS)
+    adicionar.add_argument("campos", nargs="*", help="Pares campo=valor, ex.: nome='Ana' cpf=123.")
+    adicionar.add_argument("--jsonl", help="Arquivo com um objeto JSON por linha ('-' = entrada padrão).")
+
+    buscar = comandos.add_parser("buscar", help="Busca um cliente (CPF), processo (número) ou clientes por nome.")
+    buscar.add_argument("tipo", choices=("cliente", "processo", "nome"))
+    buscar.add_argument("chave", help="CPF, número do processo ou parte do nome.")
+    buscar.add_argument("--limite", type=int, default=10, help="Máximo de clientes na busca por nome.")
+
+    listar = comandos.add_parser("listar", help="Lista pagamentos de um CPF, audiências de um processo ou a agenda.")
+    listar.add_argument("tipo", choices=("pagamentos", "audiencias", "agenda"))
+    listar.add_argument("chave", help="CPF, número do processo ou data inicial da agenda.")
+    listar.add_argument("fim", nargs="?", help="Data final da agenda (exclusiva).")
+    listar.add_argument("--apos-id", type=int, help="Paginação: id do último item da página anterior.")
+    listar.add_argument("--limite", type=int, help="Paginação: tamanho da página.")
+    listar.add_argument("--local", help="Agenda: só audiências deste local.")
+
+    exportar = comandos.add_parser("exportar", help="Exporta uma tabela inteira em JSON Lines.")
+    exportar.add_argument("tabela", choices=TABELAS)
+    exportar.add_argument("--saida", help="Arquivo de destino (padrão: saída padrão).")
+    exportar.add_argument("--bloco", type=int, default=10000, help="Registros lidos do banco por vez.")
+
+    partida = comandos.add_parser("partida", help="Mede a partida a frio e compara com o orçamento.")
+    partida.add_argument("--vezes", type=int, default=5, help="Execuções medidas (vale a mediana).")
+    partida.add_argument("--orcamento-ms", type=float, default=ORCAMENTO_PARTIDA_MS,
+                         help=f"Orçamento da partida a frio em ms (padrão: {ORCAMENTO_PARTIDA_MS}).")
+    return parser
+
+
+COMANDOS = {"adicionar": cmd_adicionar, "buscar": cmd_buscar, "listar": cmd_listar, "exportar": cmd_exportar}
+
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    saida = sys.stdout
+    try:
+        if args.comando == "partida":
+            return cmd_partida(args, saida)
+        # Os prints de erro do repositório/banco vão para stderr: stdout fica só com o JSON
+        with redirect_stdout(sys.stderr):
+            import instrumentacao
+            instrumentacao.configurar_padrao()
+            repo = abrir_repositorio(args.backend, args.sqlite)
+            try:
+                return COMANDOS[args.comando](repo, args, saida)
+            finally:
+                repo.fechar()
+    except ErroUso as err:
+        parser.print_usage(sys.stderr)
+        print(f"Erro: {err}", file=sys.stderr)
+        return 2
+    finally:
+        if args.listar_modulos:
+            _escrever(sys.stderr, {"modulos_pesados": [nome for nome in MODULOS_PESADOS if nome in sys.modules]})
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+# migracoes.py
+# =====================================================================
+# MIGRAÇÕES VERSIONADAS DO BANCO 'advocacia_db'
+# Cria/atualiza as tabelas e os índices usados por 'banco_dados.py'.
+# Cada migração tem um número de versão; as já aplicadas ficam gravadas
+# na tabela 'schema_migracoes' e não rodam de novo. Os passos também são
+# idempotentes (CREATE ... IF NOT EXISTS / índice só é criado se faltar),
+# então rodar de novo num banco criado à mão é seguro.
+#
+# Uso:
+#   python migracoes.py              (aplica as migrações pendentes)
+#   python migracoes.py --status     (lista as migrações e se já foram aplicadas)
+#   python migracoes.py --verificar  (roda EXPLAIN nas buscas e falha se alguma
+#                                     fizer varredura completa de tabela)
+# =====================================================================
+
+import argparse
+import sys
+
+import banco_dados
+from banco_dados import DB_CONFIG, ERROS_BD, get_db_connection
+
+
+# --- Passos auxiliares ---
+
+def _indice_existe(cursor, tabela, colunas, unico=False):
+    """Verifica se já existe um índice cujas primeiras colunas são 'colunas' (na mesma ordem)."""
+    cursor.execute("""SELECT index_name, non_unique, seq_in_index, column_name
+                      FROM information_schema.statistics
+                      WHERE table_schema = DATABASE() AND table_name = %s
+                      ORDER BY index_name, seq_in_index""", (tabela,))
+    indices = {}
+    for nome, nao_unico, _, coluna in cursor.fetchall():
+        indices.setdefault(nome, {"colunas": [], "unico": not nao_unico})["colunas"].append(coluna)
+    for indice in indices.values():
+        if unico:
+            # Um índice único só atende se for único exatamente nessas colunas
+            if indice["unico"] and indice["colunas"] == list(colunas): return True
+        elif indice["colunas"][:len(colunas)] == list(colunas):
+            return True
+    return False
+
+def adicionar_coluna(tabela, coluna, definicao):
+    """Retorna um passo de migração que acrescenta a coluna apenas se ela ainda não existir."""
+    def passo(cursor):
+        cursor.execute("""SELECT COUNT(*) FROM information_schema.columns
+                          WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s""",
+                       (tabela, coluna))
+        if not cursor.fetchone()[0]:
+            cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {definicao}")
+    passo.__doc__ = f"coluna {coluna} em {tabela}"
+    return passo
+
+def criar_indice(tabela, nome, colunas, unico=False):
+    """Retorna um passo de migração que cria o índice apenas se nenhum equivalente existir."""
+    def passo(cursor):
+        if not _indice_existe(cursor, tabela, colunas, unico):
+            tipo = "UNIQUE INDEX" if unico else "INDEX"
+            cursor.execute(f"CREATE {tipo} {nome} ON {tabela} ({', '.join(colunas)})")
+    passo.__doc__ = f"{'índice único' if unico else 'índice'} {nome} em {tabela}({', '.join(colunas)})"
+    return passo
+
+def criar_gatilhos_alteracoes(tabela):
+    """Retorna um passo que (re)cria os gatilhos que anotam em 'alteracoes' cada INSERT/UPDATE/DELETE de 'tabela'.
+
+    Com o log binário ligado, criar gatilhos exige o privilégio SUPER ou
+    log_bin_trust_function_creators = 1 no servidor.
+    """
+    def passo(cursor):
+        for evento, linha in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+            nome = f"tr_{tabela}_{evento.lower()}"
+            cursor.execute(f"DROP TRIGGER IF EXISTS {nome}")
+            cursor.execute(f"""CREATE TRIGGER {nome} AFTER {evento} ON {tabela} FOR EACH ROW
+                               INSERT INTO alteracoes (tabela, registro_id, operacao)
+                               VALUES ('{tabela}', {linha}.id, '{evento[0]}')""")
+    passo.__doc__ = f"gatilhos de alterações em {tabela}"
+    return passo
+
+
+# --- Lista de migrações (versão, descrição, passos) ---
+# Passos são comandos SQL ou funções que recebem o cursor. Nunca altere uma
+# migração já publicada: crie uma nova versão no final da lista.
+
+MIGRACOES = [
+    (1, "Esquema base do advocacia_db", [
+        """CREATE TABLE IF NOT EXISTS clientes (
+               cpf VARCHAR(14) NOT NULL PRIMARY KEY,
+               nome VARCHAR(100) NOT NULL,
+               idade INT,
+               telefone VARCHAR(20),
+               endereco VARCHAR(150),
+               email VARCHAR(100)
+           )""",
+        """CREATE TABLE IF NOT EXISTS processos (
+               numero_processo VARCHAR(30) NOT NULL PRIMARY KEY,
+               cliente_cpf VARCHAR(14) NOT NULL,
+               descricao TEXT,
+               FOREIGN KEY (cliente_cpf) REFERENCES clientes(cpf)
+           )""",
+        """CREATE TABLE IF NOT EXISTS pagamentos (
+               id INT AUTO_INCREMENT PRIMARY KEY,
+               cliente_cpf VARCHAR(14) NOT NULL,
+               valor DECIMAL(12, 2) NOT NULL,
+               descricao VARCHAR(255),
+               FOREIGN KEY (cliente_cpf) REFERENCES clientes(cpf)
+           )""",
+        """CREATE TABLE IF NOT EXISTS audiencias (
+               id INT AUTO_INCREMENT PRIMARY KEY,
+               numero_processo VARCHAR(30) NOT NULL,
+               data_hora DATETIME NOT NULL,
+               local VARCHAR(150),
+               tipo VARCHAR(50),
+               FOREIGN KEY (numero_processo) REFERENCES processos(numero_processo)
+           )""",
+    ]),
+    (2, "Índices das colunas usadas nas buscas", [
+        # Chaves únicas das buscas por chave (e das validações de add_cliente/add_processo)
+        criar_indice("clientes", "ux_clientes_cpf", ["cpf"], unico=True),
+        criar_indice("processos", "ux_processos_numero", ["numero_processo"], unico=True),
+        # Índices compostos com o id: atendem o filtro e a paginação por chave (ORDER BY id)
+        criar_indice("processos", "ix_processos_cliente_cpf", ["cliente_cpf"]),
+        criar_indice("pagamentos", "ix_pagamentos_cliente_cpf_id", ["cliente_cpf", "id"]),
+        criar_indice("audiencias", "ix_audiencias_numero_processo_id", ["numero_processo", "id"]),
+    ]),
+    (3, "Vencimento e data de pagamento dos pagamentos (relatórios financeiros)", [
+        # Sem data_pagamento e com vencimento = em aberto; os pagamentos antigos ficam com as duas nulas
+        adicionar_coluna("pagamentos", "data_vencimento", "DATE NULL"),
+        adicionar_coluna("pagamentos", "data_pagamento", "DATE NULL"),
+        # Cobre os GROUP BY de 'relatorios_financeiros.py' sem ler as linhas da tabela
+        criar_indice("pagamentos", "ix_pagamentos_relatorio",
+                     ["cliente_cpf", "data_vencimento", "data_pagamento", "valor"]),
+    ]),
+    (4, "Registro de alterações de pagamentos e audiências (exportação incremental)", [
+        # Uma linha por alteração, com versão crescente; 'exportar_alteracoes.py'
+        # lê só o que veio depois da última versão exportada
+        """CREATE TABLE IF NOT EXISTS alteracoes (
+               versao BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+               tabela VARCHAR(30) NOT NULL,
+               registro_id INT NOT NULL,
+               operacao CHAR(1) NOT NULL,
+               alterado_em DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+           )""",
+        criar_indice("alteracoes", "ix_alteracoes_tabela_versao", ["tabela", "versao"]),
+        criar_gatilhos_alteracoes("pagamentos"),
+        criar_gatilhos_alteracoes("audiencias"),
+    ]),
+    (5, "Índice de data/hora das audiências (conflitos de horário)", [
+        # Faixa de horário lida com FOR UPDATE por add_audiencia: sem o índice,
+        # a leitura varreria (e travaria) a tabela inteira
+        criar_indice("audiencias", "ix_audiencias_data_hora", ["data_hora"]),
+    ]),
+]
+
+
+# --- Execução ---
+
+def _garantir_tabela_controle(cursor):
+    cursor.execute("""CREATE TABLE IF NOT EXISTS schema_migracoes (
+                          versao INT NOT NULL PRIMARY KEY,
+                          descricao VARCHAR(200) NOT NULL,
+                          aplicada_em DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+                      )""")
+
+def versoes_aplicadas():
+    """Retorna o conjunto de versões já registradas em 'schema_migracoes'."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        _garantir_tabela_controle(cursor)
+        cursor.execute("SELECT versao FROM schema_migracoes")
+        versoes = {linha[0] for linha in cursor.fetchall()}
+        cursor.close()
+    return versoes
+
+def aplicar_migracoes():
+    """Aplica, em ordem, as migrações ainda não registradas e retorna as versões aplicadas."""
+    aplicadas = versoes_aplicadas()
+    novas = []
+    for versao, descricao, passos in MIGRACOES:
+        if versao in aplicadas:
+            continue
+        print(f"Aplicando migração {versao}: {descricao}...")
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            for passo in passos:
+                if callable(passo): passo(cursor)
+                else: cursor.execute(passo)
+            cursor.execute("INSERT INTO schema_migracoes (versao, descricao) VALUES (%s, %s)", (versao, descricao))
+            conn.commit(); cursor.close()
+        novas.append(versao)
+    return novas
+
+
+# --- Verificação dos planos de execução das buscas ---
+
+def _paginada(sql, campo_id, params):
+    """Acrescenta à consulta o mesmo trecho de paginação por chave que banco_dados usa."""
+    pagina_sql, pagina_params = banco_dados._clausula_pagina(campo_id, 0, 100)
+    return sql + pagina_sql, (*params, *pagina_params)
+
+# Consulta -> (SQL, parâmetros de exemplo).
+CONSULTAS_VERIFICADAS = {
+    "find_cliente_by_cpf": (banco_dados.SQL_FIND_CLIENTE, ("00000000000",)),
+    "find_processo_by_numero": (banco_dados.SQL_FIND_PROCESSO, ("0000000-00.0000",)),
+    "find_clientes_by_cpfs": (banco_dados.SQL_FIND_CLIENTES.format(marcadores="%s, %s"),
+                              ("00000000000", "11111111111")),
+    "find_processos_by_numeros": (banco_dados.SQL_FIND_PROCESSOS.format(marcadores="%s, %s"),
+                                  ("0000000-00.0000", "1111111-11.1111")),
+    "find_processos_by_cpf": (banco_dados.SQL_FIND_PROCESSOS_CPF, ("00000000000",)),
+    "visao_cliente_by_cpf": (banco_dados.visao_cliente.SQL_VISAO_CLIENTE,
+                             banco_dados.visao_cliente.parametros_visao("00000000000")),
+    "find_pagamentos_by_cpf": (banco_dados.SQL_FIND_PAGAMENTOS, ("00000000000",)),
+    "find_pagamentos_by_cpf (página)": _paginada(banco_dados.SQL_FIND_PAGAMENTOS, "id", ("00000000000",)),
+    "find_audiencias_by_processo": (banco_dados.SQL_FIND_AUDIENCIAS, ("0000000-00.0000",)),
+    "find_audiencias_by_processo (página)": _paginada(banco_dados.SQL_FIND_AUDIENCIAS, "a.id", ("0000000-00.0000",)),
+    "add_audiencia (conflitos de horário)": (banco_dados.SQL_AUDIENCIAS_NA_FAIXA,
+                                             ("2000-01-01 08:00:00", "2000-01-01 10:00:00")),
+}
+
+def verificar_planos(consultas=None):
+    """Roda EXPLAIN em cada consulta de busca e retorna a lista de problemas (varredura completa = type ALL)."""
+    problemas = []
+    with get_db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        for nome, (sql, params) in (consultas or CONSULTAS_VERIFICADAS).items():
+            cursor.execute("EXPLAIN " + sql, params)
+            for linha in cursor.fetchall():
+                tipo = (linha.get("type") or "").upper()
+                if tipo == "ALL":
+                    problemas.append(f"{nome}: varredura completa na tabela '{linha.get('table')}' "
+                                     f"(chaves possíveis: {linha.get('possible_keys')}).")
+        cursor.close()
+    return problemas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=f"Migrações do banco '{DB_CONFIG['database']}'.")
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument("--status", action="store_true", help="Lista as migrações e se já foram aplicadas.")
+    grupo.add_argument("--verificar", action="store_true", help="Verifica com EXPLAIN se as buscas usam índices.")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.status:
+            aplicadas = versoes_aplicadas()
+            for versao, descricao, _ in MIGRACOES:
+                print(f"{versao:>4}  {'aplicada' if versao in aplicadas else 'pendente':<9} {descricao}")
+            return 0
+        if args.verificar:
+            problemas = verificar_planos()
+            for problema in problemas:
+                print(f"FALHA: {problema}")
+            if problemas:
+                return 1
+            print(f"OK: {len(CONSULTAS_VERIFICADAS)} consultas de busca usam índices.")
+            return 0
+        novas = aplicar_migracoes()
+        print(f"{len(novas)} migração(ões) aplicada(s)." if novas else "O banco já está atualizado.")
+        return 0
+    except ERROS_BD as err:
+        print(f"Erro ao executar as migrações: {err}")
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
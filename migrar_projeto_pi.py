@@ -0,0 +1,325 @@
+# migrar_projeto_pi.py
+# =====================================================================
+# MIGRAÇÃO DO BANCO ANTIGO 'projeto_pi' PARA O 'advocacia_db'
+# Copia os dados do esquema de 'Projeto_PI Prof° Rodrigo.sql' (usado por
+# 'conexao_sql_vscode') para as tabelas que 'interface_com_banco 1.py'
+# espera, em etapas na ordem das chaves estrangeiras do destino:
+# clientes -> processos -> audiências -> pagamentos.
+#
+# Cada etapa é dividida em faixas da chave da origem (id_cliente,
+# n_processo...), migradas em paralelo por um pool de processos. Cada
+# faixa roda numa transação só no destino, que grava também a faixa na
+# tabela de controle 'migracao_projeto_pi': ou a faixa entra inteira e
+# marcada como concluída, ou nada dela entra. Se a execução cair, rodar
+# de novo pula as faixas concluídas e continua das que faltam.
+#
+# Uso:
+#   python migrar_projeto_pi.py                       (migra ou continua de onde parou)
+#   python migrar_projeto_pi.py --processos 8 --faixa 50000
+#   python migrar_projeto_pi.py --status              (faixas concluídas por etapa)
+#
+# Conversões (o esquema antigo não tem tudo o que o novo pede):
+#   - id_cliente vira o CPF do cliente (chave de processos e pagamentos);
+#   - o processo antigo não tem cliente: ele vem da audiência do processo
+#     (n_processo é único em audiencias). Processos sem audiência são
+#     rejeitados; nome/status/data vão para a descrição;
+#   - a audiência antiga não tem data nem local: data_hora fica com a data
+#     do processo (00:00) e o tipo guarda o funcionário responsável, já que
+#     'funcionarios' não tem tabela correspondente no advocacia_db;
+#   - pagamentos: valor_total arredondado em centavos, parcelamentos na
+#     descrição, mesmas datas de vencimento e pagamento.
+# Os ids de audiências e pagamentos são gerados pelo destino.
+#
+# Memória constante: a origem é lida com cursor sem buffer, em blocos de
+# '--lote' linhas, e cada bloco vira um INSERT multi-linha.
+# =====================================================================
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, time as hora
+from decimal import Decimal
+
+import mysql.connector
+
+from banco_dados import DB_CONFIG, TAMANHO_LOTE_PADRAO, SQL_INSERT_CLIENTE, SQL_INSERT_PROCESSO, SQL_INSERT_PAGAMENTO
+
+# Banco antigo: mesmo servidor e usuário do advocacia_db, outro banco
+ORIGEM_CONFIG = dict(DB_CONFIG, database='projeto_pi')
+
+MIGRACAO_CONFIG = {
+    'processos': min(4, os.cpu_count() or 1),  # Processos trabalhando ao mesmo tempo
+    'faixa': 20000,                            # Chaves da origem por faixa (uma transação cada)
+    'lote': TAMANHO_LOTE_PADRAO,               # Linhas por leitura da origem e por INSERT
+}
+
+# Motivos de rejeição mostrados por faixa (o total vem na contagem)
+MAX_REJEICOES_EXIBIDAS = 20
+
+SQL_CONTROLE = """CREATE TABLE IF NOT EXISTS migracao_projeto_pi (
+                      etapa VARCHAR(30) NOT NULL,
+                      inicio BIGINT NOT NULL,
+                      fim BIGINT NOT NULL,
+                      faixa INT NOT NULL,
+                      lidas INT NOT NULL,
+                      gravadas INT NOT NULL,
+                      concluida_em DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                      PRIMARY KEY (etapa, inicio)
+                  )"""
+SQL_CONCLUIR_FAIXA = ("INSERT INTO migracao_projeto_pi (etapa, inicio, fim, faixa, lidas, gravadas) "
+                      "VALUES (%s, %s, %s, %s, %s, %s)")
+SQL_INSERT_AUDIENCIA = "INSERT INTO audiencias (numero_processo, data_hora, local, tipo) VALUES (%s, %s, %s, %s)"
+
+
+# --- Conversões (linha da origem -> valores do INSERT no destino) ---
+# Levantam ValueError quando a linha não pode ser migrada (ela é rejeitada).
+
+def _cpf(cpf):
+    cpf = (cpf or "").strip()
+    if not cpf:
+        raise ValueError("cliente sem CPF")
+    return cpf
+
+def _cliente(id_cliente, cpf, nome, telefone, email, endereco):
+    return (_cpf(cpf), nome.strip(), None, str(telefone) if telefone is not None else None, endereco, email)
+
+def _processo(n_processo, cpf, data, status, nome):
+    if cpf is None:
+        raise ValueError("processo sem cliente (nenhuma audiência o liga a um cliente)")
+    return (str(n_processo), _cpf(cpf), f"{nome} ({status}, aberto em {data:%d/%m/%Y})")
+
+def _audiencia(id_audiencia, n_processo, data, funcionario):
+    tipo = f"Resp.: {funcionario}"[:50] if funcionario else None
+    return (str(n_processo), datetime.combine(data, hora()), None, tipo)
+
+def _pagamento(id_pagamento, cpf, valor_total, parcelamentos, data_vencimento, data_pagamento):
+    return (_cpf(cpf), Decimal(f"{valor_total:.2f}"), f"Parcelamento: {parcelamentos}", data_vencimento, data_pagamento)
+
+# Etapa -> (tabela da origem, chave da faixa, SELECT da faixa, conversão, INSERT no destino).
+# Em ordem de dependência: uma etapa só começa quando a anterior terminou.
+ETAPAS = {
+    "clientes": ("cliente", "id_cliente",
+                 """SELECT id_cliente, cpf, nome, telefone, email, endereco FROM cliente
+                    WHERE id_cliente BETWEEN %s AND %s""",
+                 _cliente, SQL_INSERT_CLIENTE),
+    "processos": ("processos", "n_processo",
+                  """SELECT pr.n_processo, c.cpf, pr.data, pr.status, pr.nome FROM processos pr
+                     LEFT JOIN audiencias a ON a.n_processo = pr.n_processo
+                     LEFT JOIN cliente c ON c.id_cliente = a.id_cliente
+                     WHERE pr.n_processo BETWEEN %s AND %s""",
+                  _processo, SQL_INSERT_PROCESSO),
+    "audiencias": ("audiencias", "id_audiencia",
+                   """SELECT a.id_audiencia, a.n_processo, pr.data, f.nome FROM audiencias a
+                      JOIN processos pr ON pr.n_processo = a.n_processo
+                      LEFT JOIN funcionarios f ON f.id_funcionario = a.id_funcionario
+                      WHERE a.id_audiencia BETWEEN %s AND %s""",
+                   _audiencia, SQL_INSERT_AUDIENCIA),
+    "pagamentos": ("pagamentos", "id_pagamento",
+                   """SELECT p.id_pagamento, c.cpf, p.valor_total, p.parcelamentos, p.data_vencimento, p.data_pagamento
+                      FROM pagamentos p JOIN cliente c ON c.id_cliente = p.id_cliente
+                      WHERE p.id_pagamento BETWEEN %s AND %s""",
+                   _pagamento, SQL_INSERT_PAGAMENTO),
+}
+
+
+# --- Trabalho de cada processo do pool ---
+# Cada processo abre as suas duas conexões na primeira faixa que receber e
+# as reaproveita nas seguintes (reabrindo se caírem).
+
+_conexoes = {}
+
+def _iniciar_processo(origem_config, destino_config):
+    _conexoes["config"] = (origem_config, destino_config)
+
+def _conexao(qual):
+    conn = _conexoes.get(qual)
+    if conn is None or not conn.is_connected():
+        origem_config, destino_config = _conexoes["config"]
+        conn = mysql.connector.connect(**(origem_config if qual == "origem" else destino_config))
+        _conexoes[qual] = conn
+    return conn
+
+def _gravar_bloco(cursor, sql, linhas, rejeitadas):
+    """Insere o bloco com um INSERT multi-linha; se alguma linha violar uma restrição, repete linha a linha."""
+    if not linhas:
+        return 0
+    cursor.execute("SAVEPOINT bloco")
+    try:
+        cursor.executemany(sql, [valores for _, valores in linhas])
+        return len(linhas)
+    except (mysql.connector.IntegrityError, mysql.connector.DataError):
+        cursor.execute("ROLLBACK TO SAVEPOINT bloco")
+    # Só erros da própria linha são rejeitados; qualquer outro (queda, deadlock)
+    # derruba a faixa inteira, que é desfeita e fica para a próxima execução.
+    gravadas = 0
+    for chave, valores in linhas:
+        try:
+            cursor.execute(sql, valores)
+            gravadas += 1
+        except (mysql.connector.IntegrityError, mysql.connector.DataError) as err:
+            rejeitadas.append((chave, str(err)))
+    return gravadas
+
+def migrar_faixa(etapa, inicio, fim, faixa, lote):
+    """Migra as chaves [inicio, fim] de 'etapa' numa transação que também marca a faixa como concluída.
+
+    Retorna (etapa, inicio, fim, lidas, gravadas, rejeitadas), com as
+    primeiras rejeições como (chave na origem, motivo).
+    """
+    _, _, sql, converter, sql_insert = ETAPAS[etapa]
+    origem, destino = _conexao("origem"), _conexao("destino")
+    leitura = origem.cursor(buffered=False)  # As linhas vêm do servidor aos poucos
+    escrita = destino.cursor()
+    lidas = gravadas = 0
+    rejeitadas = []
+    try:
+        destino.start_transaction()
+        leitura.execute(sql, (inicio, fim))
+        while linhas := leitura.fetchmany(lote):
+            lidas += len(linhas)
+            convertidas = []
+            for linha in linhas:
+                try:
+                    convertidas.append((linha[0], converter(*linha)))
+                except (AttributeError, TypeError, ValueError) as err:
+                    rejeitadas.append((linha[0], str(err)))
+            gravadas += _gravar_bloco(escrita, sql_insert, convertidas, rejeitadas)
+        escrita.execute(SQL_CONCLUIR_FAIXA, (etapa, inicio, fim, faixa, lidas, gravadas))
+        destino.commit()
+    except BaseException:
+        if destino.is_connected(): destino.rollback()
+        raise
+    finally:
+        leitura.close(); escrita.close()
+        if origem.is_connected() and origem.in_transaction: origem.rollback()
+    return etapa, inicio, fim, lidas, gravadas, rejeitadas[:MAX_REJEICOES_EXIBIDAS]
+
+
+# --- Planejamento e controle ---
+
+def faixas_da_etapa(origem, etapa, faixa):
+    """Faixas [inicio, fim] que cobrem as chaves da etapa, alinhadas em múltiplos de 'faixa'.
+
+    O alinhamento faz as faixas saírem iguais em toda execução, para que as
+    concluídas possam ser reconhecidas e puladas.
+    """
+    tabela, chave = ETAPAS[etapa][:2]
+    cursor = origem.cursor()
+    cursor.execute(f"SELECT MIN({chave}), MAX({chave}) FROM {tabela}")
+    menor, maior = cursor.fetchone()
+    cursor.close()
+    if menor is None:
+        return []
+    return [(inicio, inicio + faixa - 1) for inicio in range(menor // faixa * faixa, maior + 1, faixa)]
+
+def faixas_concluidas(destino, etapa, faixa):
+    """Inícios das faixas já concluídas da etapa; recusa continuar com um tamanho de faixa diferente."""
+    cursor = destino.cursor()
+    cursor.execute("SELECT inicio, faixa FROM migracao_projeto_pi WHERE etapa = %s", (etapa,))
+    linhas = cursor.fetchall()
+    cursor.close()
+    tamanhos = {tamanho for _, tamanho in linhas}
+    if tamanhos - {faixa}:
+        raise ValueError(f"A etapa '{etapa}' foi começada com faixas de {min(tamanhos)} chaves; "
+                         f"continue com --faixa {min(tamanhos)}.")
+    return {inicio for inicio, _ in linhas}
+
+def _abrir(config):
+    conn = mysql.connector.connect(**config)
+    conn.autocommit = True
+    return conn
+
+def status(origem_config=ORIGEM_CONFIG, destino_config=DB_CONFIG, faixa=None):
+    """Imprime, por etapa, as faixas concluídas e as linhas lidas/gravadas até agora."""
+    faixa = faixa or MIGRACAO_CONFIG['faixa']
+    origem, destino = _abrir(origem_config), _abrir(destino_config)
+    try:
+        cursor = destino.cursor()
+        cursor.execute(SQL_CONTROLE)
+        for etapa in ETAPAS:
+            cursor.execute("""SELECT COUNT(*), COALESCE(SUM(lidas), 0), COALESCE(SUM(gravadas), 0), MAX(faixa)
+                              FROM migracao_projeto_pi WHERE etapa = %s""", (etapa,))
+            concluidas, lidas, gravadas, tamanho = cursor.fetchone()
+            total = len(faixas_da_etapa(origem, etapa, tamanho or faixa))
+            print(f"{etapa:<11} {concluidas}/{total} faixas, {lidas} lidas, {gravadas} gravadas, "
+                  f"{lidas - gravadas} rejeitadas")
+        cursor.close()
+    finally:
+        origem.close(); destino.close()
+
+def migrar(processos=None, faixa=None, lote=None, origem_config=ORIGEM_CONFIG, destino_config=DB_CONFIG):
+    """Executa (ou continua) a migração. Retorna True se todas as etapas terminaram."""
+    processos = processos or MIGRACAO_CONFIG['processos']
+    faixa = faixa or MIGRACAO_CONFIG['faixa']
+    lote = lote or MIGRACAO_CONFIG['lote']
+    origem, destino = _abrir(origem_config), _abrir(destino_config)
+    try:
+        cursor = destino.cursor()
+        cursor.execute(SQL_CONTROLE)
+        cursor.close()
+        with ProcessPoolExecutor(processos, initializer=_iniciar_processo,
+                                 initargs=(origem_config, destino_config)) as executor:
+            for etapa in ETAPAS:
+                concluidas = faixas_concluidas(destino, etapa, faixa)
+                pendentes = [(i, f) for i, f in faixas_da_etapa(origem, etapa, faixa) if i not in concluidas]
+                print(f"Etapa {etapa}: {len(pendentes)} faixa(s) pendente(s), {len(concluidas)} já concluída(s).")
+                if not _executar_etapa(executor, etapa, pendentes, faixa, lote):
+                    print(f"Etapa {etapa} incompleta; rode de novo para continuar das faixas que faltam.")
+                    return False
+    finally:
+        origem.close(); destino.close()
+    return True
+
+def _executar_etapa(executor, etapa, pendentes, faixa, lote):
+    # Uma faixa que falha não interrompe as outras da mesma etapa (o trabalho
+    # delas vale), mas a etapa seguinte não começa: ela depende desta.
+    inicio_etapa = time.perf_counter()
+    futuros = {executor.submit(migrar_faixa, etapa, i, f, faixa, lote): (i, f) for i, f in pendentes}
+    total_lidas = total_gravadas = falhas = 0
+    for futuro in as_completed(futuros):
+        i, f = futuros[futuro]
+        try:
+            _, _, _, lidas, gravadas, rejeitadas = futuro.result()
+        except Exception as err:  # Qualquer erro do processo: a transação da faixa já foi desfeita
+            falhas += 1
+            print(f"  Faixa {i}..{f} falhou e foi desfeita: {err}")
+            continue
+        total_lidas += lidas; total_gravadas += gravadas
+        print(f"  Faixa {i}..{f}: {gravadas}/{lidas} gravadas")
+        for chave, motivo in rejeitadas:
+            print(f"    {ETAPAS[etapa][1]} {chave} rejeitado: {motivo}")
+        if lidas - gravadas > len(rejeitadas):
+            print(f"    (+{lidas - gravadas - len(rejeitadas)} rejeições não exibidas)")
+    decorrido = time.perf_counter() - inicio_etapa
+    taxa = total_lidas / decorrido if decorrido > 0 else 0.0
+    print(f"  {etapa}: {total_gravadas} gravadas de {total_lidas} lidas em {decorrido:.1f}s ({taxa:.0f} linhas/s).")
+    return falhas == 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migra os dados do banco antigo 'projeto_pi' para o 'advocacia_db'.")
+    parser.add_argument("--status", action="store_true", help="Mostra o andamento sem migrar nada.")
+    parser.add_argument("--processos", type=int, default=MIGRACAO_CONFIG['processos'], help="Processos em paralelo.")
+    parser.add_argument("--faixa", type=int, default=MIGRACAO_CONFIG['faixa'], help="Chaves da origem por faixa/transação.")
+    parser.add_argument("--lote", type=int, default=MIGRACAO_CONFIG['lote'], help="Linhas por leitura e por INSERT.")
+    parser.add_argument("--origem", default=ORIGEM_CONFIG['database'], help="Nome do banco antigo.")
+    args = parser.parse_args(argv)
+
+    origem_config = dict(ORIGEM_CONFIG, database=args.origem)
+    try:
+        if args.status:
+            status(origem_config, DB_CONFIG, args.faixa)
+            return 0
+        return 0 if migrar(args.processos, args.faixa, args.lote, origem_config, DB_CONFIG) else 1
+    except ValueError as err:
+        print(err)
+        return 2
+    except mysql.connector.Error as err:
+        print(f"Erro na migração: {err}")
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,26 @@
 # modelo_abstrato.py
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 # --- Suas Classes Abstratas Originais ---
-class Cliente(ABC):
+# Todas as classes usam __slots__: os atributos ficam em posições fixas em vez
+# de um __dict__ por objeto, o que reduz bastante a memória quando há muitos
+# clientes/processos/pagamentos/audiências carregados ao mesmo tempo.
+# As subclasses concretas também declaram __slots__ = () para não recriar o __dict__.
+
+class Modelo(ABC):
+    """Base comum dos modelos: construção barata a partir de uma linha do banco."""
+    __slots__ = ()
+
+    @classmethod
+    def de_linha(cls, linha):
+        """Cria o objeto a partir de uma tupla na mesma ordem dos parâmetros do construtor."""
+        return cls(*linha)
+
+class Cliente(Modelo):
+    __slots__ = ("nome", "cpf", "idade", "telefone", "endereco", "email")
+
     def __init__(self, nome, cpf, idade, telefone, endereco, email):
         self.nome = nome
         self.cpf = cpf
@@ -17,7 +34,9 @@ class Cliente(ABC):
         """Método abstrato para obter uma identificação do cliente."""
         pass
 
-class Processo(ABC):
+class Processo(Modelo):
+    __slots__ = ("numero", "descricao", "cliente_cpf")
+
     def __init__(self, numero, descricao, cliente_cpf):
         self.numero = numero
         self.descricao = descricao
@@ -28,24 +47,43 @@ class Processo(ABC):
         """Método abstrato para obter um resumo do processo."""
         pass
 
-class Pagamento(ABC):
-    def __init__(self, cliente_cpf, valor, descricao):
+class Pagamento(Modelo):
+    __slots__ = ("cliente_cpf", "valor", "descricao", "id_pagamento", "data_vencimento", "data_pagamento")
+
+    def __init__(self, cliente_cpf, valor, descricao, id_pagamento=None, data_vencimento=None, data_pagamento=None):
         self.cliente_cpf = cliente_cpf
         self.valor = valor
         self.descricao = descricao
+        self.id_pagamento = id_pagamento # Definido pelo banco/armazenamento ao gravar
+        self.data_vencimento = data_vencimento # datetime.date (opcional)
+        self.data_pagamento = data_pagamento   # datetime.date; sem ela, um pagamento com vencimento está em aberto
+
+    def esta_em_aberto(self):
+        return self.data_pagamento is None and self.data_vencimento is not None
 
     @abstractmethod
     def confirmar_pagamento(self):
         """Método abstrato para confirmar o pagamento."""
         pass
 
-class Audiencia(ABC):
-    def __init__(self, processo_numero, data_hora, local, tipo, cliente_cpf):
+class Audiencia(Modelo):
+    __slots__ = ("processo_numero", "data_hora", "local", "tipo", "cliente_cpf", "id_audiencia")
+
+    def __init__(self, processo_numero, data_hora, local, tipo, cliente_cpf, id_audiencia=None):
         self.processo_numero = processo_numero
-        self.data_hora = data_hora # Formato string 'DD/MM/AAAA HH:MM'
+        self.data_hora = data_hora # datetime (a interface converte o texto 'DD/MM/AAAA HH:MM')
         self.local = local
         self.tipo = tipo
         self.cliente_cpf = cliente_cpf
+        self.id_audiencia = id_audiencia # Definido pelo banco/armazenamento ao gravar
+
+    @classmethod
+    def de_linha(cls, linha):
+        """Como Modelo.de_linha, mas aceita data_hora em texto ISO (formato do SQLite)."""
+        if isinstance(linha[1], str):
+            processo_numero, data_hora, *resto = linha
+            return cls(processo_numero, datetime.fromisoformat(data_hora), *resto)
+        return cls(*linha)
 
     @abstractmethod
     def informar_status_audiencia(self):
@@ -54,6 +92,8 @@ class Audiencia(ABC):
 
 # --- Classes Concretas Mínimas (necessárias para instanciar objetos) ---
 class ClienteConcreto(Cliente):
+    __slots__ = ()
+
     def obter_identificacao(self):
         return f"Cliente: {self.nome} (CPF: {self.cpf})"
 
@@ -67,6 +107,8 @@ class ClienteConcreto(Cliente):
                 f"Email: {self.email}")
 
 class ProcessoConcreto(Processo):
+    __slots__ = ()
+
     def obter_resumo(self):
         return f"Processo #{self.numero}: {self.descricao} (Cliente CPF: {self.cliente_cpf})"
 
@@ -77,24 +119,62 @@ class ProcessoConcreto(Processo):
                 f"CPF do Cliente: {self.cliente_cpf}")
 
 class PagamentoConcreto(Pagamento):
+    __slots__ = ()
+
     def confirmar_pagamento(self):
         return f"Pagamento de R${self.valor:.2f} (Cliente CPF: {self.cliente_cpf}) confirmado. Descrição: {self.descricao}"
 
     # ESTE MÉTODO ESTAVA FALTANDO OU INCORRETO
     def obter_detalhes_completos(self):
-        return (f"Cliente CPF: {self.cliente_cpf}\n"
-                f"Valor: R${self.valor:.2f}\n"
-                f"Descrição: {self.descricao}")
+        detalhes = (f"Cliente CPF: {self.cliente_cpf}\n"
+                    f"Valor: R${self.valor:.2f}\n"
+                    f"Descrição: {self.descricao}")
+        if self.data_vencimento: detalhes += f"\nVencimento: {self.data_vencimento:%d/%m/%Y}"
+        if self.data_pagamento: detalhes += f"\nPago em: {self.data_pagamento:%d/%m/%Y}"
+        elif self.data_vencimento: detalhes += "\nSituação: em aberto"
+        return detalhes
 
 class AudienciaConcreta(Audiencia):
+    __slots__ = ()
+
     def informar_status_audiencia(self):
         return (f"Audiência do Processo #{self.processo_numero} ({self.tipo}) em {self.local} "
-                f"às {self.data_hora} (Cliente: {self.cliente_cpf}).")
+                f"às {self.data_hora:%d/%m/%Y %H:%M} (Cliente: {self.cliente_cpf}).")
 
     # ESTE MÉTODO ESTAVA FALTANDO OU INCORRETO
     def obter_detalhes_completos(self):
         return (f"Processo: {self.processo_numero}\n"
                 f"Cliente CPF: {self.cliente_cpf}\n"
-                f"Data/Hora: {self.data_hora}\n"
+                f"Data/Hora: {self.data_hora:%d/%m/%Y %H:%M}\n"
                 f"Local: {self.local}\n"
-                f"Tipo: {self.tipo}")
\ No newline at end of file
+                f"Tipo: {self.tipo}")
+
+# --- Erros de Cadastro ---
+# Lançados pelas funções add_* quando o banco recusa o registro por causa de
+# uma chave única (registro duplicado) ou estrangeira (cliente/processo inexistente).
+class ErroCadastro(Exception):
+    mensagem = "Registro '{}' recusado."
+
+    def __init__(self, chave):
+        super().__init__(self.mensagem.format(chave))
+        self.chave = chave
+
+class DuplicateCliente(ErroCadastro):
+    mensagem = "Cliente com CPF '{}' já existe."
+
+class DuplicateProcesso(ErroCadastro):
+    mensagem = "Processo com número '{}' já existe."
+
+class ClienteNotFound(ErroCadastro):
+    mensagem = "Cliente com CPF '{}' não encontrado."
+
+class ProcessoNotFound(ErroCadastro):
+    mensagem = "Processo '{}' não encontrado."
+
+class ConflitoAgenda(ErroCadastro):
+    """Audiência em horário que se sobrepõe a outra no mesmo local ou do mesmo cliente."""
+    mensagem = "Conflito de horário: {}"
+
+    def __init__(self, descricao, conflitos=()):
+        super().__init__(descricao)
+        self.conflitos = list(conflitos)  # [(motivo, audiência)] de AgendaAudiencias.conflitos
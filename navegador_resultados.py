@@ -0,0 +1,187 @@
+# navegador_resultados.py
+# =====================================================================
+# NAVEGADOR DE RESULTADOS PAGINADO (ttk.Treeview)
+# Substitui as messageboxes com todos os registros concatenados: os
+# resultados são buscados em páginas (paginação por chave: "registros com
+# id maior que o último exibido") e só entram na tabela quando o usuário
+# rola até perto do fim do que já foi carregado.
+#
+# A tabela guarda no máximo 'max_paginas' páginas: ao carregar uma página
+# no fim, a primeira sai da tabela (só fica guardada a chave que a busca);
+# rolando de volta ao topo, ela é buscada de novo por essa chave e a última
+# página sai. Assim uma busca com milhares de registros não acumula todos
+# na Treeview nem na memória.
+# =====================================================================
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+
+# --- Colunas usadas pelas duas interfaces ---
+
+COLUNAS_PAGAMENTOS = [("Nº", 60), ("CPF do Cliente", 140), ("Valor", 110), ("Descrição", 360)]
+COLUNAS_AUDIENCIAS = [("Data/Hora", 130), ("Local", 200), ("Tipo", 150), ("CPF do Cliente", 140)]
+
+def linha_pagamento(pagamento):
+    return (pagamento.id_pagamento, pagamento.cliente_cpf, f"R${pagamento.valor:.2f}", pagamento.descricao)
+
+def linha_audiencia(audiencia):
+    return (f"{audiencia.data_hora:%d/%m/%Y %H:%M}", audiencia.local, audiencia.tipo, audiencia.cliente_cpf)
+
+
+class NavegadorResultados(tk.Toplevel):
+    """Janela que exibe resultados de uma busca página a página.
+
+    - colunas: lista de (título, largura) das colunas da tabela.
+    - buscar_pagina(apos_chave, limite): retorna até 'limite' objetos com chave
+      maior que 'apos_chave' (None na primeira página), em ordem de chave.
+    - linha_de(objeto): tupla com os valores exibidos nas colunas.
+    - chave_de(objeto): chave usada para pedir a página seguinte.
+    - max_paginas: páginas mantidas na tabela ao mesmo tempo.
+    - executor (opcional): ExecutorTarefas para buscar as páginas fora da
+      thread do Tkinter; sem ele, a busca é feita diretamente.
+    - acao (opcional): nome da ação da interface nas medições de cada página.
+    """
+
+    def __init__(self, parent, titulo, colunas, buscar_pagina, linha_de, chave_de,
+                 tamanho_pagina=100, executor=None, acao=None, max_paginas=5):
+        super().__init__(parent)
+        self.title(titulo)
+        self.geometry(f"700x400+{parent.winfo_x() + 50}+{parent.winfo_y() + 50}")
+        self.buscar_pagina = buscar_pagina
+        self.linha_de = linha_de
+        self.chave_de = chave_de
+        self.tamanho_pagina = tamanho_pagina
+        self.max_paginas = max(max_paginas, 2)
+        self.executor = executor
+        self.acao = acao
+        self.objetos = {}       # id da linha na Treeview -> objeto (para os detalhes)
+        self.paginas = []       # Páginas na tabela, em ordem: (chave que a buscou, ids das linhas)
+        self.chaves_acima = []  # Chaves das páginas que saíram pelo topo (a última é a mais próxima)
+        self.ultima_chave = None
+        self.carregando = False
+        self.terminou = False
+        self._tarefa = None
+
+        frame = tk.Frame(self)
+        frame.pack(expand=True, fill="both", padx=5, pady=5)
+        nomes = [f"c{i}" for i in range(len(colunas))]
+        self.tabela = ttk.Treeview(frame, columns=nomes, show="headings")
+        for nome, (texto, largura) in zip(nomes, colunas):
+            self.tabela.heading(nome, text=texto)
+            self.tabela.column(nome, width=largura, anchor="w")
+        barra = ttk.Scrollbar(frame, orient="vertical", command=self.tabela.yview)
+        self.tabela.configure(yscrollcommand=lambda inicio, fim: (barra.set(inicio, fim), self._ao_rolar(inicio, fim)))
+        self.tabela.pack(side=tk.LEFT, expand=True, fill="both")
+        barra.pack(side=tk.RIGHT, fill="y")
+        self.tabela.bind("<Double-1>", self._mostrar_detalhes)
+
+        self.status_label = tk.Label(self, text="Carregando...", anchor="w")
+        self.status_label.pack(fill="x", padx=5, pady=(0, 5))
+        self.protocol("WM_DELETE_WINDOW", self._on_fechar)
+        self._carregar_pagina()
+
+    # --- Carga das páginas ---
+
+    def _ao_rolar(self, inicio, fim):
+        # 'inicio'/'fim' são as frações visíveis; perto de uma das pontas, busca a página daquele lado
+        if float(fim) >= 0.9 and not self.terminou:
+            self._carregar_pagina()
+        elif float(inicio) <= 0.1 and self.chaves_acima:
+            self._carregar_pagina(acima=True)
+
+    def _carregar_pagina(self, acima=False):
+        # Uma carga cancelada (botão "Cancelar" da janela principal) pode ser refeita
+        cancelada = self._tarefa is not None and self._tarefa.cancelada
+        if (self.carregando and not cancelada) or (self.terminou and not acima):
+            return
+        self.carregando = True
+        apos = self.chaves_acima[-1] if acima else self.ultima_chave
+        exibir = lambda pagina: self._exibir_pagina(pagina, apos, acima)
+        if self.executor is not None:
+            self._tarefa = self.executor.submeter("Carregando resultados...", self.buscar_pagina,
+                                                  apos, self.tamanho_pagina,
+                                                  ao_concluir=exibir, ao_falhar=self._falhou,
+                                                  acao=self.acao)
+        else:
+            try:
+                pagina = self.buscar_pagina(apos, self.tamanho_pagina)
+            except Exception as err:
+                self._falhou(err)
+            else:
+                exibir(pagina)
+
+    def _exibir_pagina(self, pagina, apos, acima=False):
+        if not self.winfo_exists():
+            return
+        self.carregando = False
+        self._tarefa = None
+        linhas_antes = len(self.tabela.get_children())
+        topo = self.tabela.yview()[0] * linhas_antes  # Linha no topo da tela, para mantê-la depois
+        if acima:
+            if self.chaves_acima and self.chaves_acima[-1] == apos:
+                self.chaves_acima.pop()
+                ids = [self.tabela.insert("", i, values=self.linha_de(objeto)) for i, objeto in enumerate(pagina)]
+                self.objetos.update(zip(ids, pagina))
+                self.paginas.insert(0, (apos, ids))
+                topo += len(ids)
+            while len(self.paginas) > self.max_paginas:
+                # A última página sai; ela é buscada de novo a partir da chave da anterior
+                self._remover_linhas(self.paginas.pop()[1])
+                self.ultima_chave = self.chave_de(self.objetos[self.paginas[-1][1][-1]])
+                self.terminou = False
+        else:
+            if apos == self.ultima_chave:
+                if pagina:
+                    ids = [self.tabela.insert("", tk.END, values=self.linha_de(objeto)) for objeto in pagina]
+                    self.objetos.update(zip(ids, pagina))
+                    self.paginas.append((apos, ids))
+                    self.ultima_chave = self.chave_de(pagina[-1])
+                if len(pagina) < self.tamanho_pagina:
+                    self.terminou = True
+            while len(self.paginas) > self.max_paginas:
+                # A primeira página sai; guarda a chave que a buscou para rolar de volta
+                chave, ids = self.paginas.pop(0)
+                self._remover_linhas(ids)
+                self.chaves_acima.append(chave)
+                topo -= len(ids)
+        linhas = len(self.tabela.get_children())
+        if linhas and linhas_antes:
+            self.tabela.yview_moveto(max(topo, 0) / linhas)
+        self._atualizar_status()
+        # Se a página não encheu a tabela, não haverá rolagem para pedir a próxima
+        if not self.terminou:
+            self.after_idle(lambda: self.winfo_exists() and self._ao_rolar(*self.tabela.yview()))
+
+    def _remover_linhas(self, ids):
+        self.tabela.delete(*ids)
+        for id_linha in ids:
+            del self.objetos[id_linha]
+
+    def _atualizar_status(self):
+        total = len(self.objetos)
+        if total == 0:
+            self.status_label.config(text="Nenhum registro encontrado.")
+            return
+        primeiro = len(self.chaves_acima) * self.tamanho_pagina + 1  # Só páginas cheias saem pelo topo
+        faixa = f"{total} registro(s) exibido(s)" if primeiro == 1 else \
+            f"Registros {primeiro} a {primeiro + total - 1} exibidos"
+        sufixo = "" if self.terminou else " (role para carregar mais)"
+        self.status_label.config(text=f"{faixa}{sufixo}. Clique duas vezes para ver detalhes.")
+
+    def _falhou(self, err):
+        self.carregando = False
+        self._tarefa = None
+        if self.winfo_exists():
+            self.status_label.config(text="Erro ao carregar resultados.")
+            messagebox.showerror("Erro", f"Erro ao buscar resultados: {err}", parent=self)
+
+    def _mostrar_detalhes(self, event=None):
+        selecionado = self.tabela.focus()
+        if selecionado in self.objetos:
+            messagebox.showinfo("Detalhes", self.objetos[selecionado].obter_detalhes_completos(), parent=self)
+
+    def _on_fechar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancelar()
+        self.destroy()
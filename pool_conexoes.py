@@ -0,0 +1,219 @@
+# pool_conexoes.py
+# =====================================================================
+# POOL DE CONEXÕES
+# Mantém conexões abertas para serem reaproveitadas pelas funções de
+# banco de dados, evitando abrir (TCP + autenticação) e fechar uma
+# conexão nova a cada comando.
+# =====================================================================
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PoolEsgotado(Exception):
+    """Lançada quando nenhuma conexão fica livre dentro do tempo de espera."""
+    pass
+
+
+class PoolConexoes:
+    """Pool de conexões com tamanho mínimo/máximo, tempo ocioso e validação na retirada.
+
+    'criar_conexao' é uma função sem argumentos que abre uma conexão nova
+    (ex.: lambda: mysql.connector.connect(**DB_CONFIG)). 'validar' recebe uma
+    conexão e devolve True se ela ainda pode ser usada. 'redefinir' é chamada
+    ao devolver uma conexão usada sem erro (ex.: encerrar uma transação de
+    leitura aberta, para que o próximo usuário não veja um snapshot antigo).
+    """
+
+    def __init__(self, criar_conexao, tamanho_minimo=1, tamanho_maximo=5,
+                 tempo_ocioso=300.0, tempo_espera=10.0, validar=None, redefinir=None):
+        if tamanho_minimo < 0 or tamanho_maximo < 1 or tamanho_minimo > tamanho_maximo:
+            raise ValueError("Tamanhos do pool inválidos.")
+        self.criar_conexao = criar_conexao
+        self.tamanho_minimo = tamanho_minimo
+        self.tamanho_maximo = tamanho_maximo
+        self.tempo_ocioso = tempo_ocioso
+        self.tempo_espera = tempo_espera
+        self.validar = validar
+        self.redefinir = redefinir
+        self._livres = []  # Lista de (conexao, instante em que foi devolvida)
+        self._total = 0    # Conexões abertas (livres + em uso)
+        self._cond = threading.Condition()
+        self._fechado = False
+        self._em_uso = 0
+        self._criadas = 0
+        self._descartadas = 0
+        self._retiradas = 0
+        self._esperas = 0
+        self._tempo_espera_total = 0.0
+        self._tempo_espera_max = 0.0
+
+    # --- Retirada e devolução ---
+
+    def retirar(self):
+        """Retira uma conexão do pool (reaproveitada ou nova), esperando se estiver cheio."""
+        inicio = time.monotonic()
+        esperou = False
+        with self._cond:
+            while True:
+                self._fechar_ociosas()
+                if self._livres:
+                    conn, _ = self._livres.pop()
+                    break
+                if self._total < self.tamanho_maximo:
+                    conn = None
+                    self._total += 1  # Reserva a vaga antes de conectar fora do lock
+                    break
+                restante = self.tempo_espera - (time.monotonic() - inicio)
+                if restante <= 0:
+                    self._registrar_espera(inicio, esperou)
+                    raise PoolEsgotado(f"Nenhuma conexão livre após {self.tempo_espera:.1f}s.")
+                esperou = True
+                self._cond.wait(restante)
+
+        if conn is not None and not self._conexao_valida(conn):
+            self._fechar(conn)
+            with self._cond:
+                self._descartadas += 1
+            conn = None  # A vaga continua reservada para uma conexão nova
+        if conn is None:
+            try:
+                conn = self.criar_conexao()
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._criadas += 1
+
+        with self._cond:
+            self._em_uso += 1
+            self._retiradas += 1
+            self._registrar_espera(inicio, esperou)
+        return conn
+
+    def devolver(self, conn, descartar=False):
+        """Devolve uma conexão ao pool; se 'descartar' for True ela é fechada."""
+        with self._cond:
+            self._em_uso -= 1
+            descartar = descartar or self._fechado
+            if descartar:
+                self._total -= 1
+                self._descartadas += 1
+            else:
+                self._livres.append((conn, time.monotonic()))
+            self._cond.notify()
+        if descartar:
+            self._fechar(conn)
+
+    @contextmanager
+    def conexao(self):
+        """Empresta uma conexão dentro de um bloco 'with'.
+
+        Se o bloco terminar com exceção, é feito rollback; se o rollback
+        falhar, a conexão está quebrada e é descartada em vez de voltar ao pool.
+        """
+        conn = self.retirar()
+        try:
+            yield conn
+        except BaseException:
+            try:
+                conn.rollback()
+            except Exception:
+                self.devolver(conn, descartar=True)
+            else:
+                self.devolver(conn)
+            raise
+        try:
+            if self.redefinir is not None:
+                self.redefinir(conn)
+        except Exception:
+            self.devolver(conn, descartar=True)
+        else:
+            self.devolver(conn)
+
+    # --- Manutenção ---
+
+    def aquecer(self):
+        """Abre conexões até atingir o tamanho mínimo."""
+        while True:
+            with self._cond:
+                if self._total >= self.tamanho_minimo:
+                    return
+                self._total += 1
+            try:
+                conn = self.criar_conexao()
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                raise
+            with self._cond:
+                self._criadas += 1
+                self._livres.append((conn, time.monotonic()))
+                self._cond.notify()
+
+    def fechar(self):
+        """Fecha todas as conexões livres (as em uso são fechadas ao serem devolvidas)."""
+        with self._cond:
+            livres, self._livres = self._livres, []
+            self._total -= len(livres)
+            self._descartadas += len(livres)
+            self._fechado = True  # Conexões em uso serão descartadas na devolução
+        for conn, _ in livres:
+            self._fechar(conn)
+
+    def estatisticas(self):
+        """Retorna um dicionário com os contadores do pool, útil para dimensioná-lo."""
+        with self._cond:
+            return {
+                "em_uso": self._em_uso,
+                "livres": len(self._livres),
+                "abertas": self._total,
+                "tamanho_maximo": self.tamanho_maximo,
+                "criadas": self._criadas,
+                "descartadas": self._descartadas,
+                "retiradas": self._retiradas,
+                "esperas": self._esperas,
+                "tempo_espera_total": self._tempo_espera_total,
+                "tempo_espera_max": self._tempo_espera_max,
+            }
+
+    # --- Auxiliares internos ---
+
+    def _conexao_valida(self, conn):
+        if self.validar is None:
+            return True
+        try:
+            return bool(self.validar(conn))
+        except Exception:
+            return False
+
+    def _fechar_ociosas(self):
+        # Chamado com o lock adquirido: fecha as conexões paradas há mais de
+        # 'tempo_ocioso' segundos, preservando o tamanho mínimo.
+        limite = time.monotonic() - self.tempo_ocioso
+        mantidas = []
+        for conn, devolvida_em in self._livres:
+            if devolvida_em < limite and self._total > self.tamanho_minimo:
+                self._total -= 1
+                self._descartadas += 1
+                self._fechar(conn)
+            else:
+                mantidas.append((conn, devolvida_em))
+        self._livres = mantidas
+
+    def _fechar(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _registrar_espera(self, inicio, esperou):
+        if not esperou:
+            return
+        duracao = time.monotonic() - inicio
+        self._esperas += 1
+        self._tempo_espera_total += duracao
+        self._tempo_espera_max = max(self._tempo_espera_max, duracao)
@@ -0,0 +1,181 @@
+# relatorios_financeiros.py
+# =====================================================================
+# RELATÓRIOS FINANCEIROS (TOTAIS POR CLIENTE, POR MÊS E SITUAÇÃO)
+# As somas são feitas pelo próprio banco com GROUP BY: para o Python só
+# voltam as linhas já agregadas (uma por cliente, por mês ou por situação),
+# nunca um objeto PagamentoConcreto por pagamento.
+#
+# Regras usadas em todos os relatórios:
+#   - pagamento EM ABERTO: tem data de vencimento e ainda não tem data de
+#     pagamento (VENCIDO se o vencimento já passou, A VENCER se não);
+#   - pagamento RECEBIDO: tem data de pagamento, ou não tem vencimento
+#     (os registrados pelo botão "Registrar Pagamento" sem datas);
+#   - o mês de um pagamento é o do vencimento (ou o do pagamento, se não
+#     houver vencimento); pagamentos sem nenhuma data ficam em "sem data".
+#
+# O SQL abaixo funciona igual no MySQL e no SQLite; as funções que o
+# executam ficam em 'banco_dados.py' e 'repositorio.py'.
+#
+# Uso:
+#   python relatorios_financeiros.py clientes [--inicio 2025-01-01] [--fim 2025-12-31]
+#   python relatorios_financeiros.py meses
+#   python relatorios_financeiros.py situacao [--hoje 2025-06-30]
+# =====================================================================
+
+import argparse
+import sys
+from datetime import date
+
+_EM_ABERTO = "(data_pagamento IS NULL AND data_vencimento IS NOT NULL)"
+_DATA_REFERENCIA = "COALESCE(data_vencimento, data_pagamento)"
+
+COLUNAS_POR_CLIENTE = ("cliente_cpf", "nome", "quantidade", "total", "recebido", "em_aberto")
+COLUNAS_POR_MES = ("mes", "quantidade", "total", "recebido", "em_aberto")
+COLUNAS_SITUACAO = ("situacao", "quantidade", "total")
+SITUACOES = ("recebido", "a_vencer", "vencido")
+
+
+def _filtro_periodo(inicio, fim):
+    """Trecho WHERE (com marcadores %s) que limita a data de referência ao período."""
+    condicoes, params = [], []
+    if inicio is not None:
+        condicoes.append(f"{_DATA_REFERENCIA} >= %s"); params.append(inicio.isoformat())
+    if fim is not None:
+        condicoes.append(f"{_DATA_REFERENCIA} <= %s"); params.append(fim.isoformat())
+    return (" WHERE " + " AND ".join(condicoes) if condicoes else ""), params
+
+def sql_totais_por_cliente(inicio=None, fim=None):
+    """Retorna (sql, params): agrega os pagamentos por CPF e só depois junta o nome do cliente."""
+    filtro, params = _filtro_periodo(inicio, fim)
+    return f"""SELECT t.cliente_cpf, c.nome, t.quantidade, t.total, t.recebido, t.em_aberto
+               FROM (SELECT cliente_cpf, COUNT(*) AS quantidade, SUM(valor) AS total,
+                            SUM(CASE WHEN {_EM_ABERTO} THEN 0 ELSE valor END) AS recebido,
+                            SUM(CASE WHEN {_EM_ABERTO} THEN valor ELSE 0 END) AS em_aberto
+                     FROM pagamentos{filtro}
+                     GROUP BY cliente_cpf) t
+               JOIN clientes c ON c.cpf = t.cliente_cpf
+               ORDER BY t.total DESC, t.cliente_cpf""", params
+
+def sql_totais_por_mes(inicio=None, fim=None):
+    """Retorna (sql, params): um total por mês 'AAAA-MM' da data de referência."""
+    filtro, params = _filtro_periodo(inicio, fim)
+    # SUBSTR da data em texto ('AAAA-MM-DD') dá o mês nos dois bancos
+    return f"""SELECT SUBSTR({_DATA_REFERENCIA}, 1, 7) AS mes, COUNT(*), SUM(valor),
+                      SUM(CASE WHEN {_EM_ABERTO} THEN 0 ELSE valor END),
+                      SUM(CASE WHEN {_EM_ABERTO} THEN valor ELSE 0 END)
+               FROM pagamentos{filtro}
+               GROUP BY mes
+               ORDER BY mes""", params
+
+def sql_situacao(hoje=None):
+    """Retorna (sql, params): quantidade e total de recebidos, a vencer e vencidos em 'hoje'."""
+    return f"""SELECT CASE WHEN NOT {_EM_ABERTO} THEN 'recebido'
+                           WHEN data_vencimento < %s THEN 'vencido'
+                           ELSE 'a_vencer' END AS situacao,
+                      COUNT(*), SUM(valor)
+               FROM pagamentos
+               GROUP BY situacao""", [(hoje or date.today()).isoformat()]
+
+def montar(colunas, linhas):
+    """Converte as linhas agregadas em dicionários {coluna: valor}."""
+    return [dict(zip(colunas, linha)) for linha in linhas]
+
+def montar_situacao(linhas):
+    """Dicionário {situação: {"quantidade", "total"}} com as três situações (zeradas se faltarem)."""
+    resultado = {situacao: {"quantidade": 0, "total": 0} for situacao in SITUACOES}
+    for situacao, quantidade, total in linhas:
+        resultado[situacao] = {"quantidade": quantidade, "total": total or 0}
+    return resultado
+
+
+# --- Versão para o armazenamento em memória (sem banco para agregar) ---
+# Uma passada por tabela, acumulando por chave; serve para os dados de
+# uma sessão da interface em memória, não para a base inteira do escritório.
+
+def _em_aberto(pagamento):
+    return pagamento.data_pagamento is None and pagamento.data_vencimento is not None
+
+def _no_periodo(pagamento, inicio, fim):
+    referencia = pagamento.data_vencimento or pagamento.data_pagamento
+    if inicio is None and fim is None: return True
+    if referencia is None: return False
+    return (inicio is None or referencia >= inicio) and (fim is None or referencia <= fim)
+
+def _acumular(pagamentos, chave_de):
+    totais = {}
+    for pagamento in pagamentos:
+        chave = chave_de(pagamento)
+        quantidade, total, recebido, aberto = totais.get(chave, (0, 0, 0, 0))
+        em_aberto = _em_aberto(pagamento)
+        totais[chave] = (quantidade + 1, total + pagamento.valor,
+                         recebido + (0 if em_aberto else pagamento.valor), aberto + (pagamento.valor if em_aberto else 0))
+    return totais
+
+def totais_por_cliente_em_memoria(armazenamento, inicio=None, fim=None):
+    pagamentos = (p for p in armazenamento.pagamentos if _no_periodo(p, inicio, fim))
+    totais = _acumular(pagamentos, lambda p: p.cliente_cpf)
+    linhas = [(cpf, armazenamento.clientes.obter(cpf).nome, *valores) for cpf, valores in totais.items()]
+    linhas.sort(key=lambda linha: (-linha[3], linha[0]))
+    return montar(COLUNAS_POR_CLIENTE, linhas)
+
+def totais_por_mes_em_memoria(armazenamento, inicio=None, fim=None):
+    def mes(p):
+        referencia = p.data_vencimento or p.data_pagamento
+        return referencia.isoformat()[:7] if referencia else None
+    pagamentos = (p for p in armazenamento.pagamentos if _no_periodo(p, inicio, fim))
+    totais = _acumular(pagamentos, mes)
+    linhas = sorted(((m, *valores) for m, valores in totais.items()), key=lambda linha: (linha[0] is not None, linha[0] or ""))
+    return montar(COLUNAS_POR_MES, linhas)
+
+def situacao_em_memoria(armazenamento, hoje=None):
+    hoje = hoje or date.today()
+    def situacao(p):
+        if not _em_aberto(p): return "recebido"
+        return "vencido" if p.data_vencimento < hoje else "a_vencer"
+    totais = _acumular(armazenamento.pagamentos, situacao)
+    return montar_situacao((s, valores[0], valores[1]) for s, valores in totais.items())
+
+
+# --- Linha de comando ---
+
+def _data(texto):
+    try:
+        return date.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida '{texto}' (use AAAA-MM-DD)")
+
+def _real(valor):
+    return f"R${valor or 0:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+def main(argv=None):
+    from repositorio import criar_repositorio
+
+    parser = argparse.ArgumentParser(description="Relatórios financeiros dos pagamentos.")
+    parser.add_argument("relatorio", choices=("clientes", "meses", "situacao"))
+    parser.add_argument("--inicio", type=_data, help="Data inicial (AAAA-MM-DD) da data de referência.")
+    parser.add_argument("--fim", type=_data, help="Data final (AAAA-MM-DD) da data de referência.")
+    parser.add_argument("--hoje", type=_data, help="Data usada para separar vencidos de a vencer.")
+    args = parser.parse_args(argv)
+
+    repo = criar_repositorio("mysql")
+    try:
+        if args.relatorio == "clientes":
+            print(f"{'CPF':<15} {'Cliente':<30} {'Qtd.':>7} {'Total':>16} {'Recebido':>16} {'Em aberto':>16}")
+            for linha in repo.totais_por_cliente(args.inicio, args.fim):
+                print(f"{linha['cliente_cpf']:<15} {linha['nome'][:30]:<30} {linha['quantidade']:>7} "
+                      f"{_real(linha['total']):>16} {_real(linha['recebido']):>16} {_real(linha['em_aberto']):>16}")
+        elif args.relatorio == "meses":
+            print(f"{'Mês':<9} {'Qtd.':>7} {'Total':>16} {'Recebido':>16} {'Em aberto':>16}")
+            for linha in repo.totais_por_mes(args.inicio, args.fim):
+                print(f"{linha['mes'] or 'sem data':<9} {linha['quantidade']:>7} {_real(linha['total']):>16} "
+                      f"{_real(linha['recebido']):>16} {_real(linha['em_aberto']):>16}")
+        else:
+            for situacao, valores in repo.situacao_pagamentos(args.hoje).items():
+                print(f"{situacao:<10} {valores['quantidade']:>7} {_real(valores['total']):>16}")
+    finally:
+        repo.fechar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,917 @@
+# repositorio.py
+# =====================================================================
+# REPOSITÓRIO DE DADOS COM BACKENDS INTERCAMBIÁVEIS
+# As duas interfaces gráficas usam a mesma interface (Repositorio) para
+# cadastrar e buscar clientes, processos, pagamentos e audiências. O
+# armazenamento por trás é escolhido por configuração:
+#
+#   - "memoria": objetos em memória (ArmazenamentoIndexado), sem banco;
+#   - "sqlite":  arquivo local SQLite em modo WAL (escritório de um só posto),
+#                com as mesmas medições de 'instrumentacao.py' que o MySQL;
+#   - "mysql":   servidor MySQL, pelas funções de 'banco_dados.py'.
+#
+# O backend padrão de cada interface pode ser trocado pela variável de
+# ambiente SISTEMA_JURIDICO_BACKEND (ex.: SISTEMA_JURIDICO_BACKEND=sqlite).
+# O driver do MySQL só é importado quando o backend "mysql" é usado.
+#
+# A busca de clientes por nome (buscar_clientes_por_nome) usa o índice em
+# memória de 'indice_nomes.py', montado na primeira busca (ou antes, com
+# preparar_busca_por_nome) e atualizado pelos add_cliente deste repositório.
+# Clientes gravados por outro programa (ex.: importar_dados.py) só aparecem
+# depois de preparar_busca_por_nome(recarregar=True).
+#
+# Do mesmo jeito, add_audiencia consulta a agenda em memória de
+# 'agenda_audiencias.py' e recusa (ConflitoAgenda) horários que se sobrepõem
+# a outra audiência no mesmo local ou do mesmo cliente; agenda_entre()
+# responde "audiências desta semana neste local" pela mesma agenda. Essa
+# agenda só vê o que este processo gravou desde que ela foi montada: por
+# isso o backend "mysql", com vários usuários, confere o conflito no próprio
+# banco, na transação do INSERT (SELECT ... FOR UPDATE da faixa de horário).
+# Nos backends "memoria" e "sqlite" (um posto) vale a agenda em memória;
+# outro programa gravando no mesmo arquivo SQLite só é visto depois de
+# preparar_agenda(recarregar=True).
+#
+# O backend "memoria" pode ser durável: com 'caminho_snapshot' ele abre o
+# snapshot de 'snapshot.py' e, com 'caminho_diario', registra cada cadastro
+# no diário de 'diario_alteracoes.py' (reaplicado por cima do snapshot na
+# abertura). Quando o diário cresce, compactar() o incorpora a um snapshot
+# novo numa thread separada, sem segurar os cadastros durante a gravação.
+# =====================================================================
+
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import date
+from itertools import count
+
+from modelo_abstrato import ClienteConcreto, ProcessoConcreto, PagamentoConcreto, AudienciaConcreta
+from modelo_abstrato import DuplicateCliente, DuplicateProcesso, ClienteNotFound, ProcessoNotFound
+from armazenamento_memoria import ArmazenamentoIndexado
+from snapshot import salvar_snapshot, carregar_snapshot
+from diario_alteracoes import DiarioAlteracoes, ler_diario, DIARIO_CONFIG
+from indice_nomes import IndiceNomes
+from agenda_audiencias import AgendaAudiencias, erro_de_conflito
+from instrumentacao import instrumentado, fase, registrar_linhas, registrar_erro, anotar
+import relatorios_financeiros
+import visao_cliente
+
+
+REPOSITORIO_CONFIG = {
+    'backend': os.environ.get("SISTEMA_JURIDICO_BACKEND"),  # None = padrão de cada interface
+    'caminho_sqlite': os.environ.get("SISTEMA_JURIDICO_SQLITE", "sistema_juridico.db"),
+    'snapshot_memoria': os.environ.get("SISTEMA_JURIDICO_SNAPSHOT", "sistema_juridico.snap"),  # Usado pela interface em memória
+    'diario_memoria': os.environ.get("SISTEMA_JURIDICO_DIARIO", "sistema_juridico.diario"),
+}
+
+
+class Repositorio(ABC):
+    """Operações de cadastro e busca comuns a todos os backends.
+
+    Os métodos add_* retornam True se gravaram e False em caso de erro do
+    armazenamento; registros recusados lançam os erros de cadastro do modelo
+    (DuplicateCliente, DuplicateProcesso, ClienteNotFound, ProcessoNotFound).
+    As buscas de pagamentos/audiências aceitam paginação por chave
+    ('apos_id' = id do último item da página anterior, 'limite' = tamanho).
+    """
+
+    nome = "abstrato"
+
+    def __init__(self):
+        self._indice_nomes = None
+        self._lock_indice = threading.RLock()
+        self._agenda = None
+        self._lock_agenda = threading.RLock()
+        self._assincronos = {}  # RepositorioAssincrono dos atalhos em lote ('repositorio_assincrono.py')
+        self._lock_assincronos = threading.Lock()
+
+    def verificar_conexao(self):
+        """Retorna True se o armazenamento está acessível."""
+        return True
+
+    def fechar(self):
+        """Libera conexões/arquivos abertos pelo repositório.
+
+        As subclasses chamam super().fechar() antes de fechar as conexões:
+        primeiro terminam as threads dos atalhos em lote, que as usam.
+        """
+        with self._lock_assincronos:
+            assincronos, self._assincronos = list(self._assincronos.values()), {}
+        for repo_async in assincronos:
+            repo_async.fechar()
+
+    @abstractmethod
+    def add_cliente(self, cliente): pass
+
+    @abstractmethod
+    def add_processo(self, processo): pass
+
+    @abstractmethod
+    def add_pagamento(self, pagamento): pass
+
+    @abstractmethod
+    def add_audiencia(self, audiencia): pass
+
+    @abstractmethod
+    def find_cliente_by_cpf(self, cpf): pass
+
+    @abstractmethod
+    def find_processo_by_numero(self, numero): pass
+
+    @abstractmethod
+    def find_processos_by_cpf(self, cpf): pass
+
+    @abstractmethod
+    def visao_cliente_by_cpf(self, cpf):
+        """Retorna a VisaoCliente (cliente, processos, pagamentos e audiências) ou None, numa só consulta."""
+
+    # Buscas em lote: {chave: objeto ou None} para cada chave (repetidas contam uma vez)
+    @abstractmethod
+    def find_clientes_by_cpfs(self, cpfs): pass
+
+    @abstractmethod
+    def find_processos_by_numeros(self, numeros): pass
+
+    @abstractmethod
+    def find_pagamentos_by_cpf(self, cpf, apos_id=None, limite=None): pass
+
+    @abstractmethod
+    def find_audiencias_by_processo(self, numero_processo, apos_id=None, limite=None): pass
+
+    @abstractmethod
+    def exportar(self, tabela, tamanho_bloco=10000):
+        """Gera todos os registros de 'tabela' ("clientes", "processos", "pagamentos" ou "audiencias")."""
+
+    # Relatórios financeiros (ver 'relatorios_financeiros.py'); 'inicio'/'fim' são datetime.date
+    @abstractmethod
+    def totais_por_cliente(self, inicio=None, fim=None): pass
+
+    @abstractmethod
+    def totais_por_mes(self, inicio=None, fim=None): pass
+
+    @abstractmethod
+    def situacao_pagamentos(self, hoje=None): pass
+
+    # --- Busca por nome (índice em memória) ---
+
+    @abstractmethod
+    def _listar_nomes(self):
+        """Retorna um iterável de (cpf, nome) com todos os clientes."""
+
+    def preparar_busca_por_nome(self, recarregar=False):
+        """Monta (ou remonta) o índice de nomes; pode ser chamada numa thread de trabalho ao abrir a interface."""
+        with self._lock_indice:
+            if self._indice_nomes is None or recarregar:
+                self._indice_nomes = IndiceNomes().construir(self._listar_nomes())
+            return self._indice_nomes
+
+    def buscar_clientes_por_nome(self, texto, limite=10):
+        """Retorna até 'limite' tuplas (cpf, nome, pontuação) dos clientes com nome parecido com 'texto'."""
+        # Com _lock_indice, como agenda_entre: um add_cliente em outra thread
+        # altera as listas paralelas do índice uma de cada vez
+        with self._lock_indice:
+            return self.preparar_busca_por_nome().buscar(texto, limite)
+
+    def _indexar_cliente(self, cliente):
+        # Chamada pelos add_cliente depois de gravar; se o índice estiver sendo
+        # montado, espera terminar (a leitura pode ou não ter visto o cliente)
+        with self._lock_indice:
+            if self._indice_nomes is not None:
+                self._indice_nomes.adicionar(cliente.cpf, cliente.nome)
+
+    # --- Agenda de audiências (índice em memória) ---
+
+    @abstractmethod
+    def _listar_audiencias(self):
+        """Retorna todas as audiências (AudienciaConcreta, com cliente_cpf)."""
+
+    def preparar_agenda(self, recarregar=False):
+        """Monta (ou remonta) a agenda de audiências; também pode rodar numa thread de trabalho."""
+        with self._lock_agenda:
+            if self._agenda is None or recarregar:
+                self._agenda = AgendaAudiencias().construir(self._listar_audiencias())
+            return self._agenda
+
+    def agenda_entre(self, inicio, fim, local=None, cliente_cpf=None):
+        """Audiências com data/hora em [inicio, fim), em ordem, opcionalmente de um local e/ou cliente."""
+        with self._lock_agenda:
+            return self.preparar_agenda().entre(inicio, fim, local, cliente_cpf)
+
+    def _verificar_horario(self, audiencia):
+        # Chamada pelos add_audiencia com _lock_agenda, junto com a gravação e o
+        # _agenda.adicionar, para que dois agendamentos não ocupem o mesmo horário
+        if audiencia.cliente_cpf is None:
+            processo = self.find_processo_by_numero(audiencia.processo_numero)
+            if processo is None: raise ProcessoNotFound(audiencia.processo_numero)
+            audiencia.cliente_cpf = processo.cliente_cpf
+        conflitos = self.preparar_agenda().conflitos(audiencia)
+        if conflitos:
+            raise erro_de_conflito(conflitos)
+
+
+# --- Backend em memória ---
+
+class RepositorioMemoria(Repositorio):
+    """Repositório sobre o ArmazenamentoIndexado.
+
+    Sem 'caminho_snapshot', os dados somem ao fechar o programa. Com ele, o
+    snapshot ('snapshot.py') é aberto na criação, se existir (os registros são
+    lidos do arquivo sob demanda), e regravado por salvar() e ao fechar.
+
+    Com 'caminho_diario' (exige 'caminho_snapshot'), cada add_* só retorna
+    depois de gravado no diário ('diario_alteracoes.py'), que é reaplicado
+    por cima do snapshot na criação. O registro só entra no armazenamento
+    (e aparece nas buscas) depois de gravado; se a gravação falhar, add_*
+    retorna False e nada muda. Ao fechar, o diário basta (não regrava
+    o snapshot); ele é incorporado ao snapshot por compactar(), chamada numa
+    thread quando passa de DIARIO_CONFIG['compactar_apos_bytes'].
+    """
+
+    nome = "memoria"
+
+    def __init__(self, armazenamento=None, caminho_snapshot=None, caminho_diario=None):
+        super().__init__()
+        if caminho_diario is not None and caminho_snapshot is None:
+            raise ValueError("O diário precisa de um snapshot onde ser compactado (caminho_snapshot).")
+        self.caminho_snapshot = caminho_snapshot
+        self.caminho_diario = caminho_diario
+        if armazenamento is None:
+            armazenamento = self._abrir_snapshot()
+        self.armazenamento = armazenamento
+        self._lock = threading.RLock()
+        self._lock_arquivos = threading.Lock()  # Uma gravação de snapshot (salvar/compactar) por vez
+        self._compactacao = None  # Thread da compactação em andamento
+        self._diario = None
+        self._reservados = {tabela: set() for tabela in self.armazenamento.tabelas()}  # Chaves esperando o diário
+        if caminho_diario is not None:
+            # Um ".compactando" que sobrou é de uma compactação interrompida: vem antes do diário
+            self._reaplicar_diario(self.armazenamento, self._caminho_compactando)
+            tamanho_valido = self._reaplicar_diario(self.armazenamento, caminho_diario)
+            self._diario = DiarioAlteracoes(caminho_diario, tamanho_valido)
+            self._talvez_compactar()
+
+    # --- Snapshot e diário ---
+
+    @property
+    def _caminho_compactando(self):
+        return self.caminho_diario + ".compactando"
+
+    def _abrir_snapshot(self):
+        existe = self.caminho_snapshot is not None and os.path.exists(self.caminho_snapshot)
+        return carregar_snapshot(self.caminho_snapshot) if existe else ArmazenamentoIndexado()
+
+    @staticmethod
+    def _reaplicar_diario(armazenamento, caminho):
+        """Insere os registros do diário em 'armazenamento' e retorna o tamanho válido do arquivo."""
+        registros, tamanho_valido = ler_diario(caminho)
+        tabelas = armazenamento.tabelas()
+        for tabela, objeto in registros:
+            try:
+                tabelas[tabela].inserir(objeto)
+            except KeyError:
+                pass  # Já está no snapshot (compactação interrompida depois de trocar o arquivo)
+        return tamanho_valido
+
+    def _existe(self, tabela, chave):
+        # Chamado com self._lock: uma chave esperando o diário já conta como usada
+        return chave in self.armazenamento.tabelas()[tabela] or chave in self._reservados[tabela]
+
+    def _registrar(self, tabela, objeto):
+        # Chamado com self._lock: a ordem do diário é a dos cadastros. Sem diário, o
+        # registro entra já no armazenamento; com ele, só em _confirmar, depois de
+        # gravado, e até lá a chave fica reservada
+        tabela_dados = self.armazenamento.tabelas()[tabela]
+        if self._diario is None:
+            tabela_dados.inserir(objeto)
+            return None
+        campo = tabela_dados.campo_chave
+        if getattr(objeto, campo) is None:
+            setattr(objeto, campo, tabela_dados.reservar_chave())
+        chave = getattr(objeto, campo)
+        if self._existe(tabela, chave):
+            raise KeyError(chave)  # Como TabelaIndexada.inserir
+        self._reservados[tabela].add(chave)
+        try:
+            return self._diario.registrar(tabela, objeto)
+        except Exception:
+            self._reservados[tabela].discard(chave)
+            raise
+
+    def _confirmar(self, tabela, objeto, pendente):
+        """Espera o diário gravar o registro e então o insere; retorna False se a gravação falhou."""
+        # Fora do self._lock, para que outros cadastros entrem no mesmo fsync
+        if pendente is None:
+            return True
+        try:
+            pendente.esperar()
+            gravou = True
+        except OSError:
+            gravou = False  # Já informado pela gravadora do diário
+        with self._lock:
+            tabela_dados = self.armazenamento.tabelas()[tabela]
+            chave = getattr(objeto, tabela_dados.campo_chave)
+            self._reservados[tabela].discard(chave)
+            if gravou and chave not in tabela_dados:  # Uma compactação pode já tê-lo trazido do diário
+                tabela_dados.inserir(objeto)
+        if gravou:
+            self._talvez_compactar()
+        return gravou
+
+    def _talvez_compactar(self):
+        if self._diario.tamanho < DIARIO_CONFIG['compactar_apos_bytes']:
+            return
+        with self._lock:
+            if self._compactacao is not None and self._compactacao.is_alive():
+                return
+            self._compactacao = threading.Thread(target=self._compactar_em_segundo_plano, name="compactacao-diario",
+                                                 daemon=True)
+            self._compactacao.start()
+
+    def _compactar_em_segundo_plano(self):
+        try:
+            self.compactar()
+        except Exception as err:
+            print(f"Erro ao compactar o diário de alterações: {err}")
+
+    def compactar(self):
+        """Incorpora o diário a um snapshot novo e retorna o número de registros gravados.
+
+        O diário é passado para um arquivo ".compactando" e esvaziado; o
+        snapshot novo é montado a partir do snapshot atual (aberto à parte)
+        mais esse arquivo, sem usar o armazenamento em uso. Só a troca final
+        (reabrir o snapshot e reaplicar o pouco que entrou no diário nesse
+        meio-tempo) segura os cadastros.
+        """
+        with self._lock_arquivos:
+            with self._lock:
+                self._diario.rotacionar(self._caminho_compactando)
+            base = self._abrir_snapshot()
+            self._reaplicar_diario(base, self._caminho_compactando)
+            novo = self.caminho_snapshot + ".novo"
+            total = salvar_snapshot(base, novo)
+            if hasattr(base, "fechar"):
+                base.fechar()
+            with self._lock:
+                self._diario.sincronizar()
+                if hasattr(self.armazenamento, "fechar"):
+                    self.armazenamento.fechar()
+                os.replace(novo, self.caminho_snapshot)
+                armazenamento = carregar_snapshot(self.caminho_snapshot)
+                self._reaplicar_diario(armazenamento, self.caminho_diario)
+                self.armazenamento = armazenamento
+                os.remove(self._caminho_compactando)
+            return total
+
+    def salvar(self, reabrir=True):
+        """Grava todos os dados no snapshot e retorna o número de registros gravados.
+
+        Com reabrir=True, o repositório passa a ler do arquivo recém-gravado.
+        Com diário, ele é esvaziado (tudo já está no snapshot).
+        """
+        with self._lock_arquivos, self._lock:
+            total = salvar_snapshot(self.armazenamento, self.caminho_snapshot)
+            if self._diario is not None:
+                self._diario.sincronizar()
+                self._diario.esvaziar()
+                if os.path.exists(self._caminho_compactando):
+                    os.remove(self._caminho_compactando)
+            if reabrir:
+                self.armazenamento = carregar_snapshot(self.caminho_snapshot)
+            return total
+
+    def fechar(self):
+        super().fechar()
+        if self._diario is not None:
+            if self._compactacao is not None:
+                self._compactacao.join()
+            self._diario.fechar()  # Os cadastros desde o snapshot ficam no diário
+        elif self.caminho_snapshot is not None:
+            self.salvar(reabrir=False)
+        if hasattr(self.armazenamento, "fechar"):
+            self.armazenamento.fechar()  # Libera o arquivo do snapshot aberto
+
+    # --- Cadastro ---
+
+    def add_cliente(self, cliente):
+        with self._lock:
+            if self._existe("clientes", cliente.cpf):
+                raise DuplicateCliente(cliente.cpf)
+            pendente = self._registrar("clientes", cliente)
+        if not self._confirmar("clientes", cliente, pendente):
+            return False
+        self._indexar_cliente(cliente)
+        return True
+
+    def add_processo(self, processo):
+        with self._lock:
+            if self._existe("processos", processo.numero):
+                raise DuplicateProcesso(processo.numero)
+            if processo.cliente_cpf not in self.armazenamento.clientes:
+                raise ClienteNotFound(processo.cliente_cpf)
+            pendente = self._registrar("processos", processo)
+        return self._confirmar("processos", processo, pendente)
+
+    def add_pagamento(self, pagamento):
+        with self._lock:
+            if pagamento.cliente_cpf not in self.armazenamento.clientes:
+                raise ClienteNotFound(pagamento.cliente_cpf)
+            pendente = self._registrar("pagamentos", pagamento)
+        return self._confirmar("pagamentos", pagamento, pendente)
+
+    def add_audiencia(self, audiencia):
+        with self._lock_agenda, self._lock:
+            processo = self.armazenamento.processos.obter(audiencia.processo_numero)
+            if processo is None:
+                raise ProcessoNotFound(audiencia.processo_numero)
+            # Como no banco, o cliente da audiência é o cliente do processo
+            audiencia.cliente_cpf = processo.cliente_cpf
+            self._verificar_horario(audiencia)
+            pendente = self._registrar("audiencias", audiencia)
+            self._agenda.adicionar(audiencia)  # Já ocupa o horário enquanto o diário grava
+        if self._confirmar("audiencias", audiencia, pendente):
+            return True
+        with self._lock_agenda:
+            self._agenda.remover(audiencia)
+        return False
+
+    def find_cliente_by_cpf(self, cpf):
+        with self._lock:
+            return self.armazenamento.clientes.obter(cpf)
+
+    def find_processo_by_numero(self, numero):
+        with self._lock:
+            return self.armazenamento.processos.obter(numero)
+
+    def find_processos_by_cpf(self, cpf):
+        with self._lock:
+            return sorted(self.armazenamento.processos_por_cpf(cpf), key=lambda p: p.numero)
+
+    def visao_cliente_by_cpf(self, cpf):
+        with self._lock:
+            return visao_cliente.visao_em_memoria(self.armazenamento, cpf)
+
+    def find_clientes_by_cpfs(self, cpfs):
+        with self._lock:
+            return {cpf: self.armazenamento.clientes.obter(cpf) for cpf in cpfs}
+
+    def find_processos_by_numeros(self, numeros):
+        with self._lock:
+            return {numero: self.armazenamento.processos.obter(numero) for numero in numeros}
+
+    def find_pagamentos_by_cpf(self, cpf, apos_id=None, limite=None):
+        with self._lock:
+            return self.armazenamento.pagamentos.pagina_por("cliente_cpf", cpf, apos_id, limite)
+
+    def find_audiencias_by_processo(self, numero_processo, apos_id=None, limite=None):
+        with self._lock:
+            return self.armazenamento.audiencias.pagina_por("processo_numero", numero_processo, apos_id, limite)
+
+    def exportar(self, tabela, tamanho_bloco=10000):
+        with self._lock:
+            objetos = list(self.armazenamento.tabelas()[tabela])  # Cópia: cadastros podem chegar durante a exportação
+        yield from objetos
+
+    def totais_por_cliente(self, inicio=None, fim=None):
+        with self._lock:
+            return relatorios_financeiros.totais_por_cliente_em_memoria(self.armazenamento, inicio, fim)
+
+    def totais_por_mes(self, inicio=None, fim=None):
+        with self._lock:
+            return relatorios_financeiros.totais_por_mes_em_memoria(self.armazenamento, inicio, fim)
+
+    def situacao_pagamentos(self, hoje=None):
+        with self._lock:
+            return relatorios_financeiros.situacao_em_memoria(self.armazenamento, hoje)
+
+    def _listar_nomes(self):
+        with self._lock:
+            return [(cliente.cpf, cliente.nome) for cliente in self.armazenamento.clientes]
+
+    def _listar_audiencias(self):
+        with self._lock:
+            return list(self.armazenamento.audiencias)
+
+
+# --- Backend SQLite ---
+
+# Ajustes para um único posto: WAL deixa leituras rodarem junto com a escrita,
+# synchronous=NORMAL é seguro em WAL e evita um fsync por commit.
+PRAGMAS_SQLITE = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "foreign_keys": "ON",
+    "temp_store": "MEMORY",
+    "cache_size": "-65536",   # 64 MB de cache de páginas
+    "mmap_size": "268435456", # Até 256 MB lidos por mmap
+    "busy_timeout": "5000",   # Espera até 5s por um lock em vez de falhar
+}
+
+ESQUEMA_SQLITE = [
+    """CREATE TABLE IF NOT EXISTS clientes (
+           cpf TEXT NOT NULL PRIMARY KEY, nome TEXT NOT NULL, idade INTEGER,
+           telefone TEXT, endereco TEXT, email TEXT)""",
+    """CREATE TABLE IF NOT EXISTS processos (
+           numero_processo TEXT NOT NULL PRIMARY KEY,
+           cliente_cpf TEXT NOT NULL REFERENCES clientes(cpf), descricao TEXT)""",
+    """CREATE TABLE IF NOT EXISTS pagamentos (
+           id INTEGER PRIMARY KEY AUTOINCREMENT,
+           cliente_cpf TEXT NOT NULL REFERENCES clientes(cpf),
+           valor REAL NOT NULL, descricao TEXT,
+           data_vencimento TEXT, data_pagamento TEXT)""",
+    """CREATE TABLE IF NOT EXISTS audiencias (
+           id INTEGER PRIMARY KEY AUTOINCREMENT,
+           numero_processo TEXT NOT NULL REFERENCES processos(numero_processo),
+           data_hora TEXT NOT NULL, local TEXT, tipo TEXT)""",
+    "CREATE INDEX IF NOT EXISTS ix_processos_cliente_cpf ON processos (cliente_cpf)",
+    "CREATE INDEX IF NOT EXISTS ix_pagamentos_cliente_cpf_id ON pagamentos (cliente_cpf, id)",
+    "CREATE INDEX IF NOT EXISTS ix_audiencias_numero_processo_id ON audiencias (numero_processo, id)",
+]
+
+# Colunas acrescentadas depois da primeira versão (arquivos antigos ganham a coluna ao abrir).
+COLUNAS_NOVAS_SQLITE = [
+    ("pagamentos", "data_vencimento", "TEXT"),
+    ("pagamentos", "data_pagamento", "TEXT"),
+]
+
+# Criado depois das colunas novas: cobre os relatórios financeiros sem ler a tabela
+INDICES_NOVOS_SQLITE = [
+    "CREATE INDEX IF NOT EXISTS ix_pagamentos_relatorio ON pagamentos (cliente_cpf, data_vencimento, data_pagamento, valor)",
+]
+
+# Registro de alterações lido por 'exportar_alteracoes.py' (mesma ideia da migração 4 do MySQL)
+ALTERACOES_SQLITE = [
+    """CREATE TABLE IF NOT EXISTS alteracoes (
+           versao INTEGER PRIMARY KEY AUTOINCREMENT, tabela TEXT NOT NULL,
+           registro_id INTEGER NOT NULL, operacao TEXT NOT NULL,
+           alterado_em TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')))""",
+    "CREATE INDEX IF NOT EXISTS ix_alteracoes_tabela_versao ON alteracoes (tabela, versao)",
+] + [f"""CREATE TRIGGER IF NOT EXISTS tr_{tabela}_{evento.lower()} AFTER {evento} ON {tabela}
+         BEGIN INSERT INTO alteracoes (tabela, registro_id, operacao) VALUES ('{tabela}', {linha}.id, '{evento[0]}'); END"""
+     for tabela in ("pagamentos", "audiencias")
+     for evento, linha in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD"))]
+
+_contador_memoria_sqlite = count(1)
+
+def _data_iso(valor):
+    return valor.isoformat() if valor is not None else None
+
+def _data_de_iso(texto):
+    return date.fromisoformat(texto) if texto else None
+
+def _pagamento_sqlite(linha):
+    *inicio, vencimento, pago = linha
+    return PagamentoConcreto.de_linha((*inicio, _data_de_iso(vencimento), _data_de_iso(pago)))
+
+# Exportação: mesmas colunas das buscas, em ordem de chave, e como montar cada objeto
+EXPORTAR_SQLITE = {
+    "clientes": ("SELECT nome, cpf, idade, telefone, endereco, email FROM clientes ORDER BY cpf",
+                 ClienteConcreto.de_linha),
+    "processos": ("SELECT numero_processo, descricao, cliente_cpf FROM processos ORDER BY numero_processo",
+                  ProcessoConcreto.de_linha),
+    "pagamentos": ("SELECT cliente_cpf, valor, descricao, id, data_vencimento, data_pagamento FROM pagamentos ORDER BY id",
+                   _pagamento_sqlite),
+    "audiencias": ("""SELECT a.numero_processo, a.data_hora, a.local, a.tipo, p.cliente_cpf, a.id
+                      FROM audiencias a JOIN processos p ON a.numero_processo = p.numero_processo ORDER BY a.id""",
+                   AudienciaConcreta.de_linha),
+}
+
+# Chaves por consulta IN (...) nas buscas em lote (SQLite antigo aceita até 999 parâmetros)
+TAMANHO_BLOCO_CHAVES_SQLITE = 500
+
+def _pagina_sqlite(campo_id, apos_id, limite):
+    sql, params = "", []
+    if apos_id is not None:
+        sql += f" AND {campo_id} > ?"; params.append(apos_id)
+    sql += f" ORDER BY {campo_id}"
+    if limite is not None:
+        sql += " LIMIT ?"; params.append(limite)
+    return sql, params
+
+
+class RepositorioSQLite(Repositorio):
+    """Repositório num arquivo SQLite local (WAL, uma conexão por thread).
+
+    Com caminho ":memory:" o banco fica na memória, compartilhado entre as
+    threads do processo enquanto o repositório estiver aberto.
+    """
+
+    nome = "sqlite"
+
+    def __init__(self, caminho=None):
+        super().__init__()
+        caminho = caminho or REPOSITORIO_CONFIG['caminho_sqlite']
+        if caminho == ":memory:":
+            self._alvo = f"file:repositorio_{next(_contador_memoria_sqlite)}?mode=memory&cache=shared"
+            self._uri = True
+        else:
+            self._alvo, self._uri = caminho, False
+        self.caminho = caminho
+        self._local = threading.local()
+        self._conexoes = []
+        self._lock = threading.Lock()
+        conn = self._conexao()  # Mantém o banco em memória vivo e cria o esquema
+        for comando in ESQUEMA_SQLITE:
+            conn.execute(comando)
+        for tabela, coluna, tipo in COLUNAS_NOVAS_SQLITE:
+            if coluna not in {linha[1] for linha in conn.execute(f"PRAGMA table_info({tabela})")}:
+                conn.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {tipo}")
+        for comando in INDICES_NOVOS_SQLITE + ALTERACOES_SQLITE:
+            conn.execute(comando)
+        conn.commit()
+
+    def _conexao(self):
+        """Retorna a conexão da thread atual, abrindo-a (com os PRAGMAs) na primeira vez."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._alvo, uri=self._uri, check_same_thread=False)
+            for nome, valor in PRAGMAS_SQLITE.items():
+                if nome == "journal_mode" and self.caminho == ":memory:":
+                    continue  # Banco em memória não usa WAL
+                conn.execute(f"PRAGMA {nome} = {valor}")
+            self._local.conn = conn
+            with self._lock:
+                self._conexoes.append(conn)
+        return conn
+
+    def fechar(self):
+        super().fechar()
+        with self._lock:
+            conexoes, self._conexoes = self._conexoes, []
+        for conn in conexoes:
+            conn.close()
+        self._local = threading.local()
+
+    def _inserir(self, sql, valores, descricao, duplicado=None, sem_referencia=None):
+        conn = self._conexao()
+        anotar(sql=sql)
+        try:
+            with fase("execucao"), conn:  # Commit ao sair; rollback em caso de erro
+                cursor = conn.execute(sql, valores)
+            registrar_linhas(cursor.rowcount)
+            return cursor.lastrowid
+        except sqlite3.IntegrityError as err:
+            mensagem = str(err)
+            if mensagem.startswith(("UNIQUE", "PRIMARY KEY")) and duplicado is not None:
+                raise duplicado from err
+            if mensagem.startswith("FOREIGN KEY") and sem_referencia is not None:
+                raise sem_referencia from err
+            registrar_erro(err); print(f"Erro ao adicionar {descricao}: {err}"); return None
+        except sqlite3.Error as err:
+            registrar_erro(err); print(f"Erro ao adicionar {descricao}: {err}"); return None
+
+    @instrumentado
+    def add_cliente(self, cliente):
+        gravou = self._inserir("INSERT INTO clientes (cpf, nome, idade, telefone, endereco, email) VALUES (?, ?, ?, ?, ?, ?)",
+                               (cliente.cpf, cliente.nome, cliente.idade, cliente.telefone, cliente.endereco, cliente.email),
+                               "cliente", duplicado=DuplicateCliente(cliente.cpf)) is not None
+        if gravou: self._indexar_cliente(cliente)
+        return gravou
+
+    @instrumentado
+    def add_processo(self, processo):
+        return self._inserir("INSERT INTO processos (numero_processo, cliente_cpf, descricao) VALUES (?, ?, ?)",
+                             (processo.numero, processo.cliente_cpf, processo.descricao), "processo",
+                             duplicado=DuplicateProcesso(processo.numero),
+                             sem_referencia=ClienteNotFound(processo.cliente_cpf)) is not None
+
+    @instrumentado
+    def add_pagamento(self, pagamento):
+        id_pagamento = self._inserir("INSERT INTO pagamentos (cliente_cpf, valor, descricao, data_vencimento, data_pagamento) "
+                                     "VALUES (?, ?, ?, ?, ?)",
+                                     (pagamento.cliente_cpf, pagamento.valor, pagamento.descricao,
+                                      _data_iso(pagamento.data_vencimento), _data_iso(pagamento.data_pagamento)),
+                                     "pagamento", sem_referencia=ClienteNotFound(pagamento.cliente_cpf))
+        if id_pagamento is None: return False
+        pagamento.id_pagamento = id_pagamento
+        return True
+
+    @instrumentado
+    def add_audiencia(self, audiencia):
+        with self._lock_agenda:
+            self._verificar_horario(audiencia)
+            id_audiencia = self._inserir("INSERT INTO audiencias (numero_processo, data_hora, local, tipo) VALUES (?, ?, ?, ?)",
+                                         (audiencia.processo_numero, audiencia.data_hora.isoformat(" ", "seconds"),
+                                          audiencia.local, audiencia.tipo), "audiência",
+                                         sem_referencia=ProcessoNotFound(audiencia.processo_numero))
+            if id_audiencia is None: return False
+            audiencia.id_audiencia = id_audiencia
+            self._agenda.adicionar(audiencia)
+        return True
+
+    def _consultar(self, sql, params, descricao):
+        anotar(sql=sql)
+        try:
+            with fase("execucao"): cursor = self._conexao().execute(sql, params)
+            with fase("leitura"): linhas = cursor.fetchall()
+            registrar_linhas(len(linhas))
+            return linhas
+        except sqlite3.Error as err:
+            registrar_erro(err); print(f"Erro ao buscar {descricao}: {err}"); return []
+
+    @instrumentado
+    def find_cliente_by_cpf(self, cpf):
+        linhas = self._consultar("SELECT nome, cpf, idade, telefone, endereco, email FROM clientes WHERE cpf = ?",
+                                 (cpf,), "cliente")
+        with fase("materializacao"):
+            return ClienteConcreto.de_linha(linhas[0]) if linhas else None
+
+    @instrumentado
+    def find_processo_by_numero(self, numero):
+        linhas = self._consultar("SELECT numero_processo, descricao, cliente_cpf FROM processos WHERE numero_processo = ?",
+                                 (numero,), "processo")
+        with fase("materializacao"):
+            return ProcessoConcreto.de_linha(linhas[0]) if linhas else None
+
+    def _buscar_por_chaves(self, sql, chaves, de_linha, posicao_chave, descricao):
+        resultado = dict.fromkeys(chaves)
+        faltam = list(resultado)
+        for i in range(0, len(faltam), TAMANHO_BLOCO_CHAVES_SQLITE):
+            bloco = faltam[i:i + TAMANHO_BLOCO_CHAVES_SQLITE]
+            linhas = self._consultar(sql.format(marcadores=", ".join("?" * len(bloco))), bloco, descricao)
+            with fase("materializacao"):
+                for linha in linhas:
+                    resultado[linha[posicao_chave]] = de_linha(linha)
+        return resultado
+
+    @instrumentado
+    def find_processos_by_cpf(self, cpf):
+        linhas = self._consultar("SELECT numero_processo, descricao, cliente_cpf FROM processos "
+                                 "WHERE cliente_cpf = ? ORDER BY numero_processo", (cpf,), "processos")
+        with fase("materializacao"):
+            return [ProcessoConcreto.de_linha(linha) for linha in linhas]
+
+    @instrumentado
+    def visao_cliente_by_cpf(self, cpf):
+        linhas = self._consultar(visao_cliente.SQL_VISAO_CLIENTE.replace("%s", "?"),
+                                 visao_cliente.parametros_visao(cpf), "visão do cliente")
+        with fase("materializacao"):
+            return visao_cliente.montar_visao(linhas)
+
+    @instrumentado
+    def find_clientes_by_cpfs(self, cpfs):
+        return self._buscar_por_chaves("SELECT nome, cpf, idade, telefone, endereco, email FROM clientes "
+                                       "WHERE cpf IN ({marcadores})", cpfs, ClienteConcreto.de_linha, 1, "clientes")
+
+    @instrumentado
+    def find_processos_by_numeros(self, numeros):
+        return self._buscar_por_chaves("SELECT numero_processo, descricao, cliente_cpf FROM processos "
+                                       "WHERE numero_processo IN ({marcadores})", numeros,
+                                       ProcessoConcreto.de_linha, 0, "processos")
+
+    @instrumentado
+    def find_pagamentos_by_cpf(self, cpf, apos_id=None, limite=None):
+        pagina_sql, pagina_params = _pagina_sqlite("id", apos_id, limite)
+        linhas = self._consultar("SELECT cliente_cpf, valor, descricao, id, data_vencimento, data_pagamento "
+                                 "FROM pagamentos WHERE cliente_cpf = ?" + pagina_sql,
+                                 (cpf, *pagina_params), "pagamentos")
+        with fase("materializacao"):
+            return [_pagamento_sqlite(linha) for linha in linhas]
+
+    @instrumentado
+    def find_audiencias_by_processo(self, numero_processo, apos_id=None, limite=None):
+        pagina_sql, pagina_params = _pagina_sqlite("a.id", apos_id, limite)
+        linhas = self._consultar("""SELECT a.numero_processo, a.data_hora, a.local, a.tipo, p.cliente_cpf, a.id
+                                    FROM audiencias a JOIN processos p ON a.numero_processo = p.numero_processo
+                                    WHERE a.numero_processo = ?""" + pagina_sql,
+                                 (numero_processo, *pagina_params), "audiências")
+        with fase("materializacao"):
+            return [AudienciaConcreta.de_linha(linha) for linha in linhas]
+
+    def exportar(self, tabela, tamanho_bloco=10000):
+        sql, montar = EXPORTAR_SQLITE[tabela]
+        cursor = self._conexao().execute(sql)  # Erros são propagados, como no MySQL
+        while linhas := cursor.fetchmany(tamanho_bloco):
+            for linha in linhas:
+                yield montar(linha)
+
+    def _relatorio(self, sql, params, descricao):
+        # Mesmo SQL do MySQL, com os marcadores do sqlite3
+        return self._consultar(sql.replace("%s", "?"), params, f"relatório de {descricao}")
+
+    @instrumentado
+    def totais_por_cliente(self, inicio=None, fim=None):
+        sql, params = relatorios_financeiros.sql_totais_por_cliente(inicio, fim)
+        return relatorios_financeiros.montar(relatorios_financeiros.COLUNAS_POR_CLIENTE,
+                                             self._relatorio(sql, params, "totais por cliente"))
+
+    @instrumentado
+    def totais_por_mes(self, inicio=None, fim=None):
+        sql, params = relatorios_financeiros.sql_totais_por_mes(inicio, fim)
+        return relatorios_financeiros.montar(relatorios_financeiros.COLUNAS_POR_MES,
+                                             self._relatorio(sql, params, "totais por mês"))
+
+    @instrumentado
+    def situacao_pagamentos(self, hoje=None):
+        sql, params = relatorios_financeiros.sql_situacao(hoje)
+        return relatorios_financeiros.montar_situacao(self._relatorio(sql, params, "situação dos pagamentos"))
+
+    @instrumentado
+    def _listar_nomes(self):
+        return self._consultar("SELECT cpf, nome FROM clientes", (), "nomes dos clientes")
+
+    @instrumentado
+    def _listar_audiencias(self):
+        linhas = self._consultar("""SELECT a.numero_processo, a.data_hora, a.local, a.tipo, p.cliente_cpf, a.id
+                                    FROM audiencias a JOIN processos p ON a.numero_processo = p.numero_processo""",
+                                 (), "audiências")
+        with fase("materializacao"):
+            return [AudienciaConcreta.de_linha(linha) for linha in linhas]
+
+
+# --- Backend MySQL ---
+
+class RepositorioMySQL(Repositorio):
+    """Repositório sobre as funções de 'banco_dados.py' (pool, cache e restrições do MySQL)."""
+
+    nome = "mysql"
+
+    def __init__(self):
+        super().__init__()
+        import banco_dados  # Importado aqui para que os outros backends não exijam o driver do MySQL
+        self.bd = banco_dados
+
+    def verificar_conexao(self):
+        try:
+            self.bd.POOL.aquecer()
+            return True
+        except self.bd.ERROS_BD:
+            return False
+
+    def fechar(self):
+        super().fechar()
+        self.bd.ROTEADOR.fechar()
+
+    def add_cliente(self, cliente):
+        gravou = self.bd.add_cliente(cliente)
+        if gravou: self._indexar_cliente(cliente)
+        return gravou
+
+    def add_processo(self, processo):
+        return self.bd.add_processo(processo)
+
+    def add_pagamento(self, pagamento):
+        return self.bd.add_pagamento(pagamento)
+
+    def add_audiencia(self, audiencia):
+        # O conflito é conferido no banco, na transação do INSERT: a agenda em
+        # memória não vê o que outros usuários agendaram depois de montada
+        with self._lock_agenda:
+            gravou = self.bd.add_audiencia(audiencia, verificar_conflitos=True)
+            if gravou and self._agenda is not None: self._agenda.adicionar(audiencia)
+        return gravou
+
+    def find_cliente_by_cpf(self, cpf):
+        return self.bd.find_cliente_by_cpf(cpf)
+
+    def find_processo_by_numero(self, numero):
+        return self.bd.find_processo_by_numero(numero)
+
+    def find_processos_by_cpf(self, cpf):
+        return self.bd.find_processos_by_cpf(cpf)
+
+    def visao_cliente_by_cpf(self, cpf):
+        return self.bd.visao_cliente_by_cpf(cpf)
+
+    def find_clientes_by_cpfs(self, cpfs):
+        return self.bd.find_clientes_by_cpfs(cpfs)
+
+    def find_processos_by_numeros(self, numeros):
+        return self.bd.find_processos_by_numeros(numeros)
+
+    def find_pagamentos_by_cpf(self, cpf, apos_id=None, limite=None):
+        return self.bd.find_pagamentos_by_cpf(cpf, apos_id=apos_id, limite=limite)
+
+    def find_audiencias_by_processo(self, numero_processo, apos_id=None, limite=None):
+        return self.bd.find_audiencias_by_processo(numero_processo, apos_id=apos_id, limite=limite)
+
+    def exportar(self, tabela, tamanho_bloco=10000):
+        return self.bd.exportar(tabela, tamanho_bloco)
+
+    def totais_por_cliente(self, inicio=None, fim=None):
+        return self.bd.totais_por_cliente(inicio, fim)
+
+    def totais_por_mes(self, inicio=None, fim=None):
+        return self.bd.totais_por_mes(inicio, fim)
+
+    def situacao_pagamentos(self, hoje=None):
+        return self.bd.situacao_pagamentos(hoje)
+
+    def _listar_nomes(self):
+        return self.bd.listar_nomes_clientes()
+
+    def _listar_audiencias(self):
+        return self.bd.listar_audiencias()
+
+
+BACKENDS = {
+    "memoria": RepositorioMemoria,
+    "sqlite": RepositorioSQLite,
+    "mysql": RepositorioMySQL,
+}
+
+def criar_repositorio(backend_padrao="memoria", **opcoes):
+    """Cria o repositório configurado em REPOSITORIO_CONFIG (ou 'backend_padrao' se não houver)."""
+    backend = REPOSITORIO_CONFIG['backend'] or backend_padrao
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend '{backend}' desconhecido. Use um de: {', '.join(BACKENDS)}.")
+    return BACKENDS[backend](**opcoes)
@@ -0,0 +1,149 @@
+# repositorio_assincrono.py
+# =====================================================================
+# ACESSO A DADOS COM ASYNCIO (CONSULTAS CONCORRENTES)
+# Versão 'async def' das operações do Repositorio, para validar muitos
+# CPFs/processos de uma vez sem fazer uma consulta depois da outra:
+#
+#   repo_async = RepositorioAssincrono(criar_repositorio("mysql"))
+#   clientes = await repo_async.buscar_clientes(cpfs)     # {cpf: cliente ou None}
+#
+# Os drivers usados (mysql.connector, sqlite3) são bloqueantes; cada
+# chamada roda numa thread de um executor próprio sobre o repositório de
+# sempre, com o mesmo pool de conexões, cache e medições. O número de
+# threads limita quantas consultas rodam ao mesmo tempo (no MySQL, no
+# máximo o tamanho do pool, para não esperar por conexão livre); as demais
+# esperam na fila do executor sem ocupar o laço de eventos.
+#
+# Fora de código asyncio (ex.: nas interfaces), use a função síncrona:
+#   clientes = buscar_clientes_em_lote(repo, cpfs)
+# Os atalhos síncronos reaproveitam um único RepositorioAssincrono por
+# repositório: no SQLite cada thread abre a sua conexão e ela só é fechada
+# em repo.fechar(), então um executor novo a cada chamada acumularia
+# conexões abertas. repo.fechar() encerra também essas threads.
+# =====================================================================
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+ASSINCRONO_CONFIG = {
+    'max_concorrencia': 16,  # Consultas simultâneas por RepositorioAssincrono
+}
+
+
+class RepositorioAssincrono:
+    """Envolve um Repositorio e expõe as mesmas operações como corrotinas.
+
+    - repo: qualquer Repositorio (memoria, sqlite, mysql).
+    - max_concorrencia: consultas rodando ao mesmo tempo (padrão:
+      ASSINCRONO_CONFIG, limitado ao tamanho máximo do pool do MySQL).
+    Os erros de cadastro (DuplicateCliente, ...) chegam como no repositório.
+    Chame fechar() ao terminar para encerrar as threads.
+    """
+
+    def __init__(self, repo, max_concorrencia=None):
+        self.repo = repo
+        if max_concorrencia is None:
+            max_concorrencia = ASSINCRONO_CONFIG['max_concorrencia']
+            pool = getattr(getattr(repo, "bd", None), "POOL", None)
+            if pool is not None:
+                max_concorrencia = min(max_concorrencia, pool.tamanho_maximo)
+        self.max_concorrencia = max_concorrencia
+        self._executor = ThreadPoolExecutor(max_workers=max_concorrencia, thread_name_prefix="repositorio-async")
+
+    def fechar(self):
+        """Encerra as threads (não fecha o repositório envolvido)."""
+        self._executor.shutdown(wait=True)
+
+    async def _executar(self, funcao, *args, **kwargs):
+        # Como asyncio.to_thread, leva o contexto (span atual da instrumentação) para a thread
+        contexto = contextvars.copy_context()
+        chamada = functools.partial(contexto.run, funcao, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, chamada)
+
+    # --- Cadastro ---
+
+    async def add_cliente(self, cliente):
+        return await self._executar(self.repo.add_cliente, cliente)
+
+    async def add_processo(self, processo):
+        return await self._executar(self.repo.add_processo, processo)
+
+    async def add_pagamento(self, pagamento):
+        return await self._executar(self.repo.add_pagamento, pagamento)
+
+    async def add_audiencia(self, audiencia):
+        return await self._executar(self.repo.add_audiencia, audiencia)
+
+    # --- Buscas ---
+
+    async def find_cliente_by_cpf(self, cpf):
+        return await self._executar(self.repo.find_cliente_by_cpf, cpf)
+
+    async def find_processo_by_numero(self, numero):
+        return await self._executar(self.repo.find_processo_by_numero, numero)
+
+    async def find_processos_by_cpf(self, cpf):
+        return await self._executar(self.repo.find_processos_by_cpf, cpf)
+
+    async def visao_cliente_by_cpf(self, cpf):
+        return await self._executar(self.repo.visao_cliente_by_cpf, cpf)
+
+    async def find_clientes_by_cpfs(self, cpfs):
+        return await self._executar(self.repo.find_clientes_by_cpfs, list(cpfs))
+
+    async def find_processos_by_numeros(self, numeros):
+        return await self._executar(self.repo.find_processos_by_numeros, list(numeros))
+
+    async def find_pagamentos_by_cpf(self, cpf, apos_id=None, limite=None):
+        return await self._executar(self.repo.find_pagamentos_by_cpf, cpf, apos_id, limite)
+
+    async def find_audiencias_by_processo(self, numero_processo, apos_id=None, limite=None):
+        return await self._executar(self.repo.find_audiencias_by_processo, numero_processo, apos_id, limite)
+
+    # --- Em lote ---
+
+    async def em_lote(self, funcao, argumentos, retornar_excecoes=False):
+        """Chama a corrotina 'funcao' para cada argumento ao mesmo tempo; resultados na ordem dos argumentos.
+
+        Ex.: await repo_async.em_lote(repo_async.find_processo_by_numero, numeros).
+        Com retornar_excecoes=True, um erro vira o item do resultado em vez
+        de interromper o lote (como em asyncio.gather).
+        """
+        return await asyncio.gather(*(funcao(argumento) for argumento in argumentos),
+                                    return_exceptions=retornar_excecoes)
+
+    async def buscar_clientes(self, cpfs):
+        """Retorna {cpf: cliente ou None} para os CPFs (repetidos são buscados uma vez)."""
+        cpfs = list(dict.fromkeys(cpfs))
+        return dict(zip(cpfs, await self.em_lote(self.find_cliente_by_cpf, cpfs)))
+
+    async def buscar_processos(self, numeros):
+        """Retorna {número: processo ou None} para os números de processo."""
+        numeros = list(dict.fromkeys(numeros))
+        return dict(zip(numeros, await self.em_lote(self.find_processo_by_numero, numeros)))
+
+
+# --- Atalhos síncronos ---
+
+def _assincrono_de(repo, max_concorrencia):
+    """RepositorioAssincrono compartilhado pelos atalhos (um por repositório e limite de concorrência).
+
+    Fica em repo._assincronos (declarado em Repositorio) até repo.fechar(),
+    que encerra as threads antes de fechar as conexões; no SQLite elas abrem
+    no máximo 'max_concorrencia' conexões.
+    """
+    with repo._lock_assincronos:
+        repo_async = repo._assincronos.get(max_concorrencia)
+        if repo_async is None:
+            repo_async = repo._assincronos[max_concorrencia] = RepositorioAssincrono(repo, max_concorrencia)
+        return repo_async
+
+def buscar_clientes_em_lote(repo, cpfs, max_concorrencia=None):
+    """Versão síncrona de RepositorioAssincrono.buscar_clientes (não chamar de dentro de um laço asyncio)."""
+    return asyncio.run(_assincrono_de(repo, max_concorrencia).buscar_clientes(cpfs))
+
+def buscar_processos_em_lote(repo, numeros, max_concorrencia=None):
+    """Versão síncrona de RepositorioAssincrono.buscar_processos."""
+    return asyncio.run(_assincrono_de(repo, max_concorrencia).buscar_processos(numeros))
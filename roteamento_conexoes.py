@@ -0,0 +1,165 @@
+# roteamento_conexoes.py
+# =====================================================================
+# ROTEAMENTO DE CONEXÕES: PRIMÁRIO E RÉPLICAS DE LEITURA
+# As buscas saem de réplicas de leitura e os cadastros vão para o
+# primário, para que as consultas não disputem o servidor com as
+# gravações. Cada servidor tem o seu PoolConexoes; este módulo só escolhe
+# de qual pool sai cada conexão de leitura.
+#
+# - Estratégias: "rodizio" (uma réplica de cada vez) ou "menor_latencia"
+#   (a de menor tempo médio recente; a cada 'explorar_a_cada' leituras uma
+#   vai por rodízio, para que as outras continuem sendo medidas).
+# - Ler o que gravou: por 'janela_leitura_propria' segundos depois de uma
+#   gravação as leituras vão ao primário, para que quem acabou de cadastrar
+#   não deixe de ver o cadastro por atraso da replicação. A janela vale para
+#   o processo inteiro (cada interface atende um usuário), não por thread: o
+#   cadastro e a busca seguinte costumam rodar em threads diferentes do
+#   ExecutorTarefas.
+# - Réplica fora do ar: se não for possível conectar, ela fica de quarentena
+#   por 'quarentena' segundos e a leitura vai para outra réplica ou para o
+#   primário. Erros durante a consulta chegam a quem chamou, como antes.
+# Sem réplicas, tudo vai para o primário.
+# =====================================================================
+
+import threading
+import time
+from contextlib import contextmanager, ExitStack
+
+from pool_conexoes import PoolEsgotado
+
+ESTRATEGIAS = ("rodizio", "menor_latencia")
+
+
+def replicas_de_texto(texto):
+    """Converte "host:porta,host:porta" (ex.: SISTEMA_JURIDICO_REPLICAS) em [{'host': ..., 'port': ...}]."""
+    replicas = []
+    for item in (texto or "").split(","):
+        host, separador, porta = item.strip().partition(":")
+        if not host: continue
+        replica = {'host': host}
+        if separador: replica['port'] = int(porta)
+        replicas.append(replica)
+    return replicas
+
+
+class RoteadorConexoes:
+    """Escolhe entre o pool do primário e os pools das réplicas para cada leitura.
+
+    'primario' e cada item de 'replicas' são PoolConexoes. As gravações usam
+    o pool do primário diretamente e avisam com registrar_escrita(); as
+    leituras pedem conexao_leitura().
+    """
+
+    def __init__(self, primario, replicas=(), estrategia="rodizio", janela_leitura_propria=5.0,
+                 quarentena=30.0, explorar_a_cada=20, peso_latencia=0.2):
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estratégia de réplicas desconhecida: '{estrategia}' (use {', '.join(ESTRATEGIAS)}).")
+        self.primario = primario
+        self.replicas = list(replicas)
+        self.estrategia = estrategia
+        self.janela_leitura_propria = janela_leitura_propria
+        self.quarentena = quarentena
+        self.explorar_a_cada = explorar_a_cada
+        self.peso_latencia = peso_latencia  # Peso da última medida na média móvel
+        self._lock = threading.Lock()
+        self._ultima_escrita = None
+        self._proxima = 0
+        self._escolhas = 0
+        self._latencia = [None] * len(self.replicas)   # Média móvel (s); None = ainda não medida
+        self._fora_ate = [0.0] * len(self.replicas)    # Fim da quarentena (time.monotonic)
+        self._leituras = [0] * len(self.replicas)
+        self._quarentenas = [0] * len(self.replicas)
+        self._leituras_primario = 0
+        self._leituras_janela = 0
+
+    @staticmethod
+    def nome_destino(indice):
+        return "primario" if indice is None else f"replica{indice + 1}"
+
+    # --- Gravações ---
+
+    def registrar_escrita(self):
+        """Avisa que o primário acabou de gravar: abre a janela de leitura no primário."""
+        with self._lock:
+            self._ultima_escrita = time.monotonic()
+
+    # --- Leituras ---
+
+    @contextmanager
+    def conexao_leitura(self):
+        """Empresta uma conexão para leitura num bloco 'with' e entrega (conexão, nome do destino)."""
+        with ExitStack() as pilha:
+            indice, conn = self._retirar_leitura(pilha)
+            inicio = time.perf_counter()
+            yield conn, self.nome_destino(indice)
+            if indice is not None:
+                self._medir(indice, time.perf_counter() - inicio)
+
+    def _retirar_leitura(self, pilha):
+        agora = time.monotonic()
+        with self._lock:
+            janela = (self._ultima_escrita is not None
+                      and agora - self._ultima_escrita < self.janela_leitura_propria)
+            candidatas = [] if janela else self._candidatas(agora)
+        for indice in candidatas:
+            try:
+                conn = pilha.enter_context(self.replicas[indice].conexao())
+            except PoolEsgotado:
+                continue  # Ocupada, não fora do ar: tenta a próxima sem quarentena
+            except Exception as err:
+                self._por_em_quarentena(indice, err)
+                continue
+            with self._lock:
+                self._leituras[indice] += 1
+            return indice, conn
+        with self._lock:
+            if janela: self._leituras_janela += 1
+            else: self._leituras_primario += 1
+        return None, pilha.enter_context(self.primario.conexao())
+
+    def _candidatas(self, agora):
+        # Chamado com o lock adquirido: réplicas fora da quarentena, na ordem de preferência.
+        disponiveis = [i for i in range(len(self.replicas)) if self._fora_ate[i] <= agora]
+        if not disponiveis:
+            return []
+        self._escolhas += 1
+        if self.estrategia == "menor_latencia" and self._escolhas % self.explorar_a_cada:
+            # Sem medida conta como 0: réplica nova (ou de volta da quarentena) é medida logo
+            return sorted(disponiveis, key=lambda i: self._latencia[i] or 0.0)
+        inicio = self._proxima % len(disponiveis)
+        self._proxima += 1
+        return disponiveis[inicio:] + disponiveis[:inicio]
+
+    def _medir(self, indice, duracao):
+        with self._lock:
+            anterior = self._latencia[indice]
+            self._latencia[indice] = duracao if anterior is None else anterior + self.peso_latencia * (duracao - anterior)
+
+    def _por_em_quarentena(self, indice, err):
+        with self._lock:
+            self._fora_ate[indice] = time.monotonic() + self.quarentena
+            self._latencia[indice] = None
+            self._quarentenas[indice] += 1
+        print(f"Réplica {self.nome_destino(indice)} indisponível ({err}); "
+              f"leituras em outro servidor pelos próximos {self.quarentena:g}s.")
+
+    # --- Manutenção ---
+
+    def fechar(self):
+        """Fecha os pools do primário e das réplicas."""
+        for pool in [self.primario, *self.replicas]:
+            pool.fechar()
+
+    def estatisticas(self):
+        """Leituras por destino, latência média de cada réplica e quarentenas."""
+        agora = time.monotonic()
+        with self._lock:
+            replicas = [{"nome": self.nome_destino(i), "leituras": self._leituras[i],
+                         "latencia_ms": None if self._latencia[i] is None else self._latencia[i] * 1000,
+                         "em_quarentena": self._fora_ate[i] > agora, "quarentenas": self._quarentenas[i]}
+                        for i in range(len(self.replicas))]
+            resumo = {"estrategia": self.estrategia, "leituras_primario": self._leituras_primario,
+                      "leituras_janela": self._leituras_janela, "replicas": replicas}
+        for replica, pool in zip(replicas, self.replicas):
+            replica["pool"] = pool.estatisticas()
+        return resumo
@@ -0,0 +1,352 @@
+# snapshot.py
+# =====================================================================
+# SNAPSHOT BINÁRIO DO ARMAZENAMENTO EM MEMÓRIA
+# Grava todas as tabelas do ArmazenamentoIndexado num único arquivo e o
+# reabre sem montar os objetos: o arquivo é mapeado na memória (mmap) e
+# cada registro só vira ClienteConcreto/ProcessoConcreto/... quando é
+# acessado. Abrir um snapshot de 1 milhão de registros leva milissegundos.
+#
+# Formato colunar (arrays na ordem de bytes da máquina que gravou, alinhados
+# em 8 bytes para serem lidos direto do mapeamento, sem cópia):
+#   - 8 bytes "SJSNAP01" + 8 bytes com a posição do cabeçalho;
+#   - para cada tabela, registros em ordem de chave primária e, para cada
+#     coluna: os valores em texto UTF-8 emendados, o início de cada valor
+#     (uint64, n + 1 posições) e, se houver None, um byte por registro
+#     (1 = None);
+#   - para cada índice secundário, os números dos registros ordenados pelo
+#     campo indexado (uint32);
+#   - no fim, o cabeçalho em JSON (tabelas, colunas e onde está cada parte).
+#
+# Buscas pela chave e pelos índices secundários usam busca binária direto
+# sobre o arquivo. Registros novos, alterados ou removidos depois de abrir
+# ficam numa camada em memória por cima do snapshot (TabelaSnapshot); só
+# um novo salvar_snapshot os grava.
+#
+# Uso:
+#   salvar_snapshot(repo.armazenamento, "sistema_juridico.snap")
+#   armazenamento = carregar_snapshot("sistema_juridico.snap")
+# =====================================================================
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from operator import attrgetter
+
+from modelo_abstrato import ClienteConcreto, ProcessoConcreto, PagamentoConcreto, AudienciaConcreta
+from armazenamento_memoria import TabelaIndexada, ArmazenamentoIndexado
+
+MAGICO = b"SJSNAP01"
+
+# Tabela -> (classe do modelo, colunas na ordem do construtor com o tipo de cada uma)
+ESQUEMA_SNAPSHOT = {
+    "clientes": (ClienteConcreto, (("nome", "str"), ("cpf", "str"), ("idade", "int"), ("telefone", "str"),
+                                   ("endereco", "str"), ("email", "str"))),
+    "processos": (ProcessoConcreto, (("numero", "str"), ("descricao", "str"), ("cliente_cpf", "str"))),
+    "pagamentos": (PagamentoConcreto, (("cliente_cpf", "str"), ("valor", "float"), ("descricao", "str"),
+                                       ("id_pagamento", "int"), ("data_vencimento", "date"), ("data_pagamento", "date"))),
+    "audiencias": (AudienciaConcreta, (("processo_numero", "str"), ("data_hora", "datetime"), ("local", "str"),
+                                       ("tipo", "str"), ("cliente_cpf", "str"), ("id_audiencia", "int"))),
+}
+
+_PARA_TEXTO = {"str": str, "int": str, "float": repr, "date": date.isoformat, "datetime": datetime.isoformat}
+_DE_TEXTO = {"str": lambda texto: texto, "int": int, "float": float,
+             "date": date.fromisoformat, "datetime": datetime.fromisoformat}
+
+
+def valores_em_texto(tabela, objeto):
+    """Lista com o texto de cada coluna do objeto (None continua None), como gravado no snapshot."""
+    _, colunas = ESQUEMA_SNAPSHOT[tabela]
+    return [None if (valor := getattr(objeto, coluna)) is None else _PARA_TEXTO[tipo](valor) for coluna, tipo in colunas]
+
+def objeto_de_texto(tabela, textos):
+    """Inverso de valores_em_texto: monta o objeto do modelo a partir dos textos."""
+    classe, colunas = ESQUEMA_SNAPSHOT[tabela]
+    return classe(*(None if texto is None else _DE_TEXTO[tipo](texto) for texto, (_, tipo) in zip(textos, colunas)))
+
+
+def _ordem(valor):
+    # Chave de ordenação dos índices secundários: None fica antes de qualquer valor
+    return (valor is not None, valor if valor is not None else "")
+
+def _alinhar(arquivo):
+    resto = arquivo.tell() % 8
+    if resto: arquivo.write(b"\0" * (8 - resto))
+
+def _escrever_array(arquivo, valores):
+    _alinhar(arquivo)
+    inicio = arquivo.tell()
+    valores.tofile(arquivo)
+    return inicio
+
+def _escrever_coluna(arquivo, valores, tipo):
+    """Grava uma coluna (texto emendado + posições + nulos) e retorna onde ficou cada parte."""
+    converter = _PARA_TEXTO[tipo]
+    textos = ["" if valor is None else converter(valor) for valor in valores]
+    emendado = "".join(textos)
+    if emendado.isascii():
+        tamanhos, dados = map(len, textos), emendado.encode("ascii")  # Em ASCII, 1 caractere = 1 byte
+    else:
+        codificados = [texto.encode("utf-8") for texto in textos]
+        tamanhos, dados = map(len, codificados), b"".join(codificados)
+    inicio = arquivo.tell()
+    arquivo.write(dados)
+    parte = {"texto": inicio, "posicoes": _escrever_array(arquivo, array("Q", accumulate(tamanhos, initial=0))),
+             "nulos": None}
+    if None in valores:
+        parte["nulos"] = arquivo.tell()
+        arquivo.write(bytes(valor is None for valor in valores))
+    return parte
+
+
+# --- Gravação ---
+
+def salvar_snapshot(armazenamento, caminho):
+    """Grava todas as tabelas de 'armazenamento' em 'caminho' e retorna o total de registros.
+
+    O arquivo é escrito ao lado (caminho + ".tmp") e só substitui o anterior
+    no fim (os.replace), então um snapshot interrompido não estraga o último.
+    Se 'armazenamento' foi aberto deste mesmo arquivo, ele é fechado antes da
+    troca (no Windows um arquivo mapeado não pode ser substituído); para
+    continuar usando os dados, reabra com carregar_snapshot(caminho).
+    """
+    temporario = caminho + ".tmp"
+    cabecalho = {"ordem_bytes": sys.byteorder, "tabelas": {}}
+    total = 0
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(MAGICO + bytes(8))
+        for nome, tabela in armazenamento.tabelas().items():
+            classe, colunas = ESQUEMA_SNAPSHOT[nome]
+            objetos = sorted(tabela, key=attrgetter(tabela.campo_chave))
+            info = {"registros": len(objetos), "colunas": [list(coluna) for coluna in colunas],
+                    "chave": tabela.campo_chave, "proxima_chave": tabela._proxima_chave,
+                    "dados": {}, "indices": {}}
+            for coluna, tipo in colunas:
+                info["dados"][coluna] = _escrever_coluna(arquivo, [getattr(objeto, coluna) for objeto in objetos], tipo)
+            for campo in tabela.campos_indexados:
+                valores = [getattr(objeto, campo) for objeto in objetos]
+                chave = valores.__getitem__ if None not in valores else (lambda i: _ordem(valores[i]))
+                info["indices"][campo] = _escrever_array(arquivo, array("I", sorted(range(len(objetos)), key=chave)))
+            cabecalho["tabelas"][nome] = info
+            total += len(objetos)
+        inicio_cabecalho = arquivo.tell()
+        arquivo.write(json.dumps(cabecalho).encode("utf-8"))
+        arquivo.seek(len(MAGICO))
+        arquivo.write(struct.pack("<Q", inicio_cabecalho))
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    aberto = getattr(armazenamento, "arquivo", None)
+    if aberto is not None and os.path.abspath(aberto.caminho) == os.path.abspath(caminho):
+        armazenamento.fechar()
+    os.replace(temporario, caminho)
+    return total
+
+
+# --- Leitura preguiçosa ---
+
+class _Sequencia:
+    """Sequência calculada sob demanda (permite usar bisect sem montar uma lista)."""
+    __slots__ = ("tamanho", "item")
+
+    def __init__(self, tamanho, item):
+        self.tamanho = tamanho
+        self.item = item
+
+    def __len__(self):
+        return self.tamanho
+
+    def __getitem__(self, i):
+        return self.item(i)
+
+
+class ArquivoSnapshot:
+    """Arquivo de snapshot aberto e mapeado na memória; 'fechar' libera o mapeamento."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        with open(caminho, "rb") as arquivo:
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mapa[:len(MAGICO)] != MAGICO:
+            self._mapa.close()
+            raise ValueError(f"'{caminho}' não é um snapshot do sistema jurídico.")
+        inicio_cabecalho, = struct.unpack_from("<Q", self._mapa, len(MAGICO))
+        self.cabecalho = json.loads(self._mapa[inicio_cabecalho:].decode("utf-8"))
+        if self.cabecalho["ordem_bytes"] != sys.byteorder:
+            self._mapa.close()
+            raise ValueError(f"'{caminho}' foi gravado numa máquina com outra ordem de bytes.")
+        self._visoes = []
+        self.fechado = False
+
+    def array(self, inicio, quantidade, tipo):
+        """Visão (sem cópia) de 'quantidade' inteiros do tipo 'Q' ou 'I' a partir de 'inicio'."""
+        tamanho = struct.calcsize(tipo)
+        visao = memoryview(self._mapa)[inicio:inicio + quantidade * tamanho].cast(tipo)
+        self._visoes.append(visao)
+        return visao
+
+    def coluna(self, parte, quantidade, tipo):
+        """Função i -> valor da coluna gravada por _escrever_coluna (lê só aquele valor)."""
+        mapa, texto, converter = self._mapa, parte["texto"], _DE_TEXTO[tipo]
+        posicoes = self.array(parte["posicoes"], quantidade + 1, "Q")
+        nulos = parte["nulos"]
+        def valor(i):
+            if nulos is not None and mapa[nulos + i]: return None
+            return converter(mapa[texto + posicoes[i]:texto + posicoes[i + 1]].decode("utf-8"))
+        return valor
+
+    def fechar(self):
+        if self.fechado: return
+        for visao in self._visoes:
+            visao.release()
+        self._visoes = []
+        self._mapa.close()
+        self.fechado = True
+
+
+class TabelaSnapshot(TabelaIndexada):
+    """TabelaIndexada cujos registros iniciais ficam no snapshot e são lidos sob demanda.
+
+    A parte herdada (self.registros e os índices em memória) guarda só o que
+    mudou depois de abrir: registros inseridos e os alterados (copiados para
+    a memória). Os removidos/alterados do snapshot ficam em '_removidos'.
+    Os objetos já lidos são guardados, então ler duas vezes a mesma chave
+    devolve o mesmo objeto.
+    """
+
+    def __init__(self, arquivo, info, classe, campos_indexados):
+        super().__init__(info["chave"], campos_indexados)
+        self._proxima_chave = info["proxima_chave"]
+        self._arquivo = arquivo
+        self._classe = classe
+        self._n = info["registros"]
+        self._colunas = {coluna: arquivo.coluna(info["dados"][coluna], self._n, tipo) for coluna, tipo in info["colunas"]}
+        self._removidos = set()  # Números de registro do snapshot que não valem mais
+        self._lidos = {}         # Número de registro -> objeto já montado
+        self._chaves = _Sequencia(self._n, self._colunas[self.campo_chave])
+        self._ordem_indices = {}
+        for campo in campos_indexados:
+            ordem, valor = arquivo.array(info["indices"][campo], self._n, "I"), self._colunas[campo]
+            self._ordem_indices[campo] = (ordem, _Sequencia(self._n, lambda j, ordem=ordem, valor=valor: _ordem(valor(ordem[j]))))
+
+    def _montar(self, i):
+        return self._classe(*(valor(i) for valor in self._colunas.values()))
+
+    def _objeto(self, i):
+        objeto = self._lidos.get(i)
+        if objeto is None:
+            objeto = self._lidos[i] = self._montar(i)
+        return objeto
+
+    def _numero(self, chave):
+        """Número do registro com essa chave no snapshot (None se não existir ou já não valer)."""
+        try:
+            i = bisect_left(self._chaves, chave)
+        except TypeError:
+            return None  # Chave de outro tipo (ex.: texto numa tabela de ids)
+        if i < self._n and self._chaves[i] == chave and i not in self._removidos:
+            return i
+        return None
+
+    def _grupo(self, campo, valor):
+        ordem, valores = self._ordem_indices[campo]
+        chave = _ordem(valor)
+        inicio = bisect_left(valores, chave)
+        fim = bisect_right(valores, chave, inicio)
+        # Dentro do grupo, os números de registro (e as chaves) estão em ordem crescente
+        return [ordem[j] for j in range(inicio, fim) if ordem[j] not in self._removidos]
+
+    # --- Leitura ---
+
+    def __len__(self):
+        return len(self.registros) + self._n - len(self._removidos)
+
+    def __contains__(self, chave):
+        return chave in self.registros or self._numero(chave) is not None
+
+    def __iter__(self):
+        # Percorrer a tabela inteira (relatórios) não guarda os objetos montados
+        for i in range(self._n):
+            if i not in self._removidos:
+                objeto = self._lidos.get(i)
+                yield objeto if objeto is not None else self._montar(i)
+        yield from self.registros.values()
+
+    def obter(self, chave, padrao=None):
+        if chave in self.registros:
+            return self.registros[chave]
+        i = self._numero(chave)
+        return padrao if i is None else self._objeto(i)
+
+    def buscar(self, campo, valor):
+        return [self._objeto(i) for i in self._grupo(campo, valor)] + super().buscar(campo, valor)
+
+    def itens_por(self, campo, valor):
+        return [(getattr(objeto, self.campo_chave), objeto) for objeto in self.buscar(campo, valor)]
+
+    def pagina_por(self, campo, valor, apos_chave=None, limite=None):
+        grupo = self._grupo(campo, valor)
+        if apos_chave is not None:
+            # Registros do snapshot estão em ordem de chave: pula direto para depois de 'apos_chave'
+            grupo = grupo[bisect_left(grupo, bisect_right(self._chaves, apos_chave)):]
+        pagina = [self._objeto(i) for i in grupo[:limite]]
+        if limite is None or len(pagina) < limite:
+            pagina += super().pagina_por(campo, valor, apos_chave, None if limite is None else limite - len(pagina))
+        return pagina
+
+    # --- Alteração ---
+
+    def inserir(self, objeto):
+        chave = getattr(objeto, self.campo_chave) if self.campo_chave else None
+        if chave is not None and self._numero(chave) is not None:
+            raise KeyError(chave)
+        return super().inserir(objeto)
+
+    def atualizar(self, chave, **campos):
+        if chave not in self.registros:
+            self._para_memoria(chave)
+        return super().atualizar(chave, **campos)
+
+    def remover(self, chave):
+        if chave in self.registros:
+            return super().remover(chave)
+        i = self._numero(chave)
+        if i is None:
+            raise KeyError(chave)
+        self._removidos.add(i)
+        return self._lidos.pop(i, None) or self._montar(i)
+
+    def _para_memoria(self, chave):
+        # Copia o registro do snapshot para a camada em memória, onde pode ser alterado
+        i = self._numero(chave)
+        if i is None:
+            raise KeyError(chave)
+        objeto = self._objeto(i)
+        self._removidos.add(i)
+        del self._lidos[i]
+        super().inserir(objeto)
+
+
+class ArmazenamentoSnapshot(ArmazenamentoIndexado):
+    """ArmazenamentoIndexado aberto a partir de um snapshot (tabelas TabelaSnapshot)."""
+
+    def __init__(self, caminho):
+        super().__init__()
+        self.arquivo = ArquivoSnapshot(caminho)
+        for nome, tabela in self.tabelas().items():
+            classe, _ = ESQUEMA_SNAPSHOT[nome]
+            setattr(self, nome, TabelaSnapshot(self.arquivo, self.arquivo.cabecalho["tabelas"][nome],
+                                               classe, tabela.campos_indexados))
+
+    def fechar(self):
+        """Libera o arquivo; depois disso as tabelas não podem mais ser lidas."""
+        self.arquivo.fechar()
+
+
+def carregar_snapshot(caminho):
+    """Abre o snapshot em 'caminho' (sem montar os objetos) e retorna um ArmazenamentoSnapshot."""
+    return ArmazenamentoSnapshot(caminho)
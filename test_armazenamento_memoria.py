@@ -0,0 +1,113 @@
+# test_armazenamento_memoria.py
+# =====================================================================
+# TESTES DOS ÍNDICES SECUNDÁRIOS DE 'armazenamento_memoria.py'
+# Depois de cada inserção, alteração e remoção, os índices têm de bater
+# com os registros (verificar_consistencia) e as buscas agrupadas têm de
+# devolver o mesmo que um filtro percorrendo a tabela inteira.
+#
+# Uso:
+#   python -m pytest -q test_armazenamento_memoria.py
+# =====================================================================
+
+import random
+from datetime import datetime, timedelta
+
+from armazenamento_memoria import ArmazenamentoIndexado, TabelaIndexada
+from modelo_abstrato import ClienteConcreto, ProcessoConcreto, PagamentoConcreto, AudienciaConcreta
+
+
+def _filtro(tabela, campo, valor):
+    """Busca por força bruta: percorre todos os registros."""
+    return {id(objeto) for objeto in tabela if getattr(objeto, campo) == valor}
+
+def _conferir(armazenamento, cpfs):
+    assert armazenamento.verificar_consistencia() == []
+    for cpf in cpfs:
+        for busca, tabela in ((armazenamento.processos_por_cpf, armazenamento.processos),
+                              (armazenamento.pagamentos_por_cpf, armazenamento.pagamentos),
+                              (armazenamento.audiencias_por_cpf, armazenamento.audiencias)):
+            encontrados = busca(cpf)
+            assert len(encontrados) == len({id(objeto) for objeto in encontrados})
+            assert {id(objeto) for objeto in encontrados} == _filtro(tabela, "cliente_cpf", cpf)
+
+def _popular(armazenamento, cpfs, rng):
+    for i, cpf in enumerate(cpfs):
+        armazenamento.clientes.inserir(ClienteConcreto(f"Cliente {i}", cpf, 30 + i, "", "", ""))
+    numeros = []
+    for i in range(30):
+        cpf = rng.choice(cpfs)
+        numero = f"{i:07d}-00.2024"
+        armazenamento.processos.inserir(ProcessoConcreto(numero, "Ação", cpf))
+        numeros.append(numero)
+    for i in range(60):
+        armazenamento.pagamentos.inserir(PagamentoConcreto(rng.choice(cpfs), 100.0 + i, "Honorários"))
+    inicio = datetime(2025, 3, 10, 9, 0)
+    for i in range(45):
+        processo = armazenamento.processos.obter(rng.choice(numeros))
+        armazenamento.audiencias.inserir(AudienciaConcreta(processo.numero, inicio + timedelta(hours=i), "Fórum",
+                                                           "Conciliação", processo.cliente_cpf))
+    return numeros
+
+
+def test_indices_consistentes_apos_insercao_alteracao_e_remocao():
+    rng = random.Random(7)
+    cpfs = [f"{i:011d}" for i in range(1, 6)]
+    armazenamento = ArmazenamentoIndexado()
+    numeros = _popular(armazenamento, cpfs, rng)
+    _conferir(armazenamento, cpfs)
+
+    # Alterações: troca o cliente de processos, pagamentos e audiências
+    for numero in rng.sample(numeros, 10):
+        armazenamento.processos.atualizar(numero, cliente_cpf=rng.choice(cpfs))
+        _conferir(armazenamento, cpfs)
+    for id_pagamento in rng.sample(sorted(armazenamento.pagamentos.registros), 20):
+        armazenamento.pagamentos.atualizar(id_pagamento, cliente_cpf=rng.choice(cpfs), valor=1.0)
+        _conferir(armazenamento, cpfs)
+    for id_audiencia in rng.sample(sorted(armazenamento.audiencias.registros), 15):
+        audiencia = armazenamento.audiencias.obter(id_audiencia)
+        armazenamento.audiencias.atualizar(id_audiencia, cliente_cpf=audiencia.cliente_cpf)  # Mesmo valor
+        armazenamento.audiencias.atualizar(id_audiencia, cliente_cpf=rng.choice(cpfs))
+        _conferir(armazenamento, cpfs)
+
+    # Remoções
+    for id_pagamento in rng.sample(sorted(armazenamento.pagamentos.registros), 25):
+        armazenamento.pagamentos.remover(id_pagamento)
+        _conferir(armazenamento, cpfs)
+    for numero in rng.sample(numeros, 10):
+        armazenamento.processos.remover(numero)
+        _conferir(armazenamento, cpfs)
+    for id_audiencia in rng.sample(sorted(armazenamento.audiencias.registros), 20):
+        armazenamento.audiencias.remover(id_audiencia)
+        _conferir(armazenamento, cpfs)
+
+    # Novas inserções depois das remoções
+    for i in range(10):
+        armazenamento.pagamentos.inserir(PagamentoConcreto(rng.choice(cpfs), 50.0, "Custas"))
+        _conferir(armazenamento, cpfs)
+
+
+def test_verificar_consistencia_acusa_indice_corrompido():
+    armazenamento = ArmazenamentoIndexado()
+    armazenamento.clientes.inserir(ClienteConcreto("Ana", "00000000001", 30, "", "", ""))
+    pagamento = PagamentoConcreto("00000000001", 10.0, "Custas")
+    armazenamento.pagamentos.inserir(pagamento)
+    pagamento.cliente_cpf = "00000000002"  # Alterado sem atualizar(): o índice fica para trás
+    assert armazenamento.verificar_consistencia() != []
+
+
+def test_paginas_em_ordem_de_chave_apos_atualizar():
+    tabela = TabelaIndexada(campo_chave="id_pagamento", campos_indexados=("cliente_cpf",))
+    for i in range(12):
+        tabela.inserir(PagamentoConcreto("A" if i % 2 else "B", float(i), "Custas"))
+    for chave in (1, 5, 2, 9):
+        tabela.atualizar(chave, cliente_cpf="A", valor=0.0)
+    tabela.atualizar(4, cliente_cpf="A")  # Mesmo valor: não pode ir para o fim do grupo
+    esperado = sorted(chave for chave, objeto in tabela.registros.items() if objeto.cliente_cpf == "A")
+    paginas, apos = [], None
+    for _ in range(len(esperado)):  # Limite: páginas fora de ordem poderiam repetir para sempre
+        pagina = tabela.pagina_por("cliente_cpf", "A", apos, 3)
+        if not pagina: break
+        paginas.extend(objeto.id_pagamento for objeto in pagina)
+        apos = pagina[-1].id_pagamento
+    assert paginas == esperado
+    assert tabela.verificar_consistencia() == []
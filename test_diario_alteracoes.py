@@ -0,0 +1,178 @@
+# test_diario_alteracoes.py
+# =====================================================================
+# TESTES DO DIÁRIO DE ALTERAÇÕES ('diario_alteracoes.py') NO REPOSITÓRIO
+# EM MEMÓRIA
+# Um cadastro só aparece depois de gravado no diário; se o fsync falhar,
+# nada fica no armazenamento (nem na agenda ou no índice de nomes) nem no
+# arquivo. Na abertura, um fim de diário cortado é descartado e um
+# ".compactando" que sobrou de uma compactação interrompida é reaplicado.
+#
+# Uso:
+#   python -m pytest -q test_diario_alteracoes.py
+# =====================================================================
+
+import errno
+import os
+import shutil
+import threading
+from datetime import datetime
+
+import pytest
+
+import diario_alteracoes
+from diario_alteracoes import DiarioAlteracoes, ler_diario
+from repositorio import RepositorioMemoria
+from modelo_abstrato import ClienteConcreto, ProcessoConcreto, PagamentoConcreto, AudienciaConcreta
+from modelo_abstrato import DuplicateCliente, ClienteNotFound
+
+
+def _cliente(cpf, nome=None):
+    return ClienteConcreto(nome or f"Cliente {cpf}", cpf, 40, "", "", "")
+
+@pytest.fixture
+def caminhos(tmp_path):
+    return {"caminho_snapshot": str(tmp_path / "dados.snap"), "caminho_diario": str(tmp_path / "dados.diario")}
+
+@pytest.fixture
+def fsync_com_falha(monkeypatch):
+    """Faz o fsync do diário falhar enquanto falhar["ativo"] for True."""
+    falhar = {"ativo": False}
+    fsync = os.fsync
+    def fsync_de_teste(descritor):
+        if falhar["ativo"]:
+            raise OSError(errno.ENOSPC, "Sem espaço no disco (simulado)")
+        fsync(descritor)
+    monkeypatch.setattr(diario_alteracoes.os, "fsync", fsync_de_teste)
+    return falhar
+
+
+def test_falha_no_fsync_nao_deixa_registro(caminhos, fsync_com_falha):
+    repo = RepositorioMemoria(**caminhos)
+    assert repo.add_cliente(_cliente("00000000001", "Ana Souza"))
+    assert repo.add_processo(ProcessoConcreto("0000001-00.2025", "Ação", "00000000001"))
+    repo.preparar_busca_por_nome()
+    repo.preparar_agenda()
+    horario = datetime(2031, 3, 3, 10, 0)
+
+    fsync_com_falha["ativo"] = True
+    assert repo.add_cliente(_cliente("00000000002", "Bruno Lima")) is False
+    assert repo.add_pagamento(PagamentoConcreto("00000000001", 10.0, "Custas")) is False
+    assert repo.add_audiencia(AudienciaConcreta("0000001-00.2025", horario, "Fórum", "Instrução", None)) is False
+    fsync_com_falha["ativo"] = False
+
+    assert repo.find_cliente_by_cpf("00000000002") is None
+    assert [cpf for cpf, _, _ in repo.buscar_clientes_por_nome("Bruno")] == []
+    assert repo.find_pagamentos_by_cpf("00000000001") == []
+    assert repo.agenda_entre(datetime(2031, 1, 1), datetime(2032, 1, 1)) == []
+    assert repo.armazenamento.verificar_consistencia() == []
+    with pytest.raises(ClienteNotFound):
+        repo.add_processo(ProcessoConcreto("0000002-00.2025", "Ação", "00000000002"))
+
+    # As chaves e o horário foram liberados
+    assert repo.add_cliente(_cliente("00000000002", "Bruno Lima"))
+    assert repo.add_audiencia(AudienciaConcreta("0000001-00.2025", horario, "Fórum", "Instrução", None))
+    repo.fechar()
+
+    # O que falhou também não voltou ao arquivo: reabrir traz só os cadastros confirmados
+    reaberto = RepositorioMemoria(**caminhos)
+    assert sorted(cliente.cpf for cliente in reaberto.armazenamento.clientes) == ["00000000001", "00000000002"]
+    assert reaberto.find_pagamentos_by_cpf("00000000001") == []
+    assert len(reaberto.find_audiencias_by_processo("0000001-00.2025")) == 1
+    reaberto.fechar()
+
+def test_cadastro_so_aparece_depois_do_fsync(caminhos, monkeypatch):
+    repo = RepositorioMemoria(**caminhos)
+    liberar, chegou = threading.Event(), threading.Event()
+    fsync = os.fsync
+    def fsync_lento(descritor):
+        chegou.set()
+        liberar.wait(5)
+        fsync(descritor)
+    monkeypatch.setattr(diario_alteracoes.os, "fsync", fsync_lento)
+    resultado = []
+    cadastro = threading.Thread(target=lambda: resultado.append(repo.add_cliente(_cliente("00000000003"))))
+    cadastro.start()
+    assert chegou.wait(5)
+    assert repo.find_cliente_by_cpf("00000000003") is None      # Ainda não está no disco
+    with pytest.raises(DuplicateCliente):
+        repo.add_cliente(_cliente("00000000003"))                # Mas a chave já está reservada
+    liberar.set()
+    cadastro.join(5)
+    assert resultado == [True]
+    assert repo.find_cliente_by_cpf("00000000003") is not None
+    repo.fechar()
+
+
+def test_fim_cortado_e_descartado_e_os_novos_registros_continuam_legiveis(caminhos):
+    repo = RepositorioMemoria(**caminhos)
+    for i in range(3):
+        assert repo.add_cliente(_cliente(f"0000000001{i}"))
+    repo.fechar()
+    diario = caminhos["caminho_diario"]
+    tamanho = os.path.getsize(diario)
+    with open(diario, "rb") as arquivo:
+        primeira = arquivo.readline()
+    with open(diario, "ab") as arquivo:
+        arquivo.write(b"00000000 " + primeira[9:-1] + b"\n")  # CRC errado
+        arquivo.write(primeira[:len(primeira) // 2])            # Linha pela metade
+
+    registros, tamanho_valido = ler_diario(diario)
+    assert (len(registros), tamanho_valido) == (3, tamanho)
+
+    repo = RepositorioMemoria(**caminhos)
+    assert len(repo.armazenamento.clientes) == 3
+    assert os.path.getsize(diario) == tamanho                   # O lixo foi cortado antes de gravar
+    assert repo.add_cliente(_cliente("00000000020"))
+    repo.fechar()
+    repo = RepositorioMemoria(**caminhos)
+    assert len(repo.armazenamento.clientes) == 4
+    repo.fechar()
+
+def test_falha_na_gravacao_corta_o_diario(tmp_path, fsync_com_falha):
+    caminho = str(tmp_path / "lote.diario")
+    diario = DiarioAlteracoes(caminho, janela_ms=0)
+    diario.registrar("clientes", _cliente("00000000030")).esperar()
+    fsync_com_falha["ativo"] = True
+    with pytest.raises(OSError):
+        diario.registrar("clientes", _cliente("00000000031")).esperar()
+    fsync_com_falha["ativo"] = False
+    diario.registrar("clientes", _cliente("00000000032")).esperar()
+    diario.fechar()
+    registros, tamanho_valido = ler_diario(caminho)
+    assert [objeto.cpf for _, objeto in registros] == ["00000000030", "00000000032"]
+    assert tamanho_valido == os.path.getsize(caminho)
+
+
+def test_compactando_que_sobrou_e_reaplicado(caminhos):
+    diario = caminhos["caminho_diario"]
+    compactando = diario + ".compactando"
+    repo = RepositorioMemoria(**caminhos)
+    for i in range(3):
+        assert repo.add_cliente(_cliente(f"0000000004{i}"))
+    repo.fechar()
+    # Compactação interrompida antes de trocar o snapshot: o diário já foi passado para o ".compactando"
+    os.replace(diario, compactando)
+    repo = RepositorioMemoria(**caminhos)
+    assert sorted(cliente.cpf for cliente in repo.armazenamento.clientes) == [f"0000000004{i}" for i in range(3)]
+    assert repo.add_cliente(_cliente("00000000050"))
+    repo.compactar()
+    assert not os.path.exists(compactando)
+    repo.fechar()
+
+def test_compactando_que_sobrou_depois_da_troca_do_snapshot(caminhos):
+    diario = caminhos["caminho_diario"]
+    repo = RepositorioMemoria(**caminhos)
+    for i in range(3):
+        assert repo.add_cliente(_cliente(f"0000000006{i}"))
+    repo._diario.sincronizar()
+    shutil.copyfile(diario, diario + ".copia")
+    repo.compactar()
+    assert repo.add_cliente(_cliente("00000000070"))
+    repo.fechar()
+    # Interrompida depois de trocar o snapshot e antes de apagar o ".compactando": os registros repetidos são ignorados
+    os.replace(diario + ".copia", diario + ".compactando")
+    repo = RepositorioMemoria(**caminhos)
+    assert sorted(cliente.cpf for cliente in repo.armazenamento.clientes) == \
+        [f"0000000006{i}" for i in range(3)] + ["00000000070"]
+    assert repo.armazenamento.verificar_consistencia() == []
+    repo.fechar()
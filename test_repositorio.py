@@ -0,0 +1,224 @@
+# test_repositorio.py
+# =====================================================================
+# TESTES DE CONFORMIDADE DOS BACKENDS DE 'repositorio.py'
+# O mesmo contrato de Repositorio é conferido em cada backend de BACKENDS:
+# cadastros, erros de cadastro, buscas, paginação por chave, buscas em
+# lote, visão do cliente e exportação. O backend "mysql" só roda com o
+# driver instalado e o servidor de DB_CONFIG acessível; os registros de
+# teste usam chaves aleatórias e são apagados ao final.
+#
+# Uso:
+#   python -m pytest -q test_repositorio.py
+# =====================================================================
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from repositorio import BACKENDS, RepositorioMemoria, RepositorioSQLite
+from repositorio_assincrono import buscar_clientes_em_lote, buscar_processos_em_lote
+from modelo_abstrato import ClienteConcreto, ProcessoConcreto, PagamentoConcreto, AudienciaConcreta
+from modelo_abstrato import DuplicateCliente, DuplicateProcesso, ClienteNotFound, ProcessoNotFound
+
+
+def _repositorio_mysql():
+    pytest.importorskip("mysql.connector")
+    repo = BACKENDS["mysql"]()
+    if not repo.verificar_conexao():
+        pytest.skip("servidor MySQL de DB_CONFIG inacessível")
+    return repo
+
+def _apagar_mysql(repo, cpfs):
+    marcadores = ", ".join(["%s"] * len(cpfs))
+    with repo.bd.get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"DELETE FROM audiencias WHERE numero_processo IN "
+                       f"(SELECT numero_processo FROM processos WHERE cliente_cpf IN ({marcadores}))", cpfs)
+        for tabela in ("pagamentos", "processos"):
+            cursor.execute(f"DELETE FROM {tabela} WHERE cliente_cpf IN ({marcadores})", cpfs)
+        cursor.execute(f"DELETE FROM clientes WHERE cpf IN ({marcadores})", cpfs)
+        conn.commit()
+        cursor.close()
+
+
+class Dados:
+    """Chaves únicas por teste (o MySQL é compartilhado entre execuções)."""
+
+    def __init__(self):
+        prefixo = f"9{random.randrange(10 ** 6):06d}"
+        self.cpfs = [f"{prefixo}{i:04d}" for i in range(3)]
+        self.numeros = [f"{prefixo}{i:04d}-00.2025" for i in range(3)]
+        self.cpf_inexistente = f"{prefixo}9999"
+        self.numero_inexistente = f"{prefixo}9999-00.2025"
+
+    def cliente(self, i):
+        return ClienteConcreto(f"Cliente {i}", self.cpfs[i], 30 + i, "", "", "")
+
+    def processo(self, i, cliente=0):
+        return ProcessoConcreto(self.numeros[i], f"Ação {i}", self.cpfs[cliente])
+
+
+@pytest.fixture(params=sorted(BACKENDS))
+def repo(request):
+    if request.param == "memoria":
+        repo = RepositorioMemoria()
+    elif request.param == "sqlite":
+        repo = RepositorioSQLite(":memory:")
+    else:
+        repo = _repositorio_mysql()
+    dados = Dados()
+    repo.dados = dados
+    yield repo
+    try:
+        if request.param == "mysql":
+            _apagar_mysql(repo, dados.cpfs)
+    finally:
+        repo.fechar()
+
+def _cadastrar(repo):
+    """Dois clientes com processos, pagamentos e audiências; retorna (pagamentos, audiências) do cliente 0."""
+    dados = repo.dados
+    for i in (0, 1):
+        assert repo.add_cliente(dados.cliente(i)) is True
+    assert repo.add_processo(dados.processo(0, cliente=0)) is True
+    assert repo.add_processo(dados.processo(1, cliente=0)) is True
+    assert repo.add_processo(dados.processo(2, cliente=1)) is True
+    pagamentos = [PagamentoConcreto(dados.cpfs[0], 100.0 + i, f"Parcela {i}") for i in range(7)]
+    for pagamento in pagamentos:
+        assert repo.add_pagamento(pagamento) is True
+    assert repo.add_pagamento(PagamentoConcreto(dados.cpfs[1], 50.0, "Custas")) is True
+    inicio = datetime(2031, 5, 5, 9, 0)
+    audiencias = [AudienciaConcreta(dados.numeros[0], inicio + timedelta(days=i), f"Sala {i}", "Instrução", dados.cpfs[0])
+                  for i in range(5)]
+    for audiencia in audiencias:
+        assert repo.add_audiencia(audiencia) is True
+    return pagamentos, audiencias
+
+def _paginas(buscar, chave, limite):
+    """Percorre todas as páginas de 'buscar' com paginação por chave e retorna os ids na ordem."""
+    ids, apos = [], None
+    for _ in range(100):  # Limite: páginas repetidas não podem prender o teste
+        pagina = buscar(apos, limite)
+        assert len(pagina) <= limite
+        if not pagina: break
+        ids.extend(getattr(objeto, chave) for objeto in pagina)
+        apos = getattr(pagina[-1], chave)
+    return ids
+
+
+# --- Cadastro ---
+
+def test_cadastro_define_ids(repo):
+    pagamentos, audiencias = _cadastrar(repo)
+    ids_pagamentos = [pagamento.id_pagamento for pagamento in pagamentos]
+    ids_audiencias = [audiencia.id_audiencia for audiencia in audiencias]
+    assert None not in ids_pagamentos and ids_pagamentos == sorted(set(ids_pagamentos))
+    assert None not in ids_audiencias and ids_audiencias == sorted(set(ids_audiencias))
+
+def test_erros_de_cadastro(repo):
+    dados = repo.dados
+    _cadastrar(repo)
+    with pytest.raises(DuplicateCliente):
+        repo.add_cliente(dados.cliente(0))
+    with pytest.raises(DuplicateProcesso):
+        repo.add_processo(dados.processo(0))
+    with pytest.raises(ClienteNotFound):
+        repo.add_processo(ProcessoConcreto(dados.numero_inexistente, "Ação", dados.cpf_inexistente))
+    with pytest.raises(ClienteNotFound):
+        repo.add_pagamento(PagamentoConcreto(dados.cpf_inexistente, 10.0, "Custas"))
+    with pytest.raises(ProcessoNotFound):
+        repo.add_audiencia(AudienciaConcreta(dados.numero_inexistente, datetime(2031, 6, 1, 9, 0), "Sala 9",
+                                             "Instrução", dados.cpfs[0]))
+    # Os recusados não foram gravados
+    assert repo.find_processo_by_numero(dados.numero_inexistente) is None
+    assert repo.find_pagamentos_by_cpf(dados.cpf_inexistente) == []
+    assert repo.find_audiencias_by_processo(dados.numero_inexistente) == []
+
+
+# --- Buscas ---
+
+def test_buscas(repo):
+    dados = repo.dados
+    _cadastrar(repo)
+    cliente = repo.find_cliente_by_cpf(dados.cpfs[0])
+    assert (cliente.cpf, cliente.nome, cliente.idade) == (dados.cpfs[0], "Cliente 0", 30)
+    assert repo.find_cliente_by_cpf(dados.cpf_inexistente) is None
+    processo = repo.find_processo_by_numero(dados.numeros[2])
+    assert (processo.numero, processo.descricao, processo.cliente_cpf) == (dados.numeros[2], "Ação 2", dados.cpfs[1])
+    assert repo.find_processo_by_numero(dados.numero_inexistente) is None
+    assert [p.numero for p in repo.find_processos_by_cpf(dados.cpfs[0])] == dados.numeros[:2]
+    assert repo.find_processos_by_cpf(dados.cpf_inexistente) == []
+    audiencia = repo.find_audiencias_by_processo(dados.numeros[0])[0]
+    assert (audiencia.data_hora, audiencia.cliente_cpf) == (datetime(2031, 5, 5, 9, 0), dados.cpfs[0])
+
+@pytest.mark.parametrize("limite", [1, 3, 7, 10])
+def test_paginacao_por_chave(repo, limite):
+    dados = repo.dados
+    pagamentos, audiencias = _cadastrar(repo)
+    esperado = [pagamento.id_pagamento for pagamento in pagamentos]
+    assert [p.id_pagamento for p in repo.find_pagamentos_by_cpf(dados.cpfs[0])] == esperado
+    assert _paginas(lambda apos, n: repo.find_pagamentos_by_cpf(dados.cpfs[0], apos_id=apos, limite=n),
+                    "id_pagamento", limite) == esperado
+    assert repo.find_pagamentos_by_cpf(dados.cpfs[0], apos_id=esperado[-1], limite=limite) == []
+    esperado = [audiencia.id_audiencia for audiencia in audiencias]
+    assert _paginas(lambda apos, n: repo.find_audiencias_by_processo(dados.numeros[0], apos_id=apos, limite=n),
+                    "id_audiencia", limite) == esperado
+
+def test_buscas_em_lote(repo):
+    dados = repo.dados
+    _cadastrar(repo)
+    cpfs = [dados.cpfs[1], dados.cpf_inexistente, dados.cpfs[0], dados.cpfs[1]]
+    clientes = repo.find_clientes_by_cpfs(cpfs)
+    assert set(clientes) == set(cpfs)
+    assert clientes[dados.cpf_inexistente] is None
+    assert {cpf: cliente.nome for cpf, cliente in clientes.items() if cliente} == {dados.cpfs[0]: "Cliente 0",
+                                                                                  dados.cpfs[1]: "Cliente 1"}
+    numeros = [dados.numero_inexistente, *dados.numeros]
+    processos = repo.find_processos_by_numeros(numeros)
+    assert set(processos) == set(numeros)
+    assert processos[dados.numero_inexistente] is None
+    assert [processos[numero].cliente_cpf for numero in dados.numeros] == [dados.cpfs[0], dados.cpfs[0], dados.cpfs[1]]
+    assert repo.find_clientes_by_cpfs([]) == {}
+
+def test_atalhos_em_lote_encerrados_por_fechar(repo):
+    dados = repo.dados
+    _cadastrar(repo)
+    clientes = buscar_clientes_em_lote(repo, [dados.cpfs[0], dados.cpf_inexistente], max_concorrencia=2)
+    assert (clientes[dados.cpfs[0]].nome, clientes[dados.cpf_inexistente]) == ("Cliente 0", None)
+    processos = buscar_processos_em_lote(repo, dados.numeros, max_concorrencia=2)
+    assert [processos[numero].cliente_cpf for numero in dados.numeros] == [dados.cpfs[0], dados.cpfs[0], dados.cpfs[1]]
+    executores = [repo_async._executor for repo_async in repo._assincronos.values()]
+    assert len(executores) == 1  # Reaproveitado entre as chamadas
+    repo.fechar()
+    assert repo._assincronos == {} and all(executor._shutdown for executor in executores)
+
+def test_visao_cliente(repo):
+    dados = repo.dados
+    pagamentos, audiencias = _cadastrar(repo)
+    visao = repo.visao_cliente_by_cpf(dados.cpfs[0])
+    assert visao.cliente.cpf == dados.cpfs[0]
+    assert [p.numero for p in visao.processos] == dados.numeros[:2]
+    assert [p.id_pagamento for p in visao.pagamentos] == [p.id_pagamento for p in pagamentos]
+    assert [a.id_audiencia for a in visao.audiencias] == [a.id_audiencia for a in audiencias]
+    assert visao.total_pagamentos() == pytest.approx(sum(p.valor for p in pagamentos))
+    vazia = repo.visao_cliente_by_cpf(dados.cpfs[1])
+    assert ([p.numero for p in vazia.processos], vazia.audiencias) == ([dados.numeros[2]], [])
+    assert repo.visao_cliente_by_cpf(dados.cpf_inexistente) is None
+
+
+# --- Exportação ---
+
+def test_exportar(repo):
+    dados = repo.dados
+    pagamentos, audiencias = _cadastrar(repo)
+    cpfs = set(dados.cpfs)
+    exportados = {tabela: list(repo.exportar(tabela, tamanho_bloco=2))
+                  for tabela in ("clientes", "processos", "pagamentos", "audiencias")}
+    assert sorted(c.cpf for c in exportados["clientes"] if c.cpf in cpfs) == dados.cpfs[:2]
+    assert sorted(p.numero for p in exportados["processos"] if p.cliente_cpf in cpfs) == dados.numeros
+    assert sorted(p.id_pagamento for p in exportados["pagamentos"] if p.cliente_cpf == dados.cpfs[0]) == \
+        [p.id_pagamento for p in pagamentos]
+    assert [p.valor for p in exportados["pagamentos"] if p.cliente_cpf == dados.cpfs[1]] == [50.0]
+    assert sorted(a.id_audiencia for a in exportados["audiencias"] if a.processo_numero in dados.numeros) == \
+        [a.id_audiencia for a in audiencias]
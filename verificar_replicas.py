@@ -0,0 +1,119 @@
+# verificar_replicas.py
+# =====================================================================
+# VERIFICAÇÃO DO ROTEAMENTO PRIMÁRIO/RÉPLICAS
+# Confere, contra servidores MySQL de verdade, o que 'roteamento_conexoes.py'
+# promete:
+#   1. um cadastro vai ao primário e a busca logo em seguida também (ler o
+#      que gravou), encontrando o cliente;
+#   2. passada a janela, as buscas vão às réplicas (rodízio ou menor
+#      latência) e o primário deixa de recebê-las.
+# Duas instâncias locais bastam (ex.: portas 3306 e 3307), com o esquema
+# criado nas duas. Sem replicação entre elas, o passo 2 mostra a réplica
+# respondendo "não encontrado" - prova de que a busca não foi ao primário.
+# O cliente de teste é apagado do primário ao final.
+#
+# Uso:
+#   python verificar_replicas.py --replica 127.0.0.1:3307
+#   python verificar_replicas.py --primario 127.0.0.1:3306 --replica 127.0.0.1:3307 --replica 127.0.0.1:3308
+#   python verificar_replicas.py --replica 127.0.0.1:3307 --estrategia menor_latencia --buscas 500
+# =====================================================================
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+
+import banco_dados
+from modelo_abstrato import ClienteConcreto
+from roteamento_conexoes import ESTRATEGIAS, replicas_de_texto
+
+
+def _servidores(texto):
+    """Tipo do argparse para "host:porta" (ou vários separados por vírgula): erro de uso se vazio ou inválido."""
+    try:
+        servidores = replicas_de_texto(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"porta inválida em '{texto}' (use host:porta)")
+    if not servidores:
+        raise argparse.ArgumentTypeError(f"nenhum servidor em '{texto}' (use host:porta)")
+    return servidores
+
+def _servidor(texto):
+    """Como _servidores, mas exige exatamente um servidor."""
+    servidores = _servidores(texto)
+    if len(servidores) > 1:
+        raise argparse.ArgumentTypeError(f"informe um só servidor, não '{texto}'")
+    return servidores[0]
+
+def _destinos(antes, depois):
+    """Leituras por destino entre duas chamadas de estatisticas_replicas()."""
+    contagem = Counter({"primario": depois["leituras_primario"] - antes["leituras_primario"],
+                        "primario (após cadastro)": depois["leituras_janela"] - antes["leituras_janela"]})
+    for anterior, atual in zip(antes["replicas"], depois["replicas"]):
+        contagem[atual["nome"]] = atual["leituras"] - anterior["leituras"]
+    return {destino: quantidade for destino, quantidade in contagem.items() if quantidade}
+
+def _buscar(cpf):
+    antes = banco_dados.estatisticas_replicas()
+    cliente = banco_dados.find_cliente_by_cpf(cpf)
+    return cliente, _destinos(antes, banco_dados.estatisticas_replicas())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica o roteamento de leituras entre primário e réplicas.")
+    parser.add_argument("--primario", type=_servidor, help="host:porta do primário (padrão: DB_CONFIG).")
+    parser.add_argument("--replica", type=_servidores, action="extend", required=True,
+                        help="host:porta de uma réplica (repita para várias).")
+    parser.add_argument("--estrategia", choices=ESTRATEGIAS, default="rodizio", help="Escolha da réplica (padrão: rodizio).")
+    parser.add_argument("--janela", type=float, default=1.0, help="Segundos lendo do primário após o cadastro (padrão: 1).")
+    parser.add_argument("--buscas", type=int, default=200, help="Buscas feitas depois da janela.")
+    args = parser.parse_args(argv)
+
+    if args.primario:
+        banco_dados.DB_CONFIG.update(args.primario)
+    banco_dados.configurar_replicas(args.replica, estrategia=args.estrategia,
+                                    janela_leitura_propria=args.janela)
+    # Sem cache: cada busca tem de ir a algum servidor
+    banco_dados.CACHE_CLIENTES.limpar()
+    banco_dados.CACHE_CLIENTES.ttl = 0
+
+    cpf = f"999{random.randrange(10 ** 8):08d}"
+    ok = True
+    try:
+        if not banco_dados.add_cliente(ClienteConcreto("Cliente Teste Réplicas", cpf, 30, "", "", "")):
+            print("Não foi possível cadastrar o cliente de teste no primário.")
+            return 2
+        cliente, destinos = _buscar(cpf)
+        print(f"1. Busca logo após o cadastro: {'encontrado' if cliente else 'NÃO encontrado'} em {destinos}")
+        ok = ok and cliente is not None and "primario (após cadastro)" in destinos
+
+        time.sleep(args.janela + 0.1)
+        antes = banco_dados.estatisticas_replicas()
+        encontrados = sum(banco_dados.find_cliente_by_cpf(cpf) is not None for _ in range(args.buscas))
+        destinos = _destinos(antes, banco_dados.estatisticas_replicas())
+        print(f"2. {args.buscas} buscas após a janela ({args.estrategia}): {destinos}; "
+              f"encontrado em {encontrados} (0 = réplicas sem replicação do primário)")
+        ok = ok and not any(destino.startswith("primario") for destino in destinos)
+        for replica in banco_dados.estatisticas_replicas()["replicas"]:
+            latencia = "-" if replica["latencia_ms"] is None else f"{replica['latencia_ms']:.2f} ms"
+            print(f"   {replica['nome']}: latência média {latencia}, quarentenas {replica['quarentenas']}")
+    finally:
+        # Uma falha na limpeza não pode esconder o erro/código de saída acima nem deixar o roteador aberto
+        try:
+            with banco_dados.get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM clientes WHERE cpf = %s", (cpf,))
+                conn.commit()
+                cursor.close()
+        except banco_dados.ERROS_BD as err:
+            print(f"Não foi possível apagar o cliente de teste {cpf}: {err}")
+        finally:
+            banco_dados.ROTEADOR.fechar()
+
+    print("OK: roteamento conferido." if ok else "FALHA: o roteamento não se comportou como esperado.")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# visao_cliente.py
+# =====================================================================
+# VISÃO COMPLETA DO CLIENTE (CLIENTE, PROCESSOS, PAGAMENTOS E AUDIÊNCIAS)
+# Em vez de find_cliente_by_cpf + processos + find_pagamentos_by_cpf +
+# find_audiencias_by_processo para cada processo (N+3 idas ao banco), uma
+# única consulta UNION ALL traz tudo de uma vez. Cada linha diz de qual
+# tabela veio e traz as colunas como texto, na ordem de ESQUEMA_SNAPSHOT,
+# para que 'montar_visao' monte os objetos do modelo numa só passada.
+#
+# O SQL abaixo funciona igual no MySQL e no SQLite (CAST ... AS CHAR vira
+# texto nos dois); quem o executa são 'banco_dados.py' e 'repositorio.py'.
+# =====================================================================
+
+from snapshot import objeto_de_texto
+
+# Cada parte usa o índice da sua busca: clientes.cpf, processos.cliente_cpf,
+# pagamentos (cliente_cpf, id) e audiencias (numero_processo, id) pelo JOIN.
+# Todas têm 7 colunas (a tabela de origem + até 6 valores, completadas com NULL).
+SQL_VISAO_CLIENTE = """
+    SELECT 'clientes' AS tabela, nome, cpf, CAST(idade AS CHAR), telefone, endereco, email
+    FROM clientes WHERE cpf = %s
+    UNION ALL
+    SELECT 'processos', numero_processo, descricao, cliente_cpf, NULL, NULL, NULL
+    FROM processos WHERE cliente_cpf = %s
+    UNION ALL
+    SELECT 'pagamentos', cliente_cpf, CAST(valor AS CHAR), descricao, CAST(id AS CHAR),
+           CAST(data_vencimento AS CHAR), CAST(data_pagamento AS CHAR)
+    FROM pagamentos WHERE cliente_cpf = %s
+    UNION ALL
+    SELECT 'audiencias', a.numero_processo, CAST(a.data_hora AS CHAR), a.local, a.tipo, p.cliente_cpf, CAST(a.id AS CHAR)
+    FROM audiencias a JOIN processos p ON a.numero_processo = p.numero_processo
+    WHERE p.cliente_cpf = %s"""
+
+def parametros_visao(cpf):
+    """Parâmetros de SQL_VISAO_CLIENTE (o CPF uma vez para cada parte)."""
+    return (cpf,) * 4
+
+
+class VisaoCliente:
+    """Tudo o que se sabe de um cliente: o cliente, seus processos, pagamentos e audiências.
+
+    Processos em ordem de número, pagamentos em ordem de id e audiências em
+    ordem de data/hora.
+    """
+
+    __slots__ = ("cliente", "processos", "pagamentos", "audiencias")
+
+    def __init__(self, cliente, processos=(), pagamentos=(), audiencias=()):
+        self.cliente = cliente
+        self.processos = sorted(processos, key=lambda p: p.numero)
+        self.pagamentos = sorted(pagamentos, key=lambda p: p.id_pagamento or 0)
+        self.audiencias = sorted(audiencias, key=lambda a: a.data_hora)
+
+    def total_pagamentos(self):
+        return sum(pagamento.valor for pagamento in self.pagamentos)
+
+    def audiencias_do_processo(self, numero_processo):
+        return [audiencia for audiencia in self.audiencias if audiencia.processo_numero == numero_processo]
+
+    def __repr__(self):
+        return (f"VisaoCliente({self.cliente.cpf}: {len(self.processos)} processos, "
+                f"{len(self.pagamentos)} pagamentos, {len(self.audiencias)} audiências)")
+
+
+def montar_visao(linhas):
+    """Monta a VisaoCliente a partir das linhas de SQL_VISAO_CLIENTE (None se o cliente não existir)."""
+    cliente, listas = None, {"processos": [], "pagamentos": [], "audiencias": []}
+    for tabela, *textos in linhas:
+        objeto = objeto_de_texto(tabela, textos)
+        if tabela == "clientes": cliente = objeto
+        else: listas[tabela].append(objeto)
+    if cliente is None:
+        return None
+    return VisaoCliente(cliente, **listas)
+
+def visao_em_memoria(armazenamento, cpf):
+    """Mesma visão, lida dos índices do armazenamento em memória."""
+    cliente = armazenamento.clientes.obter(cpf)
+    if cliente is None:
+        return None
+    return VisaoCliente(cliente, armazenamento.processos_por_cpf(cpf), armazenamento.pagamentos_por_cpf(cpf),
+                        armazenamento.audiencias_por_cpf(cpf))